@@ -0,0 +1,61 @@
+"""
+Per-tile cost of the apply_once_at_company check as the success history grows.
+
+Compares the previous implementation (json.load of success.json and a linear
+scan per tile) with the normalized company index built by AIHawkJobManager.
+
+Run from the repository root:
+    python -m benchmarks.bench_company_index
+"""
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from src.aihawk_job_manager import AIHawkJobManager
+from src.result_ledger import ResultLedger
+
+HISTORY_SIZES = [100, 1_000, 10_000, 50_000]
+LOOKUPS = 200
+
+
+def legacy_is_already_applied_to_company(output_directory: Path, company: str) -> bool:
+    with open(output_directory / "success.json", 'r', encoding='utf-8') as f:
+        for applied_job in json.load(f):
+            if applied_job['company'].strip().lower() == company.strip().lower():
+                return True
+    return False
+
+
+def run():
+    logger.remove()
+    print(f"{'history':>8} | {'legacy us/tile':>15} | {'index us/tile':>14}")
+    for size in HISTORY_SIZES:
+        with tempfile.TemporaryDirectory() as tmp:
+            output_directory = Path(tmp)
+            records = [{"company": f"Company {i}"} for i in range(size)]
+            with open(output_directory / "success.json", 'w', encoding='utf-8') as f:
+                json.dump(records, f)
+
+            start = time.perf_counter()
+            for i in range(LOOKUPS):
+                legacy_is_already_applied_to_company(output_directory, f"Missing {i}")
+            legacy_cost = (time.perf_counter() - start) / LOOKUPS * 1e6
+
+            job_manager = AIHawkJobManager(driver=None)
+            job_manager.apply_once_at_company = True
+            job_manager.result_ledger = ResultLedger(output_directory)
+            job_manager.applied_companies = job_manager.load_applied_companies()
+            start = time.perf_counter()
+            for i in range(LOOKUPS):
+                job_manager.is_already_applied_to_company(f"Missing {i}")
+            index_cost = (time.perf_counter() - start) / LOOKUPS * 1e6
+            job_manager.result_ledger.close()
+
+        print(f"{size:>8} | {legacy_cost:>15.1f} | {index_cost:>14.2f}")
+
+
+if __name__ == "__main__":
+    run()
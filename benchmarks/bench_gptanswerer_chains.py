@@ -0,0 +1,69 @@
+"""
+Per-question Python overhead of GPTAnswerer.answer_question_textual_wide_range.
+
+Compares the previous implementation, which built all 13 section chains and
+parsed the section routing prompt on every question, with the chain registry
+that builds each chain once. The LLM is replaced by an instant fake model so
+only the prompt/chain handling is measured.
+
+Run from the repository root:
+    python -m benchmarks.bench_gptanswerer_chains
+"""
+import re
+import time
+from unittest import mock
+
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from loguru import logger
+
+import src.strings as strings
+from src.llm.llm_manager import GPTAnswerer, LLMLogger, SECTION_TEMPLATES
+
+QUESTIONS = 200
+
+
+class FakeModel:
+    def invoke(self, prompt):
+        text = prompt.to_string() if hasattr(prompt, "to_string") else str(prompt)
+        content = "Experience Details" if "most relevant" in text else "Five years."
+        return AIMessage(content=content, usage_metadata={"input_tokens": 1, "output_tokens": 1, "total_tokens": 2})
+
+
+def legacy_answer_question_textual_wide_range(answerer: GPTAnswerer, question: str) -> str:
+    chains = {
+        name: ChatPromptTemplate.from_template(getattr(strings, template)) | answerer.llm_cheap | StrOutputParser()
+        for name, template in SECTION_TEMPLATES.items()
+    }
+    prompt = ChatPromptTemplate.from_template("        " + strings.section_router_template.replace("\n", "\n        "))
+    output = (prompt | answerer.llm_cheap | StrOutputParser()).invoke({"question": question})
+    section_name = re.search(r"(Experience Details)", output, re.IGNORECASE).group(1).lower().replace(" ", "_")
+    return chains[section_name].invoke({"resume_section": answerer.resume.experience_details, "question": question})
+
+
+def measure(answer) -> float:
+    start = time.perf_counter()
+    for i in range(QUESTIONS):
+        answer(f"How many years of experience do you have with tool {i}?")
+    return (time.perf_counter() - start) / QUESTIONS * 1e3
+
+
+def run():
+    logger.remove()
+    config = {"llm_model_type": "openai", "llm_model": "gpt-4o-mini", "llm_cache": False, "section_router": False}
+    with mock.patch.object(LLMLogger, "log_request"):
+        answerer = GPTAnswerer(config, "sk-benchmark")
+        answerer.ai_adapter.model = FakeModel()
+        answerer.set_resume(mock.Mock(experience_details="Software engineer, 5 years"))
+
+        legacy_cost = measure(lambda question: legacy_answer_question_textual_wide_range(answerer, question))
+        registry_cost = measure(answerer.answer_question_textual_wide_range)
+
+    print(f"{'implementation':>16} | {'ms/question':>11}")
+    print(f"{'per-call chains':>16} | {legacy_cost:>11.3f}")
+    print(f"{'chain registry':>16} | {registry_cost:>11.3f}")
+
+
+if __name__ == "__main__":
+    run()
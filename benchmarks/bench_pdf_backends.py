@@ -0,0 +1,89 @@
+"""
+Time per resume and peak memory of the Chrome and ReportLab PDF backends.
+
+Peak RSS is sampled for the whole process tree (this process, chromedriver and
+every Chrome process) and reported above the RSS measured before the backend
+was created. The sampler reads /proc, so memory numbers need Linux; the Chrome
+backend needs a local Chrome.
+
+Run from the repository root:
+    python -m benchmarks.bench_pdf_backends
+"""
+import os
+import threading
+import time
+
+from loguru import logger
+
+from benchmarks.bench_pdf_renderer import RESUME_HTML
+from patches.pdf_renderer import ChromeRendererPool
+from patches.reportlab_renderer import ReportLabRenderer
+
+RENDERS = 20
+SAMPLE_INTERVAL = 0.02
+
+
+def process_tree_rss(pid: int) -> int:
+    total, pending = 0, [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status", encoding="utf-8") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children", encoding="utf-8") as children:
+                    pending.extend(int(child) for child in children.read().split())
+        except (FileNotFoundError, ProcessLookupError):
+            continue
+    return total
+
+
+class PeakRSS:
+    def __init__(self):
+        self.baseline = process_tree_rss(os.getpid())
+        self.peak = self.baseline
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            self.peak = max(self.peak, process_tree_rss(os.getpid()))
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, process_tree_rss(os.getpid()))
+
+
+def measure(create_renderer) -> tuple:
+    with PeakRSS() as rss:
+        renderer = create_renderer()
+        try:
+            start = time.perf_counter()
+            renderer.render(RESUME_HTML)
+            first_render = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(RENDERS):
+                pdf = renderer.render(RESUME_HTML)
+            warm_render = (time.perf_counter() - start) / RENDERS
+        finally:
+            renderer.close()
+    return first_render * 1e3, warm_render * 1e3, (rss.peak - rss.baseline) / 2 ** 20, len(pdf) / 1024
+
+
+def run():
+    logger.remove()
+    print(f"{'backend':>9} | {'first ms':>9} | {'warm ms':>8} | {'peak RSS MiB':>12} | {'PDF KiB':>7}")
+    for name, create_renderer in [("reportlab", ReportLabRenderer), ("chrome", ChromeRendererPool)]:
+        first_render, warm_render, peak_rss, pdf_size = measure(create_renderer)
+        print(f"{name:>9} | {first_render:>9.1f} | {warm_render:>8.1f} | {peak_rss:>12.1f} | {pdf_size:>7.1f}")
+
+
+if __name__ == "__main__":
+    run()
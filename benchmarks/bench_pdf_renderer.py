@@ -0,0 +1,88 @@
+"""
+Resume HTML-to-PDF throughput, in renders per minute.
+
+Compares the previous path (HTML written to a temp file, a new headless Chrome
+per conversion as in lib_resume_builder_AIHawk.utils.HTML_to_PDF, base64 result
+decoded afterwards) with the warm ChromeRendererPool rendering the HTML string.
+Requires Chrome; the chromedriver is resolved by webdriver-manager.
+
+Run from the repository root:
+    python -m benchmarks.bench_pdf_renderer
+"""
+import base64
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loguru import logger
+
+from patches.pdf_renderer import PRINT_TO_PDF_OPTIONS, ChromeRendererPool, create_headless_chrome
+
+RENDERS = 10
+POOL_SIZES = [1, 2]
+
+RESUME_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>Resume</title>
+<style>
+body { font-family: sans-serif; margin: 40px; }
+h1 { border-bottom: 2px solid #333; }
+.entry { margin-bottom: 12px; }
+</style>
+</head>
+<body>
+<h1>Jane Doe</h1>
+<p>jane.doe@example.com | +1 555 0100 | Berlin</p>
+<h2>Work Experience</h2>
+""" + "".join(
+    f"<div class='entry'><h3>Software Engineer {i}</h3><ul>"
+    + "".join(f"<li>Built and operated service {i}.{j} in Python and Go</li>" for j in range(5))
+    + "</ul></div>"
+    for i in range(6)
+) + "</body></html>"
+
+
+def legacy_html_to_pdf(html: str) -> bytes:
+    with tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.html', encoding='utf-8') as temp_html_file:
+        temp_html_file.write(html)
+        temp_html_path = temp_html_file.name
+    driver = create_headless_chrome()
+    try:
+        driver.get(Path(temp_html_path).resolve().as_uri())
+        time.sleep(2)
+        pdf_base64 = driver.execute_cdp_cmd("Page.printToPDF", PRINT_TO_PDF_OPTIONS)["data"]
+    finally:
+        driver.quit()
+        os.remove(temp_html_path)
+    return base64.b64decode(pdf_base64)
+
+
+def renders_per_minute(render, concurrency: int = 1) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(render, [RESUME_HTML] * RENDERS))
+    return RENDERS / (time.perf_counter() - start) * 60
+
+
+def run():
+    logger.remove()
+    print(f"{'renderer':>14} | {'renders/min':>11}")
+    print(f"{'HTML_to_PDF':>14} | {renders_per_minute(legacy_html_to_pdf):>11.1f}")
+    for pool_size in POOL_SIZES:
+        pool = ChromeRendererPool(pool_size=pool_size)
+        try:
+            # Browsers are started once per bot run, so they are warmed up before timing
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                list(executor.map(pool.render, [RESUME_HTML] * pool_size))
+            rate = renders_per_minute(pool.render, concurrency=pool_size)
+        finally:
+            pool.close()
+        print(f"{f'pool of {pool_size}':>14} | {rate:>11.1f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -11,6 +11,8 @@ from selenium.common.exceptions import WebDriverException
 from lib_resume_builder_AIHawk import Resume,StyleManager,FacadeManager,ResumeGenerator
 from src.utils import chrome_browser_options
 from src.llm.llm_manager import GPTAnswerer
+from src.llm.http_pool import configure_http_pool, http_pool_stats
+from src.llm.rate_limiter import configure_rate_limits, rate_limiter_stats
 from src.aihawk_authenticator import AIHawkAuthenticator
 from src.aihawk_bot_facade import AIHawkBotFacade
 from src.aihawk_job_manager import AIHawkJobManager
@@ -158,13 +160,18 @@ def init_browser() -> webdriver.Chrome:
         raise RuntimeError(f"Failed to initialize browser: {str(e)}")
 
 def create_and_run_bot(parameters, llm_api_key):
+    resume_generator_manager = None
     try:
+        configure_rate_limits(parameters.get('llm_rate_limits'))
+        configure_http_pool(parameters.get('llm_http_pool'))
         style_manager = StyleManager()
         resume_generator = ResumeGenerator()
         with open(parameters['uploads']['plainTextResume'], "r", encoding='utf-8') as file:
             plain_text_resume = file.read()
         resume_object = Resume(plain_text_resume)
-        resume_generator_manager = FacadeManager(llm_api_key, style_manager, resume_generator, resume_object, Path("data_folder/output"))
+        resume_generator_manager = FacadeManager(llm_api_key, style_manager, resume_generator, resume_object, Path("data_folder/output"),
+                                                 pdf_renderer=parameters.get('pdf_renderer'),
+                                                 llm_request_timeout=parameters.get('llm_request_timeout', 120))
         os.system('cls' if os.name == 'nt' else 'clear')
         resume_generator_manager.choose_style()
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -181,10 +188,16 @@ def create_and_run_bot(parameters, llm_api_key):
         bot.set_parameters(parameters)
         bot.start_login()
         bot.start_apply()
+        logger.info(f"LLM HTTP connection reuse: {http_pool_stats()}")
+        logger.info(f"LLM rate limiter waits: {rate_limiter_stats()}")
     except WebDriverException as e:
         logger.error(f"WebDriver error occurred: {e}")
     except Exception as e:
         raise RuntimeError(f"Error running the bot: {str(e)}")
+    finally:
+        # Stops the warm PDF browsers even when the run fails
+        if resume_generator_manager is not None:
+            resume_generator_manager.close()
 
 
 @click.command()
@@ -11,6 +11,7 @@ class GlobalConfig:
         self.API_KEY: str = None
         self.LLM_MODEL_TYPE: str = "openai"
         self.LLM_MODEL: str = None
+        self.LLM_REQUEST_TIMEOUT: float = 120
         self.html_template = """
                             <!DOCTYPE html>
                             <html lang="en">
@@ -1,8 +1,12 @@
+import functools
+import hashlib
 import json
 import os
 import tempfile
 import textwrap
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List
 from langchain_community.document_loaders import TextLoader
@@ -19,14 +23,40 @@ from langchain_community.vectorstores import FAISS
 from lib_resume_builder_AIHawk.config import global_config
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextvars import ContextVar
 import logging
 import re  # For regex parsing, especially in `parse_wait_time_from_error_message`
 from requests.exceptions import HTTPError as HTTPStatusError  # Handling HTTP status errors
 import openai
 
+try:
+    from src.llm.rate_limiter import estimate_tokens, get_rate_limiter
+except ImportError:  # used outside of the AIHawk repository
+    get_rate_limiter = None
+
+try:
+    from src.llm.http_pool import OPENAI_BASE_URL, get_pooled_clients
+except ImportError:  # used outside of the AIHawk repository
+    get_pooled_clients = None
+
+try:
+    from src.deadline import DeadlineExceeded, bind_deadline, call_timeout
+except ImportError:  # used outside of the AIHawk repository
+    class DeadlineExceeded(Exception):
+        pass
+
+    def bind_deadline(fn):
+        return fn
+
+    def call_timeout(per_call_timeout):
+        return per_call_timeout
+
 
 load_dotenv()
 
+# Sections left out of the last resume generated by this thread because their LLM call failed
+failed_resume_sections: ContextVar[tuple] = ContextVar("failed_resume_sections", default=())
+
 log_folder = 'log'
 if not os.path.exists(log_folder):
     os.makedirs(log_folder)
@@ -107,8 +137,10 @@ class LLMLogger:
 
 class LoggerChatModel:
 
-    def __init__(self, llm: ChatOpenAI):
+    def __init__(self, llm: ChatOpenAI, provider: str = "openai"):
         self.llm = llm
+        self.provider = provider
+        self.model_name = getattr(llm, "model_name", None) or getattr(llm, "model", "")
 
     def __call__(self, messages: List[Dict[str, str]]) -> str:
         max_retries = 2 # REDUCED
@@ -125,11 +157,22 @@ class LoggerChatModel:
                     messages_to_send = messages.to_messages()
                 else:
                     messages_to_send = messages
-                reply = self.llm(messages_to_send)
+                limiter = get_rate_limiter(self.provider, self.model_name) if get_rate_limiter else None
+                estimated_tokens = estimate_tokens(messages_to_send) if limiter else 0
+                if limiter:
+                    limiter.acquire(estimated_tokens)
+                # min(llm_request_timeout, remaining budget of the job application, if one is running)
+                timeout = call_timeout(getattr(global_config, "LLM_REQUEST_TIMEOUT", None))
+                options = {"timeout": timeout} if timeout is not None and self.provider == "openai" else {}
+                reply = self.llm(messages_to_send, **options)
+                if limiter:
+                    limiter.record_usage((reply.usage_metadata or {}).get("total_tokens", 0), estimated_tokens)
                 print("DEBUG: LLM replied!", flush=True) 
                 parsed_reply = self.parse_llmresult(reply)
                 LLMLogger.log_request(prompts=messages, parsed_reply=parsed_reply)
                 return reply
+            except DeadlineExceeded:
+                raise
             except (openai.RateLimitError, HTTPStatusError) as err:
                 print(f"DEBUG: Caught known error: {type(err)}", flush=True)
                 if isinstance(err, HTTPStatusError) and err.response.status_code == 429:
@@ -191,15 +234,82 @@ class LoggerChatModel:
         return 30
 
 
+class SectionMemo:
+    """
+    Process-wide memo of generated resume sections, shared by the LLMResumeJobDescription
+    instance created for every resume. The least recently used entries are dropped
+    beyond max_entries.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.stats = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_generate(self, section: str, key: str, generate) -> str:
+        start = time.monotonic()
+        with self._lock:
+            output = self._entries.get(key)
+            if output is not None:
+                self._entries.move_to_end(key)
+        hit = output is not None
+        if not hit:
+            output = generate()
+            if output:
+                with self._lock:
+                    self._entries[key] = output
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+        with self._lock:
+            section_stats = self.stats.setdefault(section, {"hits": 0, "misses": 0})
+            section_stats["hits" if hit else "misses"] += 1
+        logger.info(f"Resume section {section}: {'hit' if hit else 'miss'} in {time.monotonic() - start:.2f}s, "
+                    f"stats: {section_stats}")
+        return output
+
+
+section_memo = SectionMemo()
+
+
+def resume_section(name: str, template: str, depends_on_job_description: bool = True):
+    """
+    Declares a section generator and memoizes its output. Sections that do not depend on
+    the job description are generated once per resume, with the description of the first
+    job, and reused for every later job; the others are keyed by the job description
+    summary as well.
+    """
+    def decorator(generate):
+        @functools.wraps(generate)
+        def wrapper(self) -> str:
+            parts = [name, self.resume_hash, getattr(self.strings, template)]
+            if depends_on_job_description:
+                parts.append(self.job_description)
+            key = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+            return section_memo.get_or_generate(name, key, lambda: generate(self))
+
+        wrapper.depends_on_job_description = depends_on_job_description
+        return wrapper
+    return decorator
+
+
 class LLMResumeJobDescription:
     def __init__(self, api_key, strings):
         if getattr(global_config, "LLM_MODEL_TYPE", "openai") == "gemini":
             model_name = getattr(global_config, "LLM_MODEL", None) or "gemini-pro"
-            self.llm_cheap = LoggerChatModel(ChatGoogleGenerativeAI(model=model_name, google_api_key=api_key, temperature=0.4))
+            self.llm_cheap = LoggerChatModel(ChatGoogleGenerativeAI(model=model_name, google_api_key=api_key, temperature=0.4), provider="gemini")
             self.llm_embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001", google_api_key=api_key)
         else:
-            self.llm_cheap = LoggerChatModel(ChatOpenAI(model_name="gpt-4o-mini", openai_api_key=api_key, temperature=0.4))
-            self.llm_embeddings = OpenAIEmbeddings(openai_api_key=api_key)
+            # Shares keep-alive connections with the answerer instead of opening new ones per resume
+            http_options, embeddings_options = {}, {}
+            if get_pooled_clients:
+                pool = get_pooled_clients(OPENAI_BASE_URL)
+                http_options = {"http_client": pool.client}
+                # OpenAIEmbeddings would pass http_client to its async client too, so the sync one is built here
+                embeddings_options = {"client": openai.OpenAI(api_key=api_key, http_client=pool.client).embeddings}
+            self.llm_cheap = LoggerChatModel(ChatOpenAI(model_name="gpt-4o-mini", openai_api_key=api_key, temperature=0.4,
+                                                        **http_options))
+            self.llm_embeddings = OpenAIEmbeddings(openai_api_key=api_key, **embeddings_options)
         self.strings = strings
 
     @staticmethod
@@ -209,6 +319,7 @@ class LLMResumeJobDescription:
 
     def set_resume(self, resume):
         self.resume = resume
+        self.resume_hash = hashlib.sha256(repr(resume).encode("utf-8")).hexdigest()
 
     def set_job_description_from_url(self, url_job_description):
         from lib_resume_builder_AIHawk.utils import create_driver_selenium
@@ -228,6 +339,10 @@ class LLMResumeJobDescription:
             os.remove(temp_file_path)
         text_splitter = TokenTextSplitter(chunk_size=500, chunk_overlap=50)
         all_splits = text_splitter.split_documents(document)
+        if get_rate_limiter:
+            embeddings_model = getattr(self.llm_embeddings, "model", "embeddings")
+            get_rate_limiter(self.llm_cheap.provider, embeddings_model).acquire(
+                sum(estimate_tokens(split.page_content) for split in all_splits))
         vectorstore = FAISS.from_documents(documents=all_splits, embedding=self.llm_embeddings)
         prompt = PromptTemplate(
             template="""
@@ -263,9 +378,13 @@ class LLMResumeJobDescription:
     def set_job_description_from_text(self, job_description_text):
         prompt = ChatPromptTemplate.from_template(self.strings.summarize_prompt_template)
         chain = prompt | self.llm_cheap | StrOutputParser()
-        output = chain.invoke({"text": job_description_text})
+        # The same posting gets the same summary, so its JD-dependent sections are memo hits too
+        key = hashlib.sha256("\0".join(["summary", self.strings.summarize_prompt_template,
+                                         job_description_text]).encode("utf-8")).hexdigest()
+        output = section_memo.get_or_generate("summary", key, lambda: chain.invoke({"text": job_description_text}))
         self.job_description = output
     
+    @resume_section("header", "prompt_header", depends_on_job_description=False)
     def generate_header(self) -> str:
         header_prompt_template = self._preprocess_template_string(
             self.strings.prompt_header
@@ -278,6 +397,7 @@ class LLMResumeJobDescription:
         })
         return output
 
+    @resume_section("education", "prompt_education", depends_on_job_description=False)
     def generate_education_section(self) -> str:
         education_prompt_template = self._preprocess_template_string(
             self.strings.prompt_education
@@ -290,6 +410,7 @@ class LLMResumeJobDescription:
         })
         return output
 
+    @resume_section("work_experience", "prompt_working_experience")
     def generate_work_experience_section(self) -> str:
         work_experience_prompt_template = self._preprocess_template_string(
             self.strings.prompt_working_experience
@@ -302,6 +423,7 @@ class LLMResumeJobDescription:
         })
         return output
 
+    @resume_section("side_projects", "prompt_side_projects")
     def generate_side_projects_section(self) -> str:
         side_projects_prompt_template = self._preprocess_template_string(
             self.strings.prompt_side_projects
@@ -314,6 +436,7 @@ class LLMResumeJobDescription:
         })
         return output
 
+    @resume_section("achievements", "prompt_achievements")
     def generate_achievements_section(self) -> str:
         logging.debug("Starting achievements section generation")
 
@@ -340,6 +463,7 @@ class LLMResumeJobDescription:
         logging.debug("Achievements section generation completed")
         return output
 
+    @resume_section("certifications", "prompt_certifications")
     def generate_certifications_section(self) -> str:
         logging.debug("Starting Certifications section generation")
 
@@ -367,6 +491,7 @@ class LLMResumeJobDescription:
         return output
 
 
+    @resume_section("additional_skills", "prompt_additional_skills")
     def generate_additional_skills_section(self) -> str:
         additional_skills_prompt_template = self._preprocess_template_string(
             self.strings.prompt_additional_skills
@@ -443,16 +568,24 @@ class LLMResumeJobDescription:
 
         # Use ThreadPoolExecutor to run the functions in parallel
         with ThreadPoolExecutor() as executor:
-            future_to_section = {executor.submit(fn): section for section, fn in functions.items()}
+            future_to_section = {executor.submit(bind_deadline(fn)): section for section, fn in functions.items()}
             results = {}
+            failed = []
             for future in as_completed(future_to_section):
                 section = future_to_section[future]
                 try:
                     result = future.result()
                     if result:
                         results[section] = result
+                except DeadlineExceeded:
+                    # A resume missing sections is worse than none; the applier gives up on the job
+                    for other in future_to_section:
+                        other.cancel()
+                    raise
                 except Exception as exc:
+                    failed.append(section)
                     logging.debug(f'{section} generated 1 exc: {exc}')
+        failed_resume_sections.set(tuple(failed))
         full_resume = "<body>\n"
         full_resume += f"  {results.get('header', '')}\n"
         full_resume += "  <main>\n"
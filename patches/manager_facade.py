@@ -1,14 +1,19 @@
 import base64
 import os
+from collections.abc import Mapping
 from pathlib import Path
 import tempfile
 import inquirer
 from lib_resume_builder_AIHawk.config import global_config
+from lib_resume_builder_AIHawk.gpt_resume_job_description import failed_resume_sections
 from lib_resume_builder_AIHawk.utils import HTML_to_PDF
+from lib_resume_builder_AIHawk.pdf_renderer import ChromeRendererPool
+from lib_resume_builder_AIHawk.reportlab_renderer import ReportLabRenderer
 import webbrowser
 
 class FacadeManager:
-    def __init__(self, api_key, style_manager, resume_generator, resume_object, log_path, llm_model_type="openai", llm_model=None):
+    def __init__(self, api_key, style_manager, resume_generator, resume_object, log_path, llm_model_type="openai", llm_model=None, pdf_renderer=None,
+                 llm_request_timeout=120):
         # Ottieni il percorso assoluto della directory della libreria
         lib_directory = Path(__file__).resolve().parent
         global_config.STRINGS_MODULE_RESUME_PATH = lib_directory / "resume_prompt/strings_feder-cr.py"
@@ -19,11 +24,22 @@ class FacadeManager:
         global_config.API_KEY = api_key
         global_config.LLM_MODEL_TYPE = llm_model_type
         global_config.LLM_MODEL = llm_model
+        global_config.LLM_REQUEST_TIMEOUT = llm_request_timeout
         self.style_manager = style_manager
         self.style_manager.set_styles_directory(global_config.STYLES_DIRECTORY)
         self.resume_generator = resume_generator
         self.resume_generator.set_resume_object(resume_object)
         self.selected_style = None  # Proprietà per memorizzare lo stile selezionato
+        # pdf_renderer: False converts every resume with a new browser (HTML_to_PDF), a string names the backend
+        if pdf_renderer is None:
+            pdf_renderer = {}
+        elif isinstance(pdf_renderer, str):
+            pdf_renderer = {'backend': pdf_renderer}
+        elif pdf_renderer is not False and not isinstance(pdf_renderer, Mapping):
+            raise ValueError(f"Invalid pdf_renderer in config.yaml: expected False, a backend name or a mapping "
+                             f"with backend, pool_size and max_renders, got {pdf_renderer!r}")
+        self.pdf_renderer_config = pdf_renderer
+        self.pdf_renderer = None
 
     def prompt_user(self, choices: list[str], message: str) -> str:
         questions = [
@@ -62,6 +78,9 @@ class FacadeManager:
 
 
     def pdf_base64(self, job_description_url=None, job_description_text=None):
+        return base64.b64encode(self.pdf_bytes(job_description_url, job_description_text)).decode("utf-8")
+
+    def pdf_bytes(self, job_description_url=None, job_description_text=None):
         if (job_description_url is not None and job_description_text is not None):
             raise ValueError("Esattamente uno tra 'job_description_url' o 'job_description_text' deve essere fornito.")
         
@@ -69,6 +88,7 @@ class FacadeManager:
             raise ValueError("Devi scegliere uno stile prima di generare il PDF.")
         
         style_path = self.style_manager.get_style_path(self.selected_style)
+        failed_resume_sections.set(())
 
         with tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.html', encoding='utf-8') as temp_html_file:
             temp_html_path = temp_html_file.name
@@ -80,6 +100,42 @@ class FacadeManager:
                 self.resume_generator.create_resume_job_description_text(style_path, job_description_text, temp_html_path)
             else:
                 return None
-        pdf_base64 = HTML_to_PDF(temp_html_path)
-        os.remove(temp_html_path)
-        return pdf_base64
+        try:
+            if self.pdf_renderer_config is False:
+                return base64.b64decode(HTML_to_PDF(temp_html_path))
+            with open(temp_html_path, 'r', encoding='utf-8') as html_file:
+                html = html_file.read()
+            return self._get_pdf_renderer().render(html)
+        finally:
+            os.remove(temp_html_path)
+
+    @property
+    def pdf_backend(self) -> str:
+        return 'html_to_pdf' if self.pdf_renderer_config is False else self.pdf_renderer_config.get('backend', 'chrome')
+
+    def last_resume_complete(self) -> bool:
+        """
+        :return: Whether the last resume generated by this thread has all of its sections.
+        """
+        return not failed_resume_sections.get()
+
+    def _get_pdf_renderer(self):
+        if self.pdf_renderer is None:
+            backend = self.pdf_renderer_config.get('backend', 'chrome')
+            if backend == 'reportlab':
+                self.pdf_renderer = ReportLabRenderer()
+            elif backend == 'chrome':
+                self.pdf_renderer = ChromeRendererPool(
+                    pool_size=self.pdf_renderer_config.get('pool_size', 1),
+                    max_renders=self.pdf_renderer_config.get('max_renders', 50),
+                    # The tab stays on a file URL so that the style sheet path in the HTML resolves
+                    base_url=Path(global_config.STYLES_DIRECTORY).resolve().as_uri() + "/",
+                )
+            else:
+                raise ValueError(f"Unknown PDF renderer backend: {backend}")
+        return self.pdf_renderer
+
+    def close(self):
+        if self.pdf_renderer is not None:
+            self.pdf_renderer.close()
+            self.pdf_renderer = None
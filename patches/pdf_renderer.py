@@ -0,0 +1,184 @@
+import base64
+import queue
+import threading
+import time
+from typing import Callable, List
+
+from loguru import logger
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+from webdriver_manager.chrome import ChromeDriverManager
+
+HEADLESS_CHROME_ARGUMENTS = [
+    "--headless=new",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-logging",
+]
+
+# Same page setup as lib_resume_builder_AIHawk.utils.HTML_to_PDF
+PRINT_TO_PDF_OPTIONS = {
+    "printBackground": True,
+    "landscape": False,
+    "paperWidth": 10,
+    "paperHeight": 11,
+    "marginTop": 0,
+    "marginBottom": 0,
+    "marginLeft": 0,
+    "marginRight": 0,
+    "displayHeaderFooter": False,
+    "preferCSSPageSize": True,
+    "generateDocumentOutline": False,
+    "generateTaggedPDF": False,
+    "transferMode": "ReturnAsBase64",
+}
+
+# Waits for the stylesheets and web fonts of the new document instead of a fixed sleep
+WAIT_FOR_DOCUMENT_SCRIPT = """
+const done = arguments[arguments.length - 1];
+(function wait() {
+    if (document.readyState === 'complete') {
+        document.fonts.ready.then(() => done(true));
+    } else {
+        setTimeout(wait, 25);
+    }
+})();
+"""
+
+
+def create_headless_chrome() -> webdriver.Chrome:
+    options = webdriver.ChromeOptions()
+    for argument in HEADLESS_CHROME_ARGUMENTS:
+        options.add_argument(argument)
+    service = ChromeService(ChromeDriverManager().install())
+    return webdriver.Chrome(service=service, options=options)
+
+
+class RendererWorker:
+    """
+    One warm headless Chrome. The tab stays on base_url and every render replaces its
+    document, so file stylesheets referenced by the resume HTML still load.
+    """
+
+    def __init__(self, driver, base_url: str, render_timeout: float):
+        self.driver = driver
+        self.renders = 0
+        self.driver.set_script_timeout(render_timeout)
+        self.driver.get(base_url)
+        self.frame_id = self.driver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]["id"]
+
+    def render(self, html: str) -> bytes:
+        self.driver.execute_cdp_cmd("Page.setDocumentContent", {"frameId": self.frame_id, "html": html})
+        self.driver.execute_async_script(WAIT_FOR_DOCUMENT_SCRIPT)
+        result = self.driver.execute_cdp_cmd("Page.printToPDF", PRINT_TO_PDF_OPTIONS)
+        self.renders += 1
+        return base64.b64decode(result["data"])
+
+    def quit(self) -> None:
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error while closing renderer browser: {e}")
+
+
+class ChromeRendererPool:
+    """
+    Keeps up to pool_size headless Chrome instances warm and renders HTML strings to PDF
+    bytes with Page.printToPDF. Browsers are started on first use and replaced after
+    max_renders conversions, or as soon as one of them fails.
+    """
+
+    def __init__(self, pool_size: int = 1, max_renders: int = 50, base_url: str = "about:blank",
+                 render_timeout: float = 30.0, driver_factory: Callable[[], webdriver.Chrome] = create_headless_chrome):
+        self.pool_size = max(pool_size, 1)
+        self.max_renders = max_renders
+        self.base_url = base_url
+        self.render_timeout = render_timeout
+        self.driver_factory = driver_factory
+        self.renders = 0
+        self.browsers_started = 0
+        self.recycles = 0
+        self.failures = 0
+        self.render_seconds = 0.0
+        self._workers: List[RendererWorker] = []
+        # An empty slot (None) is filled with a new browser when it is taken
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        for _ in range(self.pool_size):
+            self._idle.put(None)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def render(self, html: str) -> bytes:
+        """
+        :return: The PDF of the HTML document. A failed conversion is retried once on a fresh browser.
+        """
+        try:
+            return self._render_once(html)
+        except WebDriverException as e:
+            logger.warning(f"PDF rendering failed, retrying on a new browser: {e}")
+            return self._render_once(html)
+
+    def _render_once(self, html: str) -> bytes:
+        if self._closed:
+            raise RuntimeError("The PDF renderer pool is closed")
+        worker = self._idle.get()
+        try:
+            if worker is None:
+                worker = self._start_worker()
+            start = time.monotonic()
+            pdf = worker.render(html)
+        except Exception:
+            with self._lock:
+                self.failures += 1
+            if worker is not None:
+                self._discard(worker)
+            self._idle.put(None)
+            raise
+        with self._lock:
+            self.renders += 1
+            self.render_seconds += time.monotonic() - start
+        if self.max_renders and worker.renders >= self.max_renders:
+            logger.debug(f"Recycling renderer browser after {worker.renders} renders")
+            with self._lock:
+                self.recycles += 1
+            self._discard(worker)
+            worker = None
+        self._idle.put(worker)
+        return pdf
+
+    def _start_worker(self) -> RendererWorker:
+        start = time.monotonic()
+        worker = RendererWorker(self.driver_factory(), self.base_url, self.render_timeout)
+        with self._lock:
+            self.browsers_started += 1
+            self._workers.append(worker)
+        logger.debug(f"Renderer browser started in {time.monotonic() - start:.2f}s")
+        return worker
+
+    def _discard(self, worker: RendererWorker) -> None:
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.quit()
+
+    def stats(self) -> dict:
+        return {
+            "renders": self.renders,
+            "browsers_started": self.browsers_started,
+            "recycles": self.recycles,
+            "failures": self.failures,
+            "avg_render_seconds": round(self.render_seconds / self.renders, 3) if self.renders else 0.0,
+        }
+
+    def close(self) -> None:
+        self._closed = True
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.quit()
+        logger.debug(f"PDF renderer pool closed, stats: {self.stats()}")
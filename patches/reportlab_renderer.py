@@ -0,0 +1,183 @@
+import io
+import re
+import time
+from html.parser import HTMLParser
+from typing import List
+from xml.sax.saxutils import escape, quoteattr
+
+from loguru import logger
+from reportlab.lib import colors
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer
+
+MAX_PDF_BYTES = 2 * 1024 * 1024  # upload limit checked by the Easy Apply form
+
+# Same paper size as the Chrome backend
+PAGE_SIZE = (10 * inch, 11 * inch)
+
+SKIPPED_TAGS = {"head", "title", "style", "script", "svg"}
+BLOCK_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "div", "section", "header", "footer", "main", "article",
+              "ul", "ol", "table", "tr", "td", "th", "address", "dd", "dt"}
+INLINE_MARKUP = {"b": "b", "strong": "b", "i": "i", "em": "i", "u": "u", "sup": "super", "sub": "sub"}
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def _styles() -> dict:
+    sample = getSampleStyleSheet()
+    body = ParagraphStyle("ResumeBody", parent=sample["BodyText"], fontName="Helvetica", fontSize=10, leading=13,
+                          spaceAfter=3)
+    return {
+        "h1": ParagraphStyle("ResumeName", parent=body, fontName="Helvetica-Bold", fontSize=20, leading=24,
+                             spaceAfter=4),
+        "h2": ParagraphStyle("ResumeSection", parent=body, fontName="Helvetica-Bold", fontSize=13, leading=16,
+                             spaceBefore=10, spaceAfter=2, textColor=colors.HexColor("#1f3864")),
+        "h3": ParagraphStyle("ResumeEntry", parent=body, fontName="Helvetica-Bold", fontSize=11, leading=14,
+                             spaceBefore=5),
+        "li": ParagraphStyle("ResumeBullet", parent=body, leftIndent=14, bulletIndent=4, spaceAfter=1),
+        "body": body,
+    }
+
+
+class ResumeHTMLParser(HTMLParser):
+    """
+    Lays out the section markup produced by the resume generator (headings, paragraphs,
+    lists and inline emphasis) as ReportLab flowables. CSS is not applied.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.styles = _styles()
+        self.flowables = []
+        self._markup: List[str] = []
+        self._text: List[str] = []
+        self._inline: List[tuple] = []
+        self._block_styles: List[str] = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skipping += 1
+            return
+        if self._skipping:
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+            self._block_styles.append(tag)
+        elif tag == "br":
+            self._markup.append("<br/>")
+            self._text.append(" ")
+        elif tag == "span":
+            # Spans of one line (name, location, dates) are laid out apart by CSS
+            self._markup.append(" ")
+            self._text.append(" ")
+        elif tag == "hr":
+            self._flush()
+            self.flowables.append(HRFlowable(width="100%", thickness=0.5, color=colors.grey, spaceAfter=4))
+        elif tag in INLINE_MARKUP:
+            self._open_inline(f"<{INLINE_MARKUP[tag]}>", INLINE_MARKUP[tag])
+        elif tag == "a":
+            href = dict(attrs).get("href")
+            if href:
+                self._open_inline(f"<a href={quoteattr(href)}>", "a")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skipping = max(self._skipping - 1, 0)
+            return
+        if self._skipping:
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+            if tag in self._block_styles:
+                del self._block_styles[len(self._block_styles) - 1 - self._block_styles[::-1].index(tag):]
+            if tag in ("h1", "h2"):
+                self.flowables.append(HRFlowable(width="100%", thickness=0.5, color=colors.grey, spaceAfter=4))
+        elif tag in INLINE_MARKUP or tag == "a":
+            closing = "a" if tag == "a" else INLINE_MARKUP[tag]
+            if any(inner == closing for inner, _ in self._inline):
+                # Closes unbalanced inner tags too, as the generated HTML is not always well formed
+                while self._inline:
+                    inner, opening = self._inline.pop()
+                    if self._markup and self._markup[-1] is opening:
+                        # Empty elements such as icon fonts
+                        self._markup.pop()
+                    else:
+                        self._markup.append(f"</{inner}>")
+                    if inner == closing:
+                        break
+
+    def handle_data(self, data):
+        if self._skipping:
+            return
+        self._markup.append(escape(data))
+        self._text.append(data)
+
+    def _open_inline(self, markup: str, tag: str) -> None:
+        self._markup.append(markup)
+        self._inline.append((tag, markup))
+
+    def _flush(self) -> None:
+        text = WHITESPACE_PATTERN.sub(" ", "".join(self._text)).strip()
+        markup = "".join(self._markup) + "".join(f"</{tag}>" for tag, _ in reversed(self._inline))
+        self._markup, self._text, self._inline = [], [], []
+        if not text:
+            return
+        block = next((tag for tag in reversed(self._block_styles) if tag in ("h1", "h2", "h3", "li")), None)
+        if block is None and any(tag in ("h4", "h5", "h6") for tag in self._block_styles):
+            block = "h3"
+        style = self.styles[block or "body"]
+        markup = WHITESPACE_PATTERN.sub(" ", markup).strip()
+        try:
+            paragraph = Paragraph(markup, style, bulletText="•" if block == "li" else None)
+        except ValueError:
+            paragraph = Paragraph(escape(text), style, bulletText="•" if block == "li" else None)
+        self.flowables.append(paragraph)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def html_to_flowables(html: str) -> list:
+    parser = ResumeHTMLParser()
+    parser.feed(html)
+    parser.close()
+    return parser.flowables
+
+
+class ReportLabRenderer:
+    """
+    Renders the resume in process with ReportLab instead of a browser. Only the standard
+    PDF fonts are used, so nothing is embedded and the output stays far below max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = MAX_PDF_BYTES, margin: float = 0.6 * inch):
+        self.max_bytes = max_bytes
+        self.margin = margin
+        self.renders = 0
+        self.render_seconds = 0.0
+
+    def render(self, html: str) -> bytes:
+        start = time.monotonic()
+        buffer = io.BytesIO()
+        document = SimpleDocTemplate(buffer, pagesize=PAGE_SIZE, leftMargin=self.margin, rightMargin=self.margin,
+                                     topMargin=self.margin, bottomMargin=self.margin, title="Resume",
+                                     pageCompression=1)
+        flowables = html_to_flowables(html) or [Spacer(1, 1)]
+        document.build(flowables)
+        pdf = buffer.getvalue()
+        if len(pdf) > self.max_bytes:
+            raise ValueError(f"Rendered resume is {len(pdf)} bytes, above the limit of {self.max_bytes} bytes.")
+        self.renders += 1
+        self.render_seconds += time.monotonic() - start
+        return pdf
+
+    def stats(self) -> dict:
+        return {
+            "renders": self.renders,
+            "avg_render_seconds": round(self.render_seconds / self.renders, 3) if self.renders else 0.0,
+        }
+
+    def close(self) -> None:
+        logger.debug(f"ReportLab renderer stats: {self.stats()}")
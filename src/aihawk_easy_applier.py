@@ -1,14 +1,14 @@
 import base64
-import json
 import os
 import random
-import re
 import time
 import traceback
-from typing import List, Optional, Any, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 
 from httpx import HTTPStatusError
 from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen import canvas
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver import ActionChains
@@ -19,12 +19,134 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select, WebDriverWait
 
 import src.utils as utils
+from src.answer_store import AnswerStore
+from src.deadline import Deadline, DeadlineExceeded, activate, check_deadline, current_deadline
+from src.llm.streaming import LineBuffer
+from src.resume_cache import ResumeArtifactCache
+from src.speculative_pipeline import SpeculativePipeline
 from loguru import logger
 
+# Classifies every form section of an Easy Apply step in a single round trip,
+# checking in the same order as the element-by-element handlers.
+FORM_SECTION_KINDS_SCRIPT = """
+const terms = ['terms of service', 'privacy policy', 'terms of use'];
+return Array.from(arguments[0]).map(section => {
+    const label = section.querySelector('label');
+    if (label && terms.some(term => label.innerText.toLowerCase().includes(term))) return 'tos';
+    const formElement = section.querySelector('.jobs-easy-apply-form-element');
+    if (formElement && formElement.querySelector('.fb-text-selectable__option')) return 'radio';
+    if (section.querySelector('input[type="file"]')) return 'upload';
+    if (section.querySelector('.artdeco-datepicker__input')) return 'date';
+    if (section.querySelector('input, textarea')) return 'textbox';
+    if ((formElement && formElement.querySelector('select')) ||
+        section.querySelector('[data-test-text-entity-list-form-select]')) return 'dropdown';
+    return null;
+});
+"""
+
+
+# Reads the whole Easy Apply step in a single round trip. Every control gets a
+# data-aihawk-field (and radio labels a data-aihawk-option) attribute, so the
+# returned selectors can be used to write the answers back.
+FORM_SNAPSHOT_SCRIPT = """
+document.querySelectorAll('[data-aihawk-field], [data-aihawk-option]').forEach(node => {
+    node.removeAttribute('data-aihawk-field');
+    node.removeAttribute('data-aihawk-option');
+});
+const terms = ['terms of service', 'privacy policy', 'terms of use'];
+const clean = value => (value || '').trim();
+const isRequired = node => !!node && (node.required || node.getAttribute('aria-required') === 'true');
+const content = document.querySelector('.jobs-easy-apply-content');
+const sections = Array.from(document.querySelectorAll('.jobs-easy-apply-form-section__grouping'));
+const fields = sections.map((section, index) => {
+    const mark = node => node.setAttribute('data-aihawk-field', index);
+    const formElement = section.querySelector('.jobs-easy-apply-form-element');
+    const label = section.querySelector('label');
+    const error = section.querySelector('.artdeco-inline-feedback--error');
+    const field = {
+        index: index,
+        kind: null,
+        label: clean(label && label.innerText),
+        section_text: clean(section.innerText),
+        control_type: '',
+        control_id: '',
+        value: '',
+        options: [],
+        required: !!section.querySelector('[required], [aria-required="true"]'),
+        error: clean(error && error.innerText),
+        selector: '[data-aihawk-field="' + index + '"]'
+    };
+    if (label && terms.some(term => label.innerText.toLowerCase().includes(term))) {
+        mark(label);
+        field.kind = 'tos';
+        return field;
+    }
+    const radios = formElement ? Array.from(formElement.querySelectorAll('.fb-text-selectable__option')) : [];
+    if (radios.length) {
+        field.kind = 'radio';
+        field.control_type = 'radio';
+        field.options = radios.map((radio, position) => {
+            const radioLabel = radio.querySelector('label');
+            if (radioLabel) radioLabel.setAttribute('data-aihawk-option', index + '-' + position);
+            return clean(radio.innerText);
+        });
+        const checked = radios.find(radio => radio.querySelector('input:checked'));
+        field.value = checked ? clean(checked.innerText) : '';
+        return field;
+    }
+    if (section.querySelector('input[type="file"]')) {
+        field.kind = 'upload';
+        return field;
+    }
+    const input = section.querySelector('input, textarea');
+    if (input) {
+        mark(input);
+        field.kind = input.classList.contains('artdeco-datepicker__input') ? 'date' : 'textbox';
+        field.control_type = input.tagName === 'TEXTAREA' ? 'textarea' : (input.getAttribute('type') || 'text').toLowerCase();
+        field.control_id = (input.id || '').toLowerCase();
+        field.value = input.value || '';
+        field.required = field.required || isRequired(input);
+        return field;
+    }
+    const select = (formElement && formElement.querySelector('select')) ||
+        section.querySelector('[data-test-text-entity-list-form-select]');
+    if (select) {
+        mark(select);
+        const selectLabel = formElement && formElement.querySelector('label');
+        field.kind = 'dropdown';
+        field.control_type = 'select';
+        field.label = clean(selectLabel && selectLabel.innerText);
+        field.options = Array.from(select.options || []).map(option => clean(option.text));
+        field.value = select.selectedIndex >= 0 ? clean(select.options[select.selectedIndex].text) : '';
+        field.required = field.required || isRequired(select);
+        return field;
+    }
+    return field;
+});
+return {has_upload: !!(content && content.querySelector('input[type="file"]')), fields: fields};
+"""
+
+
+# Minimum number of streamed characters sent to a text field per WebDriver call.
+STREAM_TYPING_BATCH = 40
+
+
+@dataclass
+class FormStepStats:
+    sections: int = 0
+    kinds: Dict[str, int] = field(default_factory=dict)
+    webdriver_calls: int = 0
+    llm_calls: int = 0
+
+    def count_kind(self, kind: Optional[str]) -> None:
+        kind = kind or 'unknown'
+        self.kinds[kind] = self.kinds.get(kind, 0) + 1
+
 
 class AIHawkEasyApplier:
     def __init__(self, driver: Any, resume_dir: Optional[str], set_old_answers: List[Tuple[str, str, str]],
-                 gpt_answerer: Any, resume_generator_manager):
+                 gpt_answerer: Any, resume_generator_manager, application_timeout: Optional[float] = None,
+                 resume_cache: Optional[ResumeArtifactCache] = None, speculation_workers: int = 0):
         logger.debug("Initializing AIHawkEasyApplier")
         if resume_dir is None or not os.path.exists(resume_dir):
             resume_dir = None
@@ -33,32 +155,22 @@ class AIHawkEasyApplier:
         self.set_old_answers = set_old_answers
         self.gpt_answerer = gpt_answerer
         self.resume_generator_manager = resume_generator_manager
-        self.all_data = self._load_questions_from_json()
+        self.application_timeout = application_timeout
+        self.resume_cache = resume_cache
+        self.speculative_pipeline = None
+        if speculation_workers:
+            # A resume is only generated when no resume file was given
+            self.speculative_pipeline = SpeculativePipeline(
+                self.gpt_answerer.summarize_job_description,
+                self._generate_resume_pdf if self.resume_path is None else None,
+                max_workers=speculation_workers)
+        self.answer_store = AnswerStore('answers.json')
+        self.step_stats = FormStepStats()
+        self.form_step_history: List[FormStepStats] = []
+        self._prefetched_answers: Dict[Tuple[str, str], Any] = {}
 
         logger.debug("AIHawkEasyApplier initialized successfully")
 
-    def _load_questions_from_json(self) -> List[dict]:
-        output_file = 'answers.json'
-        logger.debug(f"Loading questions from JSON file: {output_file}")
-        try:
-            with open(output_file, 'r') as f:
-                try:
-                    data = json.load(f)
-                    if not isinstance(data, list):
-                        raise ValueError("JSON file format is incorrect. Expected a list of questions.")
-                except json.JSONDecodeError:
-                    logger.error("JSON decoding failed")
-                    data = []
-            logger.debug("Questions loaded successfully from JSON")
-            return data
-        except FileNotFoundError:
-            logger.warning("JSON file not found, returning empty list")
-            return []
-        except Exception:
-            tb_str = traceback.format_exc()
-            logger.error(f"Error loading questions data from JSON file: {tb_str}")
-            raise Exception(f"Error loading questions data from JSON file: \nTraceback:\n{tb_str}")
-
     def check_for_premium_redirect(self, job: Any, max_attempts=3):
 
         current_url = self.driver.current_url
@@ -101,6 +213,16 @@ class AIHawkEasyApplier:
             logger.error(f"Failed to navigate to job link: {job.link}, error: {str(e)}")
             raise
 
+        deadline = Deadline(self.application_timeout, label=f"{job.title} at {job.company}")
+        with activate(deadline):
+            try:
+                self._apply_within_deadline(job)
+            finally:
+                if self.speculative_pipeline:
+                    self.speculative_pipeline.cancel(job)
+        logger.debug(f"Application for {job.title} took {deadline.elapsed():.1f} seconds")
+
+    def _apply_within_deadline(self, job: Any):
         time.sleep(random.uniform(3, 5))
         self.check_for_premium_redirect(job)
 
@@ -119,6 +241,8 @@ class AIHawkEasyApplier:
             job_description = self._get_job_description()
             job.set_job_description(job_description)
             logger.debug(f"Job description set: {job_description[:100]}")
+            if self.speculative_pipeline:
+                self.speculative_pipeline.submit(job)
 
             logger.debug("Retrieving recruiter link")
             recruiter_link = self._get_job_recruiter()
@@ -131,12 +255,18 @@ class AIHawkEasyApplier:
             logger.debug("'Easy Apply' button clicked successfully")
 
             logger.debug("Passing job information to GPT Answerer")
-            self.gpt_answerer.set_job(job)
+            summary = self.speculative_pipeline.summary(job) if self.speculative_pipeline else None
+            self.gpt_answerer.set_job(job, summary=summary)
 
             logger.debug("Filling out application form")
             self._fill_application_form(job)
             logger.debug(f"Job application process completed successfully for job: {job}")
 
+        except DeadlineExceeded as e:
+            logger.warning(f"Application for {job.title} at {job.company} ran out of time: {e}")
+            self._discard_application()
+            raise
+
         except Exception as e:
 
             tb_str = traceback.format_exc()
@@ -275,6 +405,7 @@ class AIHawkEasyApplier:
     def _fill_application_form(self, job):
         logger.debug(f"Filling out application form for job: {job}")
         while True:
+            check_deadline("the application form")
             self.fill_up(job)
             if self._next_or_submit():
                 logger.debug("Application form submitted")
@@ -324,24 +455,277 @@ class AIHawkEasyApplier:
 
     def fill_up(self, job) -> None:
         logger.debug(f"Filling up form sections for job: {job}")
+        self.step_stats = FormStepStats()
 
-        try:
-            easy_apply_content = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, 'jobs-easy-apply-content'))
-            )
+        with utils.WebDriverCallCounter(self.driver) as call_counter:
+            try:
+                easy_apply_content = WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, 'jobs-easy-apply-content'))
+                )
 
-            pb4_elements = easy_apply_content.find_elements(By.CLASS_NAME, 'pb4')
-            for element in pb4_elements:
-                self._process_form_element(element, job)
+                form_plan = self._build_form_plan(easy_apply_content)
+                self._fill_form_plan(form_plan, easy_apply_content, job)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to find form elements: {e}")
+
+        self.step_stats.webdriver_calls = call_counter.count
+        self.form_step_history.append(self.step_stats)
+        logger.info(f"Form step filled: {self.step_stats.sections} sections {self.step_stats.kinds}, "
+                    f"{self.step_stats.webdriver_calls} WebDriver calls, {self.step_stats.llm_calls} LLM calls")
+
+    def _snapshot_form(self) -> Optional[dict]:
+        logger.debug("Taking form snapshot of the current step")
+        try:
+            snapshot = self.driver.execute_script(FORM_SNAPSHOT_SCRIPT)
         except Exception as e:
-            logger.error(f"Failed to find form elements: {e}")
+            logger.warning(f"Form snapshot script failed: {e}")
+            return None
+        if not isinstance(snapshot, dict) or not isinstance(snapshot.get('fields'), list):
+            logger.debug("Form snapshot returned nothing, falling back to element handlers")
+            return None
+        logger.debug(f"Form snapshot taken: {snapshot}")
+        return snapshot
+
+    def _build_form_plan(self, easy_apply_content: WebElement) -> List[Tuple[Optional[str], Any]]:
+        """
+        Collects the sections of the current step once and classifies each of them once.
+        :return: A list of (kind, target) pairs. The target is a snapshot field dict, or a
+            section WebElement when the snapshot is unavailable; kind is None when it must
+            be detected while filling.
+        """
+        logger.debug("Building form plan for the current step")
+        snapshot = self._snapshot_form()
+        if snapshot is not None:
+            form_plan = [('upload', None)] if snapshot.get('has_upload') else []
+            form_plan += [(form_field.get('kind'), form_field) for form_field in snapshot['fields']
+                          if form_field.get('kind') not in ('upload', None)]
+            logger.debug(f"Form plan built from snapshot: {[kind for kind, _ in form_plan]}")
+            return form_plan
+
+        form_plan = []
+        if easy_apply_content.find_elements(By.XPATH, ".//input[@type='file']"):
+            form_plan.append(('upload', None))
+
+        form_sections = self.driver.find_elements(By.CLASS_NAME, 'jobs-easy-apply-form-section__grouping')
+        kinds = None
+        if form_sections:
+            try:
+                kinds = self.driver.execute_script(FORM_SECTION_KINDS_SCRIPT, form_sections)
+            except Exception as e:
+                logger.warning(f"Form section classification script failed: {e}")
+        if not isinstance(kinds, list) or len(kinds) != len(form_sections):
+            kinds = [None] * len(form_sections)
+
+        for kind, section in zip(kinds, form_sections):
+            if kind != 'upload':
+                form_plan.append((kind, section))
+        logger.debug(f"Form plan built: {[kind for kind, _ in form_plan]}")
+        return form_plan
+
+    def _fill_form_plan(self, form_plan, easy_apply_content: WebElement, job) -> None:
+        handlers = {
+            'tos': self._handle_terms_of_service,
+            'radio': self._find_and_handle_radio_question,
+            'textbox': self._find_and_handle_textbox_question,
+            'date': self._find_and_handle_date_question,
+            'dropdown': self._find_and_handle_dropdown_question,
+        }
+        self._prefetch_snapshot_answers(form_plan)
+        for kind, target in form_plan:
+            self.step_stats.sections += 1
+            if kind == 'upload':
+                self._handle_upload_fields(easy_apply_content, job)
+            elif isinstance(target, dict):
+                self._fill_snapshot_field(target)
+            elif kind in handlers:
+                handlers[kind](target)
+            else:
+                kind = self._process_form_section(target)
+            self.step_stats.count_kind(kind)
+
+    def _fill_snapshot_field(self, form_field: dict) -> None:
+        """
+        Decides the answer of a snapshot field without touching the page and only uses
+        WebDriver to write the value.
+        """
+        kind = form_field['kind']
+        logger.debug(f"Filling {kind} field from snapshot: {form_field['label'] or form_field['section_text']}")
+        if kind == 'tos':
+            self._find_snapshot_element(form_field).click()
+            logger.debug("Clicked terms of service checkbox")
+        elif kind == 'radio':
+            _, question_text, question = self._snapshot_question(form_field)
+            options = question['options']
+            answer = self._answer_options_question('radio', question_text, options)
+            position = next((i for i, option in enumerate(options) if answer in option), len(options) - 1)
+            self.driver.find_element(
+                By.CSS_SELECTOR, f'[data-aihawk-option="{form_field["index"]}-{position}"]').click()
+            logger.debug(f"Selected radio answer: {answer}")
+        elif kind == 'textbox':
+            _, question_text, question = self._snapshot_question(form_field)
+            text_field = self._find_snapshot_element(form_field)
+            self._fill_text_question(text_field, question_text, question['kind'] == 'numeric')
+            time.sleep(1)
+            text_field.send_keys(Keys.ARROW_DOWN)
+            text_field.send_keys(Keys.ENTER)
+            logger.debug("Entered answer into the textbox.")
+        elif kind == 'date':
+            question_text = form_field['section_text'].lower()
+            answer = self.answer_store.find_containing('date', question_text)
+            if not answer:
+                self.step_stats.llm_calls += 1
+                answer = self.gpt_answerer.answer_question_date().strftime("%Y-%m-%d")
+                self._save_questions_to_json({'type': 'date', 'question': question_text, 'answer': answer})
+            self._enter_text(self._find_snapshot_element(form_field), answer)
+            logger.debug(f"Entered date answer: {answer}")
+        elif kind == 'dropdown':
+            _, question_text, question = self._snapshot_question(form_field)
+            answer = self._answer_options_question('dropdown', question_text, question['options'])
+            if form_field['value'] != answer:
+                self._select_dropdown_option(self._find_snapshot_element(form_field), answer)
+            logger.debug(f"Selected dropdown answer: {answer}")
+
+    def _find_snapshot_element(self, form_field: dict) -> WebElement:
+        return self.driver.find_element(By.CSS_SELECTOR, form_field['selector'])
+
+    def _snapshot_question(self, form_field: dict) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """
+        :return: The answer type, the question text and the GPTAnswerer.answer_many request of
+            a snapshot field, or None when the field is not answered by the model.
+        """
+        kind = form_field['kind']
+        if kind == 'radio':
+            question_text = form_field['section_text'].lower()
+            options = [option.lower() for option in form_field['options']]
+            return 'radio', question_text, {'kind': 'options', 'question': question_text, 'options': options}
+        if kind == 'dropdown':
+            question_text = form_field['label'].lower()
+            return 'dropdown', question_text, {'kind': 'options', 'question': question_text,
+                                               'options': form_field['options']}
+        if kind == 'textbox':
+            question_text = form_field['label'].lower().strip()
+            if self._is_numeric_type(form_field['control_type'], form_field['control_id']):
+                return 'numeric', question_text, {'kind': 'numeric', 'question': question_text}
+            return 'textbox', question_text, {'kind': 'text', 'question': question_text}
+        return None
+
+    def _prefetch_snapshot_answers(self, form_plan) -> None:
+        """
+        Resolves the questions of the step that have no saved answer concurrently, so that
+        filling the fields in order only waits for one round of model calls.
+        """
+        self._prefetched_answers = {}
+        pending = {}
+        for _, target in form_plan:
+            if not isinstance(target, dict):
+                continue
+            question = self._snapshot_question(target)
+            if question is None or self._find_saved_answer(question[0], question[1]):
+                continue
+            pending.setdefault((question[0], question[1]), question[2])
+        if len(pending) < 2:
+            return
 
-    def _process_form_element(self, element: WebElement, job) -> None:
-        logger.debug("Processing form element")
-        if self._is_upload_field(element):
-            self._handle_upload_fields(element, job)
+        logger.debug(f"Prefetching answers for {len(pending)} questions")
+        answers = self.gpt_answerer.answer_many(list(pending.values()))
+        self.step_stats.llm_calls += self.gpt_answerer.last_request_count
+        for key, answer in zip(pending, answers):
+            if answer is not None:
+                self._prefetched_answers[key] = answer
+
+    def _find_saved_answer(self, question_type: str, question_text: str):
+        if question_type in ('radio', 'dropdown', 'date'):
+            return self.answer_store.find_containing(question_type, question_text)
+        if 'cover letter' in question_text.lower():
+            return None
+        return self.answer_store.find_exact(question_type, question_text)
+
+    def _answer_options_question(self, question_type: str, question_text: str, options: List[str]) -> str:
+        existing_answer = self._find_saved_answer(question_type, question_text)
+        if existing_answer:
+            logger.debug(f"Found existing answer for question '{question_text}': {existing_answer}")
+            return existing_answer
+
+        answer = self._prefetched_answers.pop((question_type, question_text), None)
+        if answer is None:
+            logger.debug(f"No existing answer found, querying model for: {question_text}")
+            self.step_stats.llm_calls += 1
+            answer = self.gpt_answerer.answer_question_from_options(question_text, options)
+        self._save_questions_to_json({'type': question_type, 'question': question_text, 'answer': answer})
+        return answer
+
+    def _answer_text_question(self, question_text: str, is_numeric: bool):
+        question_type = 'numeric' if is_numeric else 'textbox'
+        is_cover_letter = 'cover letter' in question_text.lower()
+
+        existing_answer = self._find_saved_answer(question_type, question_text)
+        if existing_answer:
+            logger.debug(f"Using existing answer: {existing_answer}")
+            return existing_answer
+
+        answer = self._prefetched_answers.pop((question_type, question_text), None)
+        if answer is not None:
+            logger.debug(f"Using prefetched answer: {answer}")
+        elif is_numeric:
+            self.step_stats.llm_calls += 1
+            answer = self.gpt_answerer.answer_question_numeric(question_text)
+            logger.debug(f"Generated numeric answer: {answer}")
         else:
-            self._fill_additional_questions()
+            self.step_stats.llm_calls += 1
+            answer = self.gpt_answerer.answer_question_textual_wide_range(question_text)
+            logger.debug(f"Generated textual answer: {answer}")
+
+        if not is_cover_letter:
+            question_data = {'type': question_type, 'question': question_text, 'answer': answer}
+            if not is_numeric:
+                question_data['section'] = self.gpt_answerer.take_routed_section(question_text)
+            self._save_questions_to_json(question_data)
+            logger.debug("Saved non-cover letter answer to JSON.")
+        return answer
+
+    def _fill_text_question(self, text_field: WebElement, question_text: str, is_numeric: bool) -> str:
+        """
+        Answers a text question and enters the answer. Textual answers generated by the
+        LLM are typed while they are streamed, instead of after the whole answer arrived.
+        """
+        question_type = 'numeric' if is_numeric else 'textbox'
+        if (is_numeric or not self.gpt_answerer.streaming
+                or self._find_saved_answer(question_type, question_text)
+                or (question_type, question_text) in self._prefetched_answers):
+            answer = self._answer_text_question(question_text, is_numeric)
+            self._enter_text(text_field, answer)
+            return answer
+
+        self.step_stats.llm_calls += 1
+        answer = self._type_streamed_text(text_field,
+                                          self.gpt_answerer.stream_question_textual_wide_range(question_text))
+        logger.debug(f"Generated and typed streamed textual answer: {answer}")
+        if 'cover letter' not in question_text.lower():
+            self._save_questions_to_json({'type': question_type, 'question': question_text, 'answer': answer,
+                                          'section': self.gpt_answerer.take_routed_section(question_text)})
+        return answer
+
+    @staticmethod
+    def _type_streamed_text(element: WebElement, chunks: Iterable[str]) -> str:
+        """
+        Types streamed text into the element in batches of at least STREAM_TYPING_BATCH
+        characters, so that typing overlaps with generation without one WebDriver call per token.
+        """
+        element.clear()
+        typed = []
+        pending = ""
+        for chunk in chunks:
+            pending += chunk
+            if len(pending) >= STREAM_TYPING_BATCH or "\n" in chunk:
+                element.send_keys(pending)
+                typed.append(pending)
+                pending = ""
+        if pending:
+            element.send_keys(pending)
+            typed.append(pending)
+        return "".join(typed)
 
     def _handle_dropdown_fields(self, element: WebElement) -> None:
         logger.debug("Handling dropdown fields")
@@ -362,17 +746,14 @@ class AIHawkEasyApplier:
 
         logger.debug(f"Detected question text: {question_text}")
 
-        existing_answer = None
-        for item in self.all_data:
-            if self._sanitize_text(question_text) in item['question'] and item['type'] == 'dropdown':
-                existing_answer = item['answer']
-                break
+        existing_answer = self.answer_store.find_containing('dropdown', question_text)
 
         if existing_answer:
             logger.debug(f"Found existing answer for question '{question_text}': {existing_answer}")
         else:
 
             logger.debug(f"No existing answer found, querying model for: {question_text}")
+            self.step_stats.llm_calls += 1
             existing_answer = self.gpt_answerer.answer_question_from_options(question_text, options)
             logger.debug(f"Model provided answer: {existing_answer}")
             self._save_questions_to_json({'type': 'dropdown', 'question': question_text, 'answer': existing_answer})
@@ -405,6 +786,7 @@ class AIHawkEasyApplier:
             parent = element.find_element(By.XPATH, "..")
             self.driver.execute_script("arguments[0].classList.remove('hidden')", element)
 
+            self.step_stats.llm_calls += 1
             output = self.gpt_answerer.resume_or_cover(parent.text.lower())
             if 'resume' in output:
                 logger.debug("Uploading resume")
@@ -420,6 +802,36 @@ class AIHawkEasyApplier:
 
         logger.debug("Finished handling upload fields")
 
+    @staticmethod
+    def _sleep_within_deadline(seconds: float, step: str) -> None:
+        deadline = current_deadline()
+        if deadline is not None and seconds >= deadline.remaining():
+            raise DeadlineExceeded(f"Waiting {seconds} seconds during {step} would exceed the application budget")
+        time.sleep(seconds)
+
+    def _generate_resume_pdf(self, job) -> bytes:
+        # The PDF backend changes the output as much as the style does
+        style = f"{getattr(self.resume_generator_manager, 'selected_style', None) or ''}/" \
+                f"{getattr(self.resume_generator_manager, 'pdf_backend', None) or ''}"
+        resume_pdf = self.resume_cache.get(style, job.description) if self.resume_cache else None
+        if resume_pdf is not None:
+            logger.info(f"Reusing tailored resume for {job.title} at {job.company}, "
+                        f"resume cache stats: {self.resume_cache.stats()}")
+            return resume_pdf
+        logger.debug(f"Generating resume for job: {job.title} at {job.company}")
+        if hasattr(self.resume_generator_manager, "pdf_bytes"):
+            resume_pdf = self.resume_generator_manager.pdf_bytes(job_description_text=job.description)
+        else:
+            resume_pdf = base64.b64decode(
+                self.resume_generator_manager.pdf_base64(job_description_text=job.description))
+        if self.resume_cache:
+            # A resume missing sections is uploaded once but not reused for reposts
+            if getattr(self.resume_generator_manager, 'last_resume_complete', lambda: True)():
+                self.resume_cache.put(style, job.description, resume_pdf)
+            else:
+                logger.warning(f"Resume for {job.title} at {job.company} is missing sections, not caching it")
+        return resume_pdf
+
     def _create_and_upload_resume(self, element, job):
         logger.debug("Starting the process of creating and uploading resume.")
         folder_path = 'generated_cv'
@@ -433,15 +845,17 @@ class AIHawkEasyApplier:
             raise
 
         while True:
+            check_deadline("resume generation")
             try:
                 timestamp = int(time.time())
                 file_path_pdf = os.path.join(folder_path, f"CV_{timestamp}.pdf")
                 logger.debug(f"Generated file path for resume: {file_path_pdf}")
 
-                logger.debug(f"Generating resume for job: {job.title} at {job.company}")
-                resume_pdf_base64 = self.resume_generator_manager.pdf_base64(job_description_text=job.description)
+                resume_pdf = self.speculative_pipeline.resume_pdf(job) if self.speculative_pipeline else None
+                if resume_pdf is None:
+                    resume_pdf = self._generate_resume_pdf(job)
                 with open(file_path_pdf, "xb") as f:
-                    f.write(base64.b64decode(resume_pdf_base64))
+                    f.write(resume_pdf)
                 logger.debug(f"Resume successfully generated and saved to: {file_path_pdf}")
 
                 break
@@ -461,18 +875,20 @@ class AIHawkEasyApplier:
                         wait_time = 20
                         logger.warning(f"Rate limit exceeded, waiting {wait_time} seconds before retrying...")
 
-                    time.sleep(wait_time)
+                    self._sleep_within_deadline(wait_time, "resume generation")
                 else:
                     logger.error(f"HTTP error: {e}")
                     raise
 
+            except DeadlineExceeded:
+                raise
             except Exception as e:
                 logger.error(f"Failed to generate resume: {e}")
                 tb_str = traceback.format_exc()
                 logger.error(f"Traceback: {tb_str}")
                 if "RateLimitError" in str(e):
                     logger.warning("Rate limit error encountered, retrying...")
-                    time.sleep(20)
+                    self._sleep_within_deadline(20, "resume generation")
                 else:
                     raise
 
@@ -501,11 +917,20 @@ class AIHawkEasyApplier:
             logger.error(f"Resume upload failed: {tb_str}")
             raise Exception(f"Upload failed: \nTraceback:\n{tb_str}")
 
+    @staticmethod
+    def _write_cover_letter_lines(c: canvas.Canvas, text_object, lines: List[str], bottom_margin: float):
+        for line in lines:
+            if text_object.getY() <= bottom_margin:
+                c.drawText(text_object)
+                c.showPage()
+                text_object = c.beginText(50, A4[1] - 50)
+                text_object.setFont("Helvetica", 12)
+            text_object.textLine(line)
+        return text_object
+
     def _create_and_upload_cover_letter(self, element: WebElement, job) -> None:
         logger.debug("Starting the process of creating and uploading cover letter.")
 
-        cover_letter_text = self.gpt_answerer.answer_question_textual_wide_range("Write a cover letter")
-
         folder_path = 'generated_cv'
 
         try:
@@ -517,63 +942,61 @@ class AIHawkEasyApplier:
             logger.error(f"Failed to create directory: {folder_path}. Error: {e}")
             raise
 
-        while True:
-            try:
-                timestamp = int(time.time())
-                file_path_pdf = os.path.join(folder_path, f"Cover_Letter_{timestamp}.pdf")
-                logger.debug(f"Generated file path for cover letter: {file_path_pdf}")
-
-                c = canvas.Canvas(file_path_pdf, pagesize=A4)
-                page_width, page_height = A4
-                text_object = c.beginText(50, page_height - 50)
-                text_object.setFont("Helvetica", 12)
-
-                max_width = page_width - 100
-                bottom_margin = 50
-                available_height = page_height - bottom_margin - 50
-
-                def split_text_by_width(text, font, font_size, max_width):
-                    wrapped_lines = []
-                    for line in text.splitlines():
-
-                        if utils.stringWidth(line, font, font_size) > max_width:
-                            words = line.split()
-                            new_line = ""
-                            for word in words:
-                                if utils.stringWidth(new_line + word + " ", font, font_size) <= max_width:
-                                    new_line += word + " "
-                                else:
-                                    wrapped_lines.append(new_line.strip())
-                                    new_line = word + " "
-                            wrapped_lines.append(new_line.strip())
-                        else:
-                            wrapped_lines.append(line)
-                    return wrapped_lines
-
-                lines = split_text_by_width(cover_letter_text, "Helvetica", 12, max_width)
+        self.step_stats.llm_calls += 1
+        if self.gpt_answerer.streaming:
+            cover_letter_chunks = self.gpt_answerer.stream_question_textual_wide_range("Write a cover letter")
+        else:
+            cover_letter_chunks = [self.gpt_answerer.answer_question_textual_wide_range("Write a cover letter")]
 
-                for line in lines:
-                    text_height = text_object.getY()
-                    if text_height > bottom_margin:
-                        text_object.textLine(line)
+        try:
+            timestamp = int(time.time())
+            file_path_pdf = os.path.join(folder_path, f"Cover_Letter_{timestamp}.pdf")
+            logger.debug(f"Generated file path for cover letter: {file_path_pdf}")
+
+            c = canvas.Canvas(file_path_pdf, pagesize=A4)
+            page_width, page_height = A4
+            text_object = c.beginText(50, page_height - 50)
+            text_object.setFont("Helvetica", 12)
+
+            max_width = page_width - 100
+            bottom_margin = 50
+
+            def split_text_by_width(text, font, font_size, max_width):
+                wrapped_lines = []
+                for line in text.splitlines():
+
+                    if pdfmetrics.stringWidth(line, font, font_size) > max_width:
+                        words = line.split()
+                        new_line = ""
+                        for word in words:
+                            if pdfmetrics.stringWidth(new_line + word + " ", font, font_size) <= max_width:
+                                new_line += word + " "
+                            else:
+                                wrapped_lines.append(new_line.strip())
+                                new_line = word + " "
+                        wrapped_lines.append(new_line.strip())
                     else:
-
-                        c.drawText(text_object)
-                        c.showPage()
-                        text_object = c.beginText(50, page_height - 50)
-                        text_object.setFont("Helvetica", 12)
-                        text_object.textLine(line)
-
-                c.drawText(text_object)
-                c.save()
-                logger.debug(f"Cover letter successfully generated and saved to: {file_path_pdf}")
-
-                break
-            except Exception as e:
-                logger.error(f"Failed to generate cover letter: {e}")
-                tb_str = traceback.format_exc()
-                logger.error(f"Traceback: {tb_str}")
-                raise
+                        wrapped_lines.append(line)
+                return wrapped_lines or [""]
+
+            # Lines are wrapped and laid out as soon as the model has finished them
+            line_buffer = LineBuffer()
+            for chunk in cover_letter_chunks:
+                for paragraph in line_buffer.feed(chunk):
+                    text_object = self._write_cover_letter_lines(
+                        c, text_object, split_text_by_width(paragraph, "Helvetica", 12, max_width), bottom_margin)
+            for paragraph in line_buffer.flush():
+                text_object = self._write_cover_letter_lines(
+                    c, text_object, split_text_by_width(paragraph, "Helvetica", 12, max_width), bottom_margin)
+
+            c.drawText(text_object)
+            c.save()
+            logger.debug(f"Cover letter successfully generated and saved to: {file_path_pdf}")
+        except Exception as e:
+            logger.error(f"Failed to generate cover letter: {e}")
+            tb_str = traceback.format_exc()
+            logger.error(f"Traceback: {tb_str}")
+            raise
 
         file_size = os.path.getsize(file_path_pdf)
         max_file_size = 2 * 1024 * 1024  # 2 MB
@@ -601,30 +1024,26 @@ class AIHawkEasyApplier:
             logger.error(f"Cover letter upload failed: {tb_str}")
             raise Exception(f"Upload failed: \nTraceback:\n{tb_str}")
 
-    def _fill_additional_questions(self) -> None:
-        logger.debug("Filling additional questions")
-        form_sections = self.driver.find_elements(By.CLASS_NAME, 'jobs-easy-apply-form-section__grouping')
-        for section in form_sections:
-            self._process_form_section(section)
-
-    def _process_form_section(self, section: WebElement) -> None:
+    def _process_form_section(self, section: WebElement) -> Optional[str]:
         logger.debug("Processing form section")
         if self._handle_terms_of_service(section):
             logger.debug("Handled terms of service")
-            return
+            return 'tos'
         if self._find_and_handle_radio_question(section):
             logger.debug("Handled radio question")
-            return
-        if self._find_and_handle_textbox_question(section):
-            logger.debug("Handled textbox question")
-            return
+            return 'radio'
+        # A datepicker is an input too, so it is checked before the textboxes
         if self._find_and_handle_date_question(section):
             logger.debug("Handled date question")
-            return
+            return 'date'
+        if self._find_and_handle_textbox_question(section):
+            logger.debug("Handled textbox question")
+            return 'textbox'
 
         if self._find_and_handle_dropdown_question(section):
             logger.debug("Handled dropdown question")
-            return
+            return 'dropdown'
+        return None
 
     def _handle_terms_of_service(self, element: WebElement) -> bool:
         checkbox = element.find_elements(By.TAG_NAME, 'label')
@@ -642,21 +1061,9 @@ class AIHawkEasyApplier:
             question_text = section.text.lower()
             options = [radio.text.lower() for radio in radios]
 
-            existing_answer = None
-            for item in self.all_data:
-                if self._sanitize_text(question_text) in item['question'] and item['type'] == 'radio':
-                    existing_answer = item
-
-                    break
-            if existing_answer:
-                self._select_radio(radios, existing_answer['answer'])
-                logger.debug("Selected existing radio answer")
-                return True
-
-            answer = self.gpt_answerer.answer_question_from_options(question_text, options)
-            self._save_questions_to_json({'type': 'radio', 'question': question_text, 'answer': answer})
+            answer = self._answer_options_question('radio', question_text, options)
             self._select_radio(radios, answer)
-            logger.debug("Selected new radio answer")
+            logger.debug("Selected radio answer")
             return True
         return False
 
@@ -672,39 +1079,9 @@ class AIHawkEasyApplier:
             is_numeric = self._is_numeric_field(text_field)
             logger.debug(f"Is the field numeric? {'Yes' if is_numeric else 'No'}")
 
-            question_type = 'numeric' if is_numeric else 'textbox'
-
-            # Check if it's a cover letter field (case-insensitive)
-            is_cover_letter = 'cover letter' in question_text.lower()
-
-            # Look for existing answer if it's not a cover letter field
-            existing_answer = None
-            if not is_cover_letter:
-                for item in self.all_data:
-                    if self._sanitize_text(item['question']) == self._sanitize_text(question_text) and item.get('type') == question_type:
-                        existing_answer = item['answer']
-                        logger.debug(f"Found existing answer: {existing_answer}")
-                        break
-
-            if existing_answer and not is_cover_letter:
-                answer = existing_answer
-                logger.debug(f"Using existing answer: {answer}")
-            else:
-                if is_numeric:
-                    answer = self.gpt_answerer.answer_question_numeric(question_text)
-                    logger.debug(f"Generated numeric answer: {answer}")
-                else:
-                    answer = self.gpt_answerer.answer_question_textual_wide_range(question_text)
-                    logger.debug(f"Generated textual answer: {answer}")
-
-            self._enter_text(text_field, answer)
+            self._fill_text_question(text_field, question_text, is_numeric)
             logger.debug("Entered answer into the textbox.")
 
-            # Save non-cover letter answers
-            if not is_cover_letter:
-                self._save_questions_to_json({'type': question_type, 'question': question_text, 'answer': answer})
-                logger.debug("Saved non-cover letter answer to JSON.")
-
             time.sleep(1)
             text_field.send_keys(Keys.ARROW_DOWN)
             text_field.send_keys(Keys.ENTER)
@@ -719,17 +1096,13 @@ class AIHawkEasyApplier:
         if date_fields:
             date_field = date_fields[0]
             question_text = section.text.lower()
+            self.step_stats.llm_calls += 1
             answer_date = self.gpt_answerer.answer_question_date()
             answer_text = answer_date.strftime("%Y-%m-%d")
 
-            existing_answer = None
-            for item in self.all_data:
-                if self._sanitize_text(question_text) in item['question'] and item['type'] == 'date':
-                    existing_answer = item
-
-                    break
+            existing_answer = self.answer_store.find_containing('date', question_text)
             if existing_answer:
-                self._enter_text(date_field, existing_answer['answer'])
+                self._enter_text(date_field, existing_answer)
                 logger.debug("Entered existing date answer")
                 return True
 
@@ -760,25 +1133,11 @@ class AIHawkEasyApplier:
                 current_selection = select.first_selected_option.text
                 logger.debug(f"Current selection: {current_selection}")
 
-                existing_answer = None
-                for item in self.all_data:
-                    if self._sanitize_text(question_text) in item['question'] and item['type'] == 'dropdown':
-                        existing_answer = item['answer']
-                        break
-
-                if existing_answer:
-                    logger.debug(f"Found existing answer for question '{question_text}': {existing_answer}")
-                    if current_selection != existing_answer:
-                        logger.debug(f"Updating selection to: {existing_answer}")
-                        self._select_dropdown_option(dropdown, existing_answer)
-                    return True
-
-                logger.debug(f"No existing answer found, querying model for: {question_text}")
-
-                answer = self.gpt_answerer.answer_question_from_options(question_text, options)
-                self._save_questions_to_json({'type': 'dropdown', 'question': question_text, 'answer': answer})
-                self._select_dropdown_option(dropdown, answer)
-                logger.debug(f"Selected new dropdown answer: {answer}")
+                answer = self._answer_options_question('dropdown', question_text, options)
+                if current_selection != answer:
+                    logger.debug(f"Updating selection to: {answer}")
+                    self._select_dropdown_option(dropdown, answer)
+                logger.debug(f"Selected dropdown answer: {answer}")
                 return True
 
             else:
@@ -788,6 +1147,8 @@ class AIHawkEasyApplier:
                 logger.debug(f"Elements found: {[element.tag_name for element in elements]}")
                 return False
 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.warning(f"Failed to handle dropdown or combobox question: {e}", exc_info=True)
             return False
@@ -795,6 +1156,10 @@ class AIHawkEasyApplier:
     def _is_numeric_field(self, field: WebElement) -> bool:
         field_type = field.get_attribute('type').lower()
         field_id = field.get_attribute("id").lower()
+        return self._is_numeric_type(field_type, field_id)
+
+    @staticmethod
+    def _is_numeric_type(field_type: str, field_id: str) -> bool:
         is_numeric = 'numeric' in field_id or field_type == 'number' or ('text' == field_type and 'numeric' in field_id)
         logger.debug(f"Field type: {field_type}, Field ID: {field_id}, Is numeric: {is_numeric}")
         return is_numeric
@@ -818,33 +1183,10 @@ class AIHawkEasyApplier:
         select.select_by_visible_text(text)
 
     def _save_questions_to_json(self, question_data: dict) -> None:
-        output_file = 'answers.json'
-        question_data['question'] = self._sanitize_text(question_data['question'])
-        logger.debug(f"Saving question data to JSON: {question_data}")
-        try:
-            try:
-                with open(output_file, 'r') as f:
-                    try:
-                        data = json.load(f)
-                        if not isinstance(data, list):
-                            raise ValueError("JSON file format is incorrect. Expected a list of questions.")
-                    except json.JSONDecodeError:
-                        logger.error("JSON decoding failed")
-                        data = []
-            except FileNotFoundError:
-                logger.warning("JSON file not found, creating new file")
-                data = []
-            data.append(question_data)
-            with open(output_file, 'w') as f:
-                json.dump(data, f, indent=4)
-            logger.debug("Question data saved successfully to JSON")
-        except Exception:
-            tb_str = traceback.format_exc()
-            logger.error(f"Error saving questions data to JSON file: {tb_str}")
-            raise Exception(f"Error saving questions data to JSON file: \nTraceback:\n{tb_str}")
-
-    def _sanitize_text(self, text: str) -> str:
-        sanitized_text = text.lower().strip().replace('"', '').replace('\\', '')
-        sanitized_text = re.sub(r'[\x00-\x1F\x7F]', '', sanitized_text).replace('\n', ' ').replace('\r', '').rstrip(',')
-        logger.debug(f"Sanitized text: {sanitized_text}")
-        return sanitized_text
+        logger.debug(f"Saving question data: {question_data}")
+        self.answer_store.add(question_data['type'], question_data['question'], question_data['answer'],
+                              section=question_data.get('section'))
+
+    def close(self) -> None:
+        if self.speculative_pipeline:
+            self.speculative_pipeline.close()
@@ -1,4 +1,3 @@
-import json
 import os
 import random
 import time
@@ -11,10 +10,41 @@ from selenium.webdriver.common.by import By
 
 import src.utils as utils
 from app_config import MINIMUM_WAIT_TIME
-from src.job import Job
+from src.deadline import DeadlineExceeded
+from src.job import Job, extract_job_id
+from src.result_ledger import ResultLedger
+from src.resume_cache import ResumeArtifactCache, file_hash
+from src.seen_job_index import SeenJobIndex
 from src.aihawk_easy_applier import AIHawkEasyApplier
 from loguru import logger
 
+# Reads every job tile of the results list in a single round trip.
+# arguments[0] is the 'scaffold-layout__list-container' element.
+JOB_TILES_SCRIPT = """
+const container = arguments[0];
+const text = (root, selector) => {
+    const node = root.querySelector(selector);
+    return node ? node.innerText.trim() : null;
+};
+return Array.from(container.querySelectorAll('.jobs-search-results__list-item')).map(tile => {
+    const titleLink = tile.querySelector('.job-card-list__title');
+    const link = titleLink && titleLink.href ? titleLink.href.split('?')[0] : '';
+    const idMatch = link.match(/\\/jobs\\/view\\/(\\d+)/);
+    const idHolder = tile.closest('[data-occludable-job-id]') || tile.querySelector('[data-job-id]');
+    const insights = Array.from(tile.querySelectorAll('.job-card-container__job-insight-text, .job-card-list__insight'))
+        .map(node => node.innerText.trim()).filter(Boolean);
+    return {
+        title: text(tile, '.job-card-list__title strong') || '',
+        company: text(tile, '.job-card-container__primary-description') || '',
+        location: text(tile, '.job-card-container__metadata-item') || '',
+        link: link,
+        job_id: idMatch ? idMatch[1] : (idHolder ? (idHolder.getAttribute('data-occludable-job-id') || idHolder.getAttribute('data-job-id') || '') : ''),
+        apply_method: text(tile, '.job-card-container__apply-method'),
+        insight: insights.join(' · ')
+    };
+});
+"""
+
 
 class EnvironmentKeys:
     def __init__(self):
@@ -42,6 +72,15 @@ class AIHawkJobManager:
         self.driver = driver
         self.set_old_answers = set()
         self.easy_applier_component = None
+        self.tile_extraction_mode = "script"
+        self.scroll_strategy = "fast"
+        self.pages_read = 0
+        self.webdriver_calls = 0
+        # Opened in set_parameters, under outputFileDirectory
+        self.seen_jobs = None
+        self.result_ledger = None
+        self.resume_cache = None
+        self.applied_companies = set()
         logger.debug("AIHawkJobManager initialized successfully")
 
     def set_parameters(self, parameters):
@@ -52,7 +91,12 @@ class AIHawkJobManager:
         self.locations = parameters.get('locations', [])
         self.apply_once_at_company = parameters.get('apply_once_at_company', False)
         self.base_search_url = self.get_base_search_url(parameters)
-        self.seen_jobs = []
+        self.tile_extraction_mode = parameters.get('tile_extraction_mode', 'script')
+        self.scroll_strategy = parameters.get('scroll_strategy', 'fast')
+        self.application_timeout = parameters.get('application_timeout', 600)
+        speculation = parameters.get('speculative_generation', False)
+        speculation = {} if speculation is True else speculation or {'enabled': False}
+        self.speculation_workers = speculation.get('workers', 2) if speculation.get('enabled', True) else 0
 
         job_applicants_threshold = parameters.get('job_applicants_threshold', {})
         self.min_applicants = job_applicants_threshold.get('min_applicants', 0)
@@ -61,9 +105,37 @@ class AIHawkJobManager:
         resume_path = parameters.get('uploads', {}).get('resume', None)
         self.resume_path = Path(resume_path) if resume_path and Path(resume_path).exists() else None
         self.output_file_directory = Path(parameters['outputFileDirectory'])
+        self.close_stores()
+        self.seen_jobs = SeenJobIndex(self.output_file_directory / "seen_jobs.db",
+                                      ttl_days=parameters.get('seen_jobs_ttl_days', 30))
+        self.result_ledger = ResultLedger(self.output_file_directory)
+        self.resume_cache = self._create_resume_cache(parameters)
+        self.applied_companies = self.load_applied_companies() if self.apply_once_at_company else set()
         self.env_config = EnvironmentKeys()
         logger.debug("Parameters set successfully")
 
+    def close_stores(self):
+        if self.seen_jobs is not None:
+            self.seen_jobs.close()
+        if self.result_ledger is not None:
+            self.result_ledger.close()
+        if self.resume_cache is not None:
+            self.resume_cache.close()
+
+    def _create_resume_cache(self, parameters):
+        cache_config = parameters.get('resume_cache', {})
+        if cache_config is False or (isinstance(cache_config, dict) and not cache_config.get('enabled', True)):
+            logger.debug("Resume cache disabled")
+            return None
+        cache_config = cache_config if isinstance(cache_config, dict) else {}
+        resume_hash = file_hash(parameters.get('uploads', {}).get('plainTextResume') or "")
+        if resume_hash is None:
+            logger.debug("Plain text resume not found, resume cache disabled")
+            return None
+        return ResumeArtifactCache(self.output_file_directory / "resume_cache", resume_hash,
+                                   max_bytes=int(cache_config.get('max_size_mb', 200) * 1024 * 1024),
+                                   max_distance=cache_config.get('near_duplicate_bits', 3))
+
     def set_gpt_answerer(self, gpt_answerer):
         logger.debug("Setting GPT answerer")
         self.gpt_answerer = gpt_answerer
@@ -75,7 +147,21 @@ class AIHawkJobManager:
     def start_applying(self):
         logger.debug("Starting job application process")
         self.easy_applier_component = AIHawkEasyApplier(self.driver, self.resume_path, self.set_old_answers,
-                                                          self.gpt_answerer, self.resume_generator_manager)
+                                                          self.gpt_answerer, self.resume_generator_manager,
+                                                          application_timeout=self.application_timeout,
+                                                          resume_cache=self.resume_cache,
+                                                          speculation_workers=self.speculation_workers)
+        self.seen_jobs.load()
+        try:
+            self._apply_to_searches()
+        finally:
+            self.easy_applier_component.close()
+            self.close_stores()
+            if self.pages_read:
+                logger.info(f"Read {self.pages_read} job pages with {self.webdriver_calls / self.pages_read:.1f} "
+                            f"WebDriver calls per page on average")
+
+    def _apply_to_searches(self):
         searches = list(product(self.positions, self.locations))
         random.shuffle(searches)
         page_sleep = 0
@@ -195,8 +281,7 @@ class AIHawkJobManager:
 
         try:
             job_results = self.driver.find_element(By.CLASS_NAME, "jobs-search-results-list")
-            utils.scroll_slow(self.driver, job_results)
-            utils.scroll_slow(self.driver, job_results, step=300, reverse=True)
+            self.scroll_job_results(job_results)
 
             job_list_elements = self.driver.find_elements(By.CLASS_NAME, 'scaffold-layout__list-container')[
                 0].find_elements(By.CLASS_NAME, 'jobs-search-results__list-item')
@@ -214,6 +299,17 @@ class AIHawkJobManager:
             logger.error(f"Error while fetching job elements: {e}")
             return []
 
+    def scroll_job_results(self, job_results):
+        scroll_start = time.perf_counter()
+        if self.scroll_strategy == "human":
+            utils.scroll_slow(self.driver, job_results)
+            utils.scroll_slow(self.driver, job_results, step=300, reverse=True)
+        else:
+            utils.scroll_until_loaded(self.driver, job_results, '.job-card-container')
+        scroll_time = time.perf_counter() - scroll_start
+        logger.info(f"Scrolled job results in {scroll_time:.2f} seconds (strategy: {self.scroll_strategy})")
+        return scroll_time
+
     def apply_jobs(self):
         try:
             no_jobs_element = self.driver.find_element(By.CLASS_NAME, 'jobs-search-two-pane__no-results-banner--expand')
@@ -223,14 +319,23 @@ class AIHawkJobManager:
         except NoSuchElementException:
             pass
 
-        job_list_elements = self.driver.find_elements(By.CLASS_NAME, 'scaffold-layout__list-container')[
-            0].find_elements(By.CLASS_NAME, 'jobs-search-results__list-item')
+        with utils.WebDriverCallCounter(self.driver) as call_counter:
+            job_list_container = self.driver.find_elements(By.CLASS_NAME, 'scaffold-layout__list-container')[0]
+            job_list_elements = job_list_container.find_elements(By.CLASS_NAME, 'jobs-search-results__list-item')
 
-        if not job_list_elements:
-            logger.debug("No job class elements found on page, skipping")
-            return
+            if not job_list_elements:
+                logger.debug("No job class elements found on page, skipping")
+                return
 
-        job_list = [Job(*self.extract_job_information_from_tile(job_element)) for job_element in job_list_elements]
+            job_list = []
+            if self.tile_extraction_mode == "script":
+                job_list = self.extract_jobs_information_from_page(job_list_container)
+            if not job_list:
+                job_list = [Job(*self.extract_job_information_from_tile(job_element)) for job_element in job_list_elements]
+
+        self.pages_read += 1
+        self.webdriver_calls += call_counter.count
+        logger.debug(f"Extracted {len(job_list)} jobs from page using {call_counter.count} WebDriver calls")
 
         for job in job_list:
 
@@ -289,13 +394,12 @@ class AIHawkJobManager:
             """
         
 
+            if self.is_already_applied_to_job(job.title, job.company, job.link):
+                continue
             if self.is_blacklisted(job.title, job.company, job.link):
                 logger.debug(f"Job blacklisted: {job.title} at {job.company}")
                 self.write_to_file(job, "skipped")
                 continue
-            if self.is_already_applied_to_job(job.title, job.company, job.link):
-                self.write_to_file(job, "skipped")
-                continue
             if self.is_already_applied_to_company(job.company):
                 self.write_to_file(job, "skipped")
                 continue
@@ -304,13 +408,21 @@ class AIHawkJobManager:
                     self.easy_applier_component.job_apply(job)
                     self.write_to_file(job, "success")
                     logger.debug(f"Applied to job: {job.title} at {job.company}")
+            except DeadlineExceeded as e:
+                logger.error(f"Ran out of time applying for {job.title} at {job.company}: {e}")
+                self.write_to_file(job, "timeout")
+                continue
             except Exception as e:
                 logger.error(f"Failed to apply for {job.title} at {job.company}: {e}")
                 self.write_to_file(job, "failed")
                 continue
 
     def write_to_file(self, job, file_name):
-        logger.debug(f"Writing job application result to file: {file_name}")
+        logger.debug(f"Writing job application result to ledger: {file_name}")
+        # Skips are decided again on every run, so that blacklist changes apply at once;
+        # timed out applications are retried
+        if file_name in ("success", "failed"):
+            self.seen_jobs.add(job.job_id or extract_job_id(job.link), file_name)
         pdf_path = Path(job.pdf_path).resolve()
         pdf_path = pdf_path.as_uri()
         data = {
@@ -321,23 +433,9 @@ class AIHawkJobManager:
             "job_location": job.location,
             "pdf_path": pdf_path
         }
-        file_path = self.output_file_directory / f"{file_name}.json"
-        if not file_path.exists():
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump([data], f, indent=4)
-                logger.debug(f"Job data written to new file: {file_name}")
-        else:
-            with open(file_path, 'r+', encoding='utf-8') as f:
-                try:
-                    existing_data = json.load(f)
-                except json.JSONDecodeError:
-                    logger.error(f"JSON decode error in file: {file_path}")
-                    existing_data = []
-                existing_data.append(data)
-                f.seek(0)
-                json.dump(existing_data, f, indent=4)
-                f.truncate()
-                logger.debug(f"Job data appended to existing file: {file_name}")
+        self.result_ledger.append(file_name, data)
+        if file_name == "success":
+            self.applied_companies.add(self.normalize_company_name(job.company))
 
     def get_base_search_url(self, parameters):
         logger.debug("Constructing base search URL")
@@ -370,11 +468,42 @@ class AIHawkJobManager:
         self.driver.get(
             f"https://www.linkedin.com/jobs/search/{self.base_search_url}&keywords={position}{location}&start={job_page * 25}")
 
+    def extract_jobs_information_from_page(self, job_list_container):
+        logger.debug("Extracting job information from all tiles with a single script")
+        try:
+            tiles = self.driver.execute_script(JOB_TILES_SCRIPT, job_list_container)
+        except Exception as e:
+            logger.warning(f"Job tile script failed, falling back to per-tile extraction: {e}")
+            return []
+
+        if not isinstance(tiles, list) or not tiles:
+            logger.debug("Job tile script returned nothing, falling back to per-tile extraction")
+            return []
+
+        job_list = []
+        for tile in tiles:
+            if not isinstance(tile, dict):
+                continue
+            apply_method = tile.get('apply_method')
+            if apply_method is None:
+                apply_method = "Applied"
+                logger.warning("Apply method not found, assuming 'Applied'.")
+            job_list.append(Job(
+                title=tile.get('title') or "",
+                company=tile.get('company') or "",
+                location=tile.get('location') or "",
+                link=tile.get('link') or "",
+                apply_method=apply_method,
+                job_id=str(tile.get('job_id') or ""),
+                insight=tile.get('insight') or ""
+            ))
+        logger.debug(f"Job information extracted for {len(job_list)} tiles")
+        return job_list
+
     def extract_job_information_from_tile(self, job_tile):
         logger.debug("Extracting job information from tile")
         job_title, company, job_location, apply_method, link = "", "", "", "", ""
         try:
-            print(job_tile.get_attribute('outerHTML'))
             job_title = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title').find_element(By.TAG_NAME, 'strong').text
             
             link = job_tile.find_element(By.CLASS_NAME, 'job-card-list__title').get_attribute('href').split('?')[0]
@@ -399,34 +528,36 @@ class AIHawkJobManager:
         job_title_words = job_title.lower().split(' ')
         title_blacklisted = any(word in job_title_words for word in self.title_blacklist)
         company_blacklisted = company.strip().lower() in (word.strip().lower() for word in self.company_blacklist)
-        link_seen = link in self.seen_jobs
-        is_blacklisted = title_blacklisted or company_blacklisted or link_seen
+        is_blacklisted = title_blacklisted or company_blacklisted
         logger.debug(f"Job blacklisted status: {is_blacklisted}")
 
-        return title_blacklisted or company_blacklisted or link_seen
+        return is_blacklisted
 
     def is_already_applied_to_job(self, job_title, company, link):
-        link_seen = link in self.seen_jobs
+        link_seen = extract_job_id(link) in self.seen_jobs
         if link_seen:
-            logger.debug(f"Already applied to job: {job_title} at {company}, skipping...")
+            logger.debug(f"Already handled job: {job_title} at {company}, skipping...")
         return link_seen
 
     def is_already_applied_to_company(self, company):
         if not self.apply_once_at_company:
             return False
 
-        output_files = ["success.json"]
-        for file_name in output_files:
-            file_path = self.output_file_directory / file_name
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    try:
-                        existing_data = json.load(f)
-                        for applied_job in existing_data:
-                            if applied_job['company'].strip().lower() == company.strip().lower():
-                                logger.debug(
-                                    f"Already applied at {company} (once per company policy), skipping...")
-                                return True
-                    except json.JSONDecodeError:
-                        continue
+        if self.normalize_company_name(company) in self.applied_companies:
+            logger.debug(f"Already applied at {company} (once per company policy), skipping...")
+            return True
         return False
+
+    def load_applied_companies(self):
+        logger.debug("Building index of companies already applied to")
+        applied_companies = {
+            self.normalize_company_name(applied_job.get('company') or '')
+            for applied_job in self.result_ledger.iter_records("success")
+        }
+        applied_companies.discard('')
+        logger.debug(f"Indexed {len(applied_companies)} companies already applied to")
+        return applied_companies
+
+    @staticmethod
+    def normalize_company_name(company):
+        return " ".join(company.split()).casefold()
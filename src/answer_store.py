@@ -0,0 +1,199 @@
+import atexit
+import bisect
+import json
+import os
+import re
+import tempfile
+import threading
+import traceback
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+# Stores with answers not yet written, flushed by a single exit hook
+_open_stores = weakref.WeakSet()
+
+
+def sanitize_text(text: str) -> str:
+    sanitized_text = text.lower().strip().replace('"', '').replace('\\', '')
+    sanitized_text = re.sub(r'[\x00-\x1F\x7F]', '', sanitized_text).replace('\n', ' ').replace('\r', '').rstrip(',')
+    return sanitized_text
+
+
+class AnswerStore:
+    """
+    In-memory index over the answers saved in answers.json.
+    Answers are keyed by (type, sanitized question) for O(1) exact lookups,
+    with a sorted key list per type for prefix lookups and a memoized
+    substring fallback matching the 'in' checks used by the form handlers.
+    Like those checks, a lookup returns the first matching answer in file order.
+    New answers are visible immediately; the file is rewritten atomically
+    shortly after the last change.
+    """
+
+    def __init__(self, file_path: str = 'answers.json', flush_delay: float = 2.0):
+        self.file_path = Path(file_path)
+        self.flush_delay = flush_delay
+        self._records: List[dict] = []
+        self._exact: Dict[Tuple[str, str], dict] = {}
+        self._sorted_keys: Dict[str, List[str]] = {}
+        self._keys_in_order: Dict[str, List[str]] = {}
+        self._order: Dict[Tuple[str, str], int] = {}
+        self._contains_cache: Dict[Tuple[str, str], Optional[str]] = {}
+        self._lock = threading.RLock()
+        # Serializes whole writes so that an older snapshot never replaces a newer file
+        self._write_lock = threading.Lock()
+        self._flush_timer = None
+        self._dirty = False
+        self.load()
+        _open_stores.add(self)
+
+    def load(self) -> None:
+        logger.debug(f"Loading questions from JSON file: {self.file_path}")
+        try:
+            with open(self.file_path, 'r') as f:
+                try:
+                    data = json.load(f)
+                    if not isinstance(data, list):
+                        raise ValueError("JSON file format is incorrect. Expected a list of questions.")
+                except json.JSONDecodeError:
+                    logger.error("JSON decoding failed")
+                    data = []
+        except FileNotFoundError:
+            logger.warning("JSON file not found, starting with no saved answers")
+            data = []
+        except Exception:
+            tb_str = traceback.format_exc()
+            logger.error(f"Error loading questions data from JSON file: {tb_str}")
+            raise Exception(f"Error loading questions data from JSON file: \nTraceback:\n{tb_str}")
+
+        with self._lock:
+            self._records = []
+            self._exact.clear()
+            self._sorted_keys.clear()
+            self._keys_in_order.clear()
+            self._order.clear()
+            self._contains_cache.clear()
+            for item in data:
+                if isinstance(item, dict) and 'question' in item and 'type' in item:
+                    self._index(item)
+        logger.debug(f"Loaded {len(self._records)} saved answers")
+
+    def _index(self, item: dict) -> None:
+        key = (item['type'], sanitize_text(item['question']))
+        existing = self._exact.get(key)
+        if existing is not None:
+            existing['answer'] = item.get('answer')
+            if item.get('section'):
+                existing['section'] = item['section']
+            return
+        self._records.append(item)
+        self._exact[key] = item
+        bisect.insort(self._sorted_keys.setdefault(key[0], []), key[1])
+        keys_in_order = self._keys_in_order.setdefault(key[0], [])
+        self._order[key] = len(keys_in_order)
+        keys_in_order.append(key[1])
+
+    def find_exact(self, question_type: str, question: str) -> Optional[str]:
+        item = self._exact.get((question_type, sanitize_text(question)))
+        return item.get('answer') if item else None
+
+    def find_containing(self, question_type: str, question: str) -> Optional[str]:
+        """
+        Returns the answer of the first saved question of the given type that
+        contains the sanitized question text. The earliest question starting with
+        the text is found in the sorted keys; only questions saved before it are
+        scanned for a substring match.
+        """
+        query = sanitize_text(question)
+        cache_key = (question_type, query)
+        with self._lock:
+            if cache_key in self._contains_cache:
+                return self._contains_cache[cache_key]
+
+            sorted_keys = self._sorted_keys.get(question_type, [])
+            keys_in_order = self._keys_in_order.get(question_type, [])
+            first = len(keys_in_order)
+            position = bisect.bisect_left(sorted_keys, query)
+            while position < len(sorted_keys) and sorted_keys[position].startswith(query):
+                first = min(first, self._order[(question_type, sorted_keys[position])])
+                position += 1
+            for index in range(first):
+                if query in keys_in_order[index]:
+                    first = index
+                    break
+            answer = None
+            if first < len(keys_in_order):
+                answer = self._exact[(question_type, keys_in_order[first])].get('answer')
+            self._contains_cache[cache_key] = answer
+            return answer
+
+    def add(self, question_type: str, question: str, answer, section: Optional[str] = None) -> None:
+        """
+        :param section: The resume section a textbox question was routed to; it trains the section router.
+        """
+        question = sanitize_text(question)
+        with self._lock:
+            existing = self._exact.get((question_type, question))
+            if (existing is not None and existing.get('answer') == answer
+                    and (section is None or existing.get('section') == section)):
+                return
+            item = {'type': question_type, 'question': question, 'answer': answer}
+            if section:
+                item['section'] = section
+            self._index(item)
+            self._contains_cache = {
+                key: value for key, value in self._contains_cache.items() if key[0] != question_type
+            }
+            self._dirty = True
+            self._schedule_flush()
+        logger.debug(f"Saved answer for {question_type} question: {question}")
+
+    def _schedule_flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+        self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            self._write()
+
+    def _write(self) -> None:
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            records = [dict(item) for item in self._records]
+            self._dirty = False
+
+        logger.debug(f"Writing {len(records)} saved answers to {self.file_path}")
+        directory = self.file_path.resolve().parent
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{self.file_path.name}.", suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(records, f, indent=4)
+            os.replace(temp_path, self.file_path)
+            logger.debug("Question data saved successfully to JSON")
+        except Exception:
+            with self._lock:
+                self._dirty = True
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            tb_str = traceback.format_exc()
+            logger.error(f"Error saving questions data to JSON file: {tb_str}")
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    for store in list(_open_stores):
+        store.flush()
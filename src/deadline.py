@@ -0,0 +1,105 @@
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+
+class DeadlineExceeded(Exception):
+    """Raised when the time budget of a job application has run out."""
+
+
+class Deadline:
+    """
+    Time budget of a single job application. A budget of None never expires.
+    """
+
+    def __init__(self, budget_seconds: Optional[float], label: str = ""):
+        self.budget_seconds = budget_seconds
+        self.label = label
+        self.started_at = time.monotonic()
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> float:
+        if self.budget_seconds is None:
+            return float("inf")
+        return max(self.budget_seconds - self.elapsed(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self, step: str = "") -> None:
+        if self.expired:
+            raise DeadlineExceeded(f"Application budget of {self.budget_seconds} seconds exceeded"
+                                   f"{f' during {step}' if step else ''} ({self.label})")
+
+    def timeout(self, per_call_timeout: Optional[float]) -> Optional[float]:
+        """
+        :return: min(per_call_timeout, remaining budget), or None when neither is bounded.
+        """
+        self.check()
+        remaining = self.remaining()
+        if per_call_timeout is None:
+            return None if remaining == float("inf") else remaining
+        return min(per_call_timeout, remaining)
+
+
+# Each thread (and asyncio task) sees the deadline of the application it works for
+_active: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+@contextmanager
+def activate(deadline: Deadline):
+    """
+    Makes the deadline visible to every LLM call and resume generation started while
+    the block runs in this thread. Work handed to other threads keeps it via bind_deadline.
+    """
+    token = _active.set(deadline)
+    logger.debug(f"Deadline of {deadline.budget_seconds} seconds started for {deadline.label}")
+    try:
+        yield deadline
+    finally:
+        _active.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _active.get()
+
+
+def bind_deadline(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wraps fn so that it runs under the deadline active now, in whichever thread calls it.
+    """
+    deadline = _active.get()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        token = _active.set(deadline)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _active.reset(token)
+
+    return run
+
+
+def call_timeout(per_call_timeout: Optional[float]) -> Optional[float]:
+    """
+    Timeout for one outgoing call: min(per_call_timeout, remaining application budget).
+    Raises DeadlineExceeded when the budget is already spent.
+    """
+    deadline = _active.get()
+    if deadline is None:
+        return per_call_timeout
+    return deadline.timeout(per_call_timeout)
+
+
+def check_deadline(step: str = "") -> None:
+    deadline = _active.get()
+    if deadline is not None:
+        deadline.check(step)
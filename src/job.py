@@ -1,7 +1,15 @@
+import re
 from dataclasses import dataclass
 
 from loguru import logger
 
+JOB_ID_PATTERN = re.compile(r"(?:/jobs/view/|currentJobId=)(\d+)")
+
+
+def extract_job_id(link: str) -> str:
+    match = JOB_ID_PATTERN.search(link or "")
+    return match.group(1) if match else ""
+
 
 @dataclass
 class Job:
@@ -14,6 +22,12 @@ class Job:
     summarize_job_description: str = ""
     pdf_path: str = ""
     recruiter_link: str = ""
+    job_id: str = ""
+    insight: str = ""
+
+    def __post_init__(self):
+        if not self.job_id:
+            self.job_id = extract_job_id(self.link)
 
     def set_summarize_job_description(self, summarize_job_description):
         logger.debug(f"Setting summarized job description: {summarize_job_description}")
@@ -0,0 +1,66 @@
+import math
+import threading
+from collections import deque
+from typing import Optional
+
+
+class HedgePolicy:
+    """
+    Decides when a slow LLM request gets a duplicate (hedge) request.
+    The delay is the configured percentile of recent reply latencies, clamped
+    between min_delay and max_delay; max_delay is used until min_samples
+    latencies were observed.
+    """
+
+    def __init__(self, enabled: bool = False, percentile: float = 95.0, min_delay: float = 2.0,
+                 max_delay: float = 30.0, min_samples: int = 20, window: int = 200):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, hedging_config: Optional[dict]) -> "HedgePolicy":
+        hedging_config = hedging_config or {}
+        return cls(
+            enabled=hedging_config.get('enabled', False),
+            percentile=hedging_config.get('percentile', 95.0),
+            min_delay=hedging_config.get('min_delay', 2.0),
+            max_delay=hedging_config.get('max_delay', 30.0),
+            min_samples=hedging_config.get('min_samples', 20),
+        )
+
+    def delay(self) -> float:
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.max_delay
+            latencies = sorted(self._latencies)
+        index = min(math.ceil(self.percentile / 100.0 * len(latencies)) - 1, len(latencies) - 1)
+        return min(max(latencies[max(index, 0)], self.min_delay), self.max_delay)
+
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def record_request(self, hedged: bool, hedge_won: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            if hedged:
+                self.hedged += 1
+            if hedge_won:
+                self.hedge_wins += 1
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_rate": self.hedged / self.requests if self.requests else 0.0,
+            "hedge_wins": self.hedge_wins,
+            "delay_seconds": round(self.delay(), 3),
+        }
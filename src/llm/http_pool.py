@@ -0,0 +1,123 @@
+import importlib.util
+import threading
+from typing import Dict, Optional
+
+import httpx
+from loguru import logger
+
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+ANTHROPIC_BASE_URL = "https://api.anthropic.com"
+
+
+class ConnectionStats:
+    """
+    Counts requests and newly opened connections of one pool; every request that did
+    not open a connection reused a kept-alive one.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_event(self, event_name: str) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    def as_dict(self) -> dict:
+        reused = max(self.requests - self.connections, 0)
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "tls_handshakes": self.tls_handshakes,
+            "reused": reused,
+            "reuse_rate": round(reused / self.requests, 3) if self.requests else 0.0,
+        }
+
+
+class PooledClients:
+    """
+    One sync and one async httpx client sharing limits for a provider base URL.
+    The async client is only used from the shared LLM event loop.
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 20, max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 60.0, http2: bool = True):
+        self.base_url = base_url
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            logger.debug(f"HTTP/2 requested for {base_url} but the h2 package is not installed, using HTTP/1.1")
+        self.stats = ConnectionStats()
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections,
+                              keepalive_expiry=keepalive_expiry)
+        self.client = httpx.Client(limits=limits, http2=self.http2,
+                                   event_hooks={"request": [self._trace_request]})
+        self.async_client = httpx.AsyncClient(limits=limits, http2=self.http2,
+                                              event_hooks={"request": [self._atrace_request]})
+
+    def _trace_request(self, request: httpx.Request) -> None:
+        self.stats.record_request()
+        request.extensions["trace"] = lambda event_name, info: self.stats.record_event(event_name)
+
+    async def _atrace_request(self, request: httpx.Request) -> None:
+        self.stats.record_request()
+
+        async def trace(event_name, info):
+            self.stats.record_event(event_name)
+
+        request.extensions["trace"] = trace
+
+    def close(self) -> None:
+        self.client.close()
+
+
+_pool_config: dict = {}
+_pools: Dict[str, PooledClients] = {}
+_registry_lock = threading.Lock()
+
+
+def configure_http_pool(pool_config: Optional[dict]) -> None:
+    """
+    Sets the limits from the llm_http_pool config section: max_connections,
+    max_keepalive_connections, keepalive_expiry and http2.
+    """
+    with _registry_lock:
+        _pool_config.clear()
+        _pool_config.update(pool_config or {})
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+    logger.debug(f"LLM HTTP pool configured: {_pool_config}")
+
+
+def get_pooled_clients(base_url: str) -> PooledClients:
+    """
+    Returns the process-wide clients shared by every provider object talking to base_url.
+    """
+    key = base_url.rstrip("/").lower()
+    with _registry_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = PooledClients(
+                key,
+                max_connections=_pool_config.get('max_connections', 20),
+                max_keepalive_connections=_pool_config.get('max_keepalive_connections', 10),
+                keepalive_expiry=_pool_config.get('keepalive_expiry', 60.0),
+                http2=_pool_config.get('http2', True),
+            )
+            _pools[key] = pool
+        return pool
+
+
+def http_pool_stats() -> Dict[str, dict]:
+    with _registry_lock:
+        return {pool.base_url: pool.stats.as_dict() for pool in _pools.values()}
@@ -0,0 +1,156 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from loguru import logger
+
+
+def render_messages(messages) -> list:
+    if hasattr(messages, "to_messages"):
+        messages = messages.to_messages()
+    if isinstance(messages, str):
+        return [["human", messages]]
+    rendered = []
+    for message in messages:
+        if isinstance(message, BaseMessage):
+            rendered.append([message.type, message.content])
+        else:
+            rendered.append(["raw", str(message)])
+    return rendered
+
+
+class LLMResponseCache:
+    """
+    Content-addressed cache of LLM replies stored in SQLite.
+    Keys hash the model signature (type, name, endpoint, generation params)
+    together with the rendered prompt messages. Entries expire after ttl_days
+    and the least recently used ones are evicted above max_entries.
+    Identical requests issued while a call is in flight share its result.
+    """
+
+    def __init__(self, db_path: Path, max_entries: int = 5000, ttl_days: float = 30):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.ttl_days = ttl_days
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._connection = None
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+
+    @staticmethod
+    def make_key(model_signature: dict, messages) -> str:
+        payload = json.dumps({"model": model_signature, "messages": render_messages(messages)},
+                             sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            logger.debug(f"Opening LLM response cache at {self.db_path}")
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            if self.ttl_days:
+                self._connection.execute("DELETE FROM llm_cache WHERE created_at < ?",
+                                         (time.time() - self.ttl_days * 86400,))
+            self._connection.commit()
+        return self._connection
+
+    def get(self, key: str) -> Optional[BaseMessage]:
+        with self._lock:
+            connection = self._get_connection()
+            row = connection.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if self.ttl_days and created_at < time.time() - self.ttl_days * 86400:
+                connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                connection.commit()
+                return None
+            connection.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            connection.commit()
+        return messages_from_dict([json.loads(response)])[0]
+
+    def put(self, key: str, message: BaseMessage) -> None:
+        try:
+            response = json.dumps(message_to_dict(message), ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"LLM reply could not be cached: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            connection = self._get_connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, response, now, now),
+            )
+            if self.max_entries:
+                connection.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            connection.commit()
+
+    def get_or_compute(self, key: str, compute: Callable[[], BaseMessage]) -> Tuple[BaseMessage, bool]:
+        """
+        Returns the cached reply for key, or computes it once for all concurrent callers.
+        :return: The reply and whether it was served without calling compute.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            logger.debug(f"LLM cache hit for {key[:12]}")
+            return cached, True
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            logger.debug(f"Waiting for in-flight LLM request {key[:12]}")
+            return future.result(), True
+
+        self.misses += 1
+        try:
+            message = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.put(key, message)
+            future.set_result(message)
+            return message, False
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
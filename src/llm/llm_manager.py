@@ -1,18 +1,20 @@
+import asyncio
 import json
 import os
 import re
 import textwrap
+import threading
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Optional
 from typing import Union
 
-import httpx
 from Levenshtein import distance
 from dotenv import load_dotenv
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import BaseMessage, BaseMessageChunk
 from langchain_core.messages.ai import AIMessage
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompt_values import StringPromptValue
@@ -20,6 +22,14 @@ from langchain_core.prompts import ChatPromptTemplate
 
 import src.strings as strings
 from loguru import logger
+from src.deadline import DeadlineExceeded, bind_deadline, call_timeout, check_deadline, current_deadline
+from src.llm.hedging import HedgePolicy
+from src.llm.http_pool import ANTHROPIC_BASE_URL, OPENAI_BASE_URL, get_pooled_clients
+from src.llm.llm_cache import LLMResponseCache
+from src.llm.rate_limiter import estimate_tokens, get_rate_limiter
+from src.llm.retry import CircuitBreaker, CircuitOpenError, RetryPolicy, RetryStats, is_transient_error
+from src.llm.section_router import SectionRouter
+from src.llm.streaming import StreamStats
 
 load_dotenv()
 
@@ -29,12 +39,25 @@ class AIModel(ABC):
     def invoke(self, prompt: str) -> str:
         pass
 
+    async def ainvoke(self, prompt: str) -> BaseMessage:
+        return await self.model.ainvoke(prompt)
+
+    def stream(self, prompt: str) -> Iterator[BaseMessageChunk]:
+        """
+        Yields the reply chunk by chunk. Providers without streaming support yield the
+        whole reply as a single chunk.
+        """
+        return self.model.stream(prompt)
+
 
 class OpenAIModel(AIModel):
-    def __init__(self, api_key: str, llm_model: str):
+    def __init__(self, api_key: str, llm_model: str, temperature: float = 0.4, max_tokens: Optional[int] = None,
+                 timeout: Optional[float] = None):
         from langchain_openai import ChatOpenAI
+        pool = get_pooled_clients(OPENAI_BASE_URL)
         self.model = ChatOpenAI(model_name=llm_model, openai_api_key=api_key,
-                                temperature=0.4)
+                                temperature=temperature, max_tokens=max_tokens, timeout=timeout,
+                                stream_usage=True, http_client=pool.client, http_async_client=pool.async_client)
 
     def invoke(self, prompt: str) -> BaseMessage:
         logger.debug("Invoking OpenAI API")
@@ -43,10 +66,16 @@ class OpenAIModel(AIModel):
 
 
 class ClaudeModel(AIModel):
-    def __init__(self, api_key: str, llm_model: str):
+    def __init__(self, api_key: str, llm_model: str, temperature: float = 0.4, max_tokens: Optional[int] = None,
+                 timeout: Optional[float] = None):
         from langchain_anthropic import ChatAnthropic
+        options = {"max_tokens": max_tokens} if max_tokens else {}
         self.model = ChatAnthropic(model=llm_model, api_key=api_key,
-                                   temperature=0.4)
+                                   temperature=temperature, timeout=timeout, **options)
+        # ChatAnthropic has no http_client option, so its SDK clients are rebuilt on the shared pool
+        pool = get_pooled_clients(ANTHROPIC_BASE_URL)
+        object.__setattr__(self.model, "_client", self.model._client.copy(http_client=pool.client))
+        object.__setattr__(self.model, "_async_client", self.model._async_client.copy(http_client=pool.async_client))
 
     def invoke(self, prompt: str) -> BaseMessage:
         response = self.model.invoke(prompt)
@@ -55,14 +84,16 @@ class ClaudeModel(AIModel):
 
 
 class OllamaModel(AIModel):
-    def __init__(self, llm_model: str, llm_api_url: str):
+    def __init__(self, llm_model: str, llm_api_url: str, temperature: Optional[float] = None,
+                 max_tokens: Optional[int] = None, timeout: Optional[float] = None):
         from langchain_ollama import ChatOllama
 
+        options = {"temperature": temperature, "num_predict": max_tokens, "client_kwargs": {"timeout": timeout}}
         if len(llm_api_url) > 0:
             logger.debug(f"Using Ollama with API URL: {llm_api_url}")
-            self.model = ChatOllama(model=llm_model, base_url=llm_api_url)
+            self.model = ChatOllama(model=llm_model, base_url=llm_api_url, **options)
         else:
-            self.model = ChatOllama(model=llm_model)
+            self.model = ChatOllama(model=llm_model, **options)
 
     def invoke(self, prompt: str) -> BaseMessage:
         response = self.model.invoke(prompt)
@@ -70,9 +101,13 @@ class OllamaModel(AIModel):
 
 #gemini doesn't seem to work because API doesn't rstitute answers for questions that involve answers that are too short
 class GeminiModel(AIModel):
-    def __init__(self, api_key:str, llm_model: str):
+    def __init__(self, api_key:str, llm_model: str, temperature: Optional[float] = None,
+                 max_tokens: Optional[int] = None, timeout: Optional[float] = None):
         from langchain_google_genai import ChatGoogleGenerativeAI, HarmBlockThreshold, HarmCategory
-        self.model = ChatGoogleGenerativeAI(model=llm_model, google_api_key=api_key,safety_settings={
+        options = {key: value for key, value in (("temperature", temperature), ("max_output_tokens", max_tokens),
+                                                 ("timeout", timeout))
+                   if value is not None}
+        self.model = ChatGoogleGenerativeAI(model=llm_model, google_api_key=api_key, **options, safety_settings={
         HarmCategory.HARM_CATEGORY_UNSPECIFIED: HarmBlockThreshold.BLOCK_NONE,
         HarmCategory.HARM_CATEGORY_DEROGATORY: HarmBlockThreshold.BLOCK_NONE,
         HarmCategory.HARM_CATEGORY_TOXICITY: HarmBlockThreshold.BLOCK_NONE,
@@ -91,10 +126,14 @@ class GeminiModel(AIModel):
         return response
 
 class HuggingFaceModel(AIModel):
-    def __init__(self, api_key: str, llm_model: str):
+    def __init__(self, api_key: str, llm_model: str, temperature: float = 0.4, max_tokens: Optional[int] = None,
+                 timeout: Optional[float] = None):
         from langchain_huggingface import HuggingFaceEndpoint, ChatHuggingFace
+        options = {"max_new_tokens": max_tokens} if max_tokens else {}
+        if timeout:
+            options["timeout"] = timeout
         self.model = HuggingFaceEndpoint(repo_id=llm_model, huggingfacehub_api_token=api_key,
-                                   temperature=0.4)
+                                   temperature=temperature, **options)
         self.chatmodel=ChatHuggingFace(llm=self.model)
 
     def invoke(self, prompt: str) -> BaseMessage:
@@ -103,36 +142,247 @@ class HuggingFaceModel(AIModel):
         print(response,type(response))
         return response
 
+    async def ainvoke(self, prompt: str) -> BaseMessage:
+        return await self.chatmodel.ainvoke(prompt)
+
+    def stream(self, prompt: str) -> Iterator[BaseMessageChunk]:
+        return self.chatmodel.stream(prompt)
+
 class AIAdapter:
     def __init__(self, config: dict, api_key: str):
+        self.request_timeout = config.get('llm_request_timeout', 120)
         self.model = self._create_model(config, api_key)
+        self.signature = self._signature(config)
+        breaker_config = config.get('llm_circuit_breaker') or {}
+        self.failure_threshold = breaker_config.get('failure_threshold', 5)
+        self.reset_timeout = breaker_config.get('reset_timeout', 60.0)
+        self.breaker = self._create_breaker(config)
+        self.failovers = []
+        for failover_config in config.get('llm_failover') or []:
+            self.failovers.append((self._create_model(failover_config, failover_config.get('llm_api_key', api_key)),
+                                   self._create_breaker(failover_config), self._signature(failover_config)))
+        self.failover_calls = 0
+        self.hedging = HedgePolicy.from_config(config.get('llm_hedging'))
+
+    @staticmethod
+    def _signature(config: dict) -> dict:
+        return {
+            "llm_model_type": config['llm_model_type'],
+            "llm_model": config['llm_model'],
+            "llm_api_url": config.get('llm_api_url', ""),
+            "temperature": config.get('temperature', 0.4),
+            "max_tokens": config.get('max_tokens'),
+        }
+
+    def _create_breaker(self, config: dict) -> CircuitBreaker:
+        return CircuitBreaker(f"{config['llm_model_type']}/{config['llm_model']}",
+                              failure_threshold=self.failure_threshold, reset_timeout=self.reset_timeout)
 
     def _create_model(self, config: dict, api_key: str) -> AIModel:
         llm_model_type = config['llm_model_type']
         llm_model = config['llm_model']
 
         llm_api_url = config.get('llm_api_url', "")
+        temperature = config.get('temperature')
+        max_tokens = config.get('max_tokens')
+        timeout = self.request_timeout
 
         logger.debug(f"Using {llm_model_type} with {llm_model}")
 
         if llm_model_type == "openai":
-            return OpenAIModel(api_key, llm_model)
+            return OpenAIModel(api_key, llm_model, temperature=0.4 if temperature is None else temperature,
+                               max_tokens=max_tokens, timeout=timeout)
         elif llm_model_type == "claude":
-            return ClaudeModel(api_key, llm_model)
+            return ClaudeModel(api_key, llm_model, temperature=0.4 if temperature is None else temperature,
+                               max_tokens=max_tokens, timeout=timeout)
         elif llm_model_type == "ollama":
-            return OllamaModel(llm_model, llm_api_url)
+            return OllamaModel(llm_model, llm_api_url, temperature=temperature, max_tokens=max_tokens,
+                               timeout=timeout)
         elif llm_model_type == "gemini":
-            return GeminiModel(api_key, llm_model)
+            return GeminiModel(api_key, llm_model, temperature=temperature, max_tokens=max_tokens, timeout=timeout)
         elif llm_model_type == "huggingface":
-            return HuggingFaceModel(api_key, llm_model)        
+            return HuggingFaceModel(api_key, llm_model, temperature=0.4 if temperature is None else temperature,
+                                    max_tokens=max_tokens, timeout=timeout)
         else:
             raise ValueError(f"Unsupported model type: {llm_model_type}")
 
     def invoke(self, prompt: str) -> str:
-        return self.model.invoke(prompt)
+        """
+        Calls the primary model, or the first failover model whose circuit breaker is
+        closed while the primary one is open. Every call waits for the shared rate
+        limiter of its provider and model. While a job application is running, the call
+        is cut off after min(llm_request_timeout, remaining application budget).
+        """
+        deadline = current_deadline()
+        timeout = call_timeout(self.request_timeout) if deadline is not None else None
+        providers = [(self.model, self.breaker, self.signature)] + self.failovers
+        for i, provider in enumerate(providers):
+            trial = provider[1].allow()
+            if not trial:
+                continue
+            if i > 0:
+                self.failover_calls += 1
+                logger.warning(f"Primary model unavailable, failing over to {provider[1].name}")
+            if self.hedging.enabled:
+                backup = next((other for other in providers[i + 1:] if other[1].state == "closed"), provider)
+                coroutine = self._invoke_hedged(prompt, provider, backup, trial)
+            elif timeout is not None:
+                coroutine = self._ainvoke_provider(provider, prompt, trial)
+            else:
+                return self._invoke_provider(provider, prompt, trial)
+            try:
+                return asyncio.run_coroutine_threadsafe(asyncio.wait_for(coroutine, timeout), _event_loop()).result()
+            except asyncio.TimeoutError:
+                provider[1].record_failure()
+                if deadline is not None:
+                    deadline.check(f"a call to {provider[1].name}")
+                raise TimeoutError(f"LLM request to {provider[1].name} timed out after {timeout:.1f} seconds")
+        retry_in = min(breaker.retry_in() for _, breaker, _ in providers)
+        raise CircuitOpenError(f"All LLM circuit breakers are open, retry in {retry_in:.1f} seconds", retry_in)
+
+    def stream(self, prompt: str) -> Iterator[BaseMessageChunk]:
+        """
+        Streams the reply of the primary model, or of the first failover model whose
+        circuit breaker is closed. Streams are not hedged; the application deadline is
+        checked between chunks.
+        """
+        providers = [(self.model, self.breaker, self.signature)] + self.failovers
+        for i, (model, breaker, signature) in enumerate(providers):
+            trial = breaker.allow()
+            if not trial:
+                continue
+            if i > 0:
+                self.failover_calls += 1
+                logger.warning(f"Primary model unavailable, failing over to {breaker.name}")
+            limiter = get_rate_limiter(signature['llm_model_type'], signature['llm_model'])
+            estimated_tokens = estimate_tokens(prompt)
+            limiter.acquire(estimated_tokens)
+            usage_metadata = {}
+            try:
+                for chunk in model.stream(prompt):
+                    check_deadline("an LLM stream")
+                    usage_metadata = getattr(chunk, 'usage_metadata', None) or usage_metadata
+                    yield chunk
+            except DeadlineExceeded:
+                breaker.release_trial(trial)
+                raise
+            except Exception as e:
+                if is_transient_error(e):
+                    breaker.record_failure()
+                else:
+                    breaker.release_trial(trial)
+                raise
+            breaker.record_success()
+            limiter.record_usage(usage_metadata.get('total_tokens', 0), estimated_tokens)
+            return
+        retry_in = min(breaker.retry_in() for _, breaker, _ in providers)
+        raise CircuitOpenError(f"All LLM circuit breakers are open, retry in {retry_in:.1f} seconds", retry_in)
+
+    @staticmethod
+    def _invoke_provider(provider, prompt, trial: object = True) -> BaseMessage:
+        model, breaker, signature = provider
+        limiter = get_rate_limiter(signature['llm_model_type'], signature['llm_model'])
+        estimated_tokens = estimate_tokens(prompt)
+        limiter.acquire(estimated_tokens)
+        try:
+            reply = model.invoke(prompt)
+        except Exception as e:
+            if is_transient_error(e):
+                breaker.record_failure()
+            else:
+                breaker.release_trial(trial)
+            raise
+        breaker.record_success()
+        usage_metadata = getattr(reply, 'usage_metadata', None) or {}
+        limiter.record_usage(usage_metadata.get('total_tokens', 0), estimated_tokens)
+        return reply
+
+    @staticmethod
+    async def _ainvoke_provider(provider, prompt, trial: object = True) -> BaseMessage:
+        model, breaker, signature = provider
+        limiter = get_rate_limiter(signature['llm_model_type'], signature['llm_model'])
+        estimated_tokens = estimate_tokens(prompt)
+        await asyncio.to_thread(limiter.acquire, estimated_tokens)
+        try:
+            reply = await model.ainvoke(prompt)
+        except asyncio.CancelledError:
+            # A losing hedge may be the half-open trial of its provider
+            breaker.release_trial(trial)
+            raise
+        except Exception as e:
+            if is_transient_error(e):
+                breaker.record_failure()
+            else:
+                breaker.release_trial(trial)
+            raise
+        breaker.record_success()
+        usage_metadata = getattr(reply, 'usage_metadata', None) or {}
+        limiter.record_usage(usage_metadata.get('total_tokens', 0), estimated_tokens)
+        return reply
+
+    async def _invoke_hedged(self, prompt, primary, backup, trial: object = True) -> BaseMessage:
+        """
+        Sends the request to the primary provider and, if it has not replied within the
+        hedge delay, a duplicate to the backup provider. The first successful reply wins
+        and the other request is cancelled.
+        """
+        start = time.monotonic()
+        first = asyncio.ensure_future(self._ainvoke_provider(primary, prompt, trial))
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.hedging.delay())
+            if done:
+                self.hedging.record_request(hedged=False, hedge_won=False)
+                reply = first.result()
+                self.hedging.record_latency(time.monotonic() - start)
+                return reply
+
+            logger.debug(f"LLM request slower than {self.hedging.delay():.2f} seconds, hedging to {backup[1].name}")
+            second = asyncio.ensure_future(self._ainvoke_provider(backup, prompt))
+            tasks.append(second)
+            pending = {first, second}
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    for loser in pending:
+                        loser.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    self.hedging.record_request(hedged=True, hedge_won=task is second)
+                    self.hedging.record_latency(time.monotonic() - start)
+                    if task is second:
+                        logger.info(f"Hedged LLM request won, hedging stats: {self.hedging.stats()}")
+                    return task.result()
+            self.hedging.record_request(hedged=True, hedge_won=False)
+            raise error
+        finally:
+            # Cancelling this coroutine (request timeout, application deadline) does not cancel its tasks
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop running in a background thread, shared by all hedged and time-bounded
+    requests so that the async HTTP clients of the models always run on the same loop.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="llm-requests", daemon=True).start()
+        return _loop
 
 
 class LLMLogger:
+    _write_lock = threading.Lock()
 
     def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel]):
         self.llm = llm
@@ -230,9 +480,9 @@ class LLMLogger:
             raise
 
         try:
-            with open(calls_log, "a", encoding="utf-8") as f:
-                json_string = json.dumps(
-                    log_entry, ensure_ascii=False, indent=4)
+            json_string = json.dumps(
+                log_entry, ensure_ascii=False, indent=4)
+            with LLMLogger._write_lock, open(calls_log, "a", encoding="utf-8") as f:
                 f.write(json_string + "\n")
                 logger.debug(f"Log entry written to file: {calls_log}")
         except Exception as e:
@@ -242,13 +492,33 @@ class LLMLogger:
 
 class LoggerChatModel:
 
-    def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel]):
+    def __init__(self, llm: Union[OpenAIModel, OllamaModel, ClaudeModel, GeminiModel],
+                 cache: LLMResponseCache = None, retry_policy: RetryPolicy = None):
         self.llm = llm
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_stats = RetryStats()
+        self.stream_stats = StreamStats()
         logger.debug(f"LoggerChatModel successfully initialized with LLM: {llm}")
 
     def __call__(self, messages: List[Dict[str, str]]) -> str:
         logger.debug(f"Entering __call__ method with messages: {messages}")
+        if self.cache is None:
+            return self._invoke(messages)
+
+        signature = getattr(self.llm, "signature", {"llm": repr(self.llm)})
+        key = self.cache.make_key(signature, messages)
+        reply, cached = self.cache.get_or_compute(key, lambda: self._invoke(messages))
+        if cached:
+            logger.debug(f"LLM reply served from cache, stats: {self.cache.stats()}")
+        return reply
+
+    def _invoke(self, messages: List[Dict[str, str]]) -> str:
+        self.retry_stats.record_call()
+        start = time.monotonic()
+        attempt = 0
         while True:
+            attempt += 1
             try:
                 logger.debug("Attempting to call the LLM with messages")
 
@@ -264,37 +534,92 @@ class LoggerChatModel:
 
                 return reply
 
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTPStatusError encountered: {str(e)}")
-                if e.response.status_code == 429:
-                    retry_after = e.response.headers.get('retry-after')
-                    retry_after_ms = e.response.headers.get('retry-after-ms')
-
-                    if retry_after:
-                        wait_time = int(retry_after)
-                        logger.warning(
-                            f"Rate limit exceeded. Waiting for {wait_time} seconds before retrying (extracted from 'retry-after' header)...")
-                        time.sleep(wait_time)
-                    elif retry_after_ms:
-                        wait_time = int(retry_after_ms) / 1000.0
-                        logger.warning(
-                            f"Rate limit exceeded. Waiting for {wait_time} seconds before retrying (extracted from 'retry-after-ms' header)...")
-                        time.sleep(wait_time)
-                    else:
-                        wait_time = 30
-                        logger.warning(
-                            f"'retry-after' header not found. Waiting for {wait_time} seconds before retrying (default)...")
-                        time.sleep(wait_time)
-                else:
-                    logger.error(f"HTTP error occurred with status code: {e.response.status_code}, waiting 30 seconds before retrying")
-                    time.sleep(30)
-
+            except DeadlineExceeded:
+                self.retry_stats.record_give_up()
+                raise
             except Exception as e:
-                logger.error(f"Unexpected error occurred: {str(e)}")
-                logger.info(
-                    "Waiting for 30 seconds before retrying due to an unexpected error.")
-                time.sleep(30)
-                continue
+                wait_time = self.retry_policy.next_delay(attempt, time.monotonic() - start, e)
+                deadline = current_deadline()
+                if wait_time is not None and deadline is not None and wait_time >= deadline.remaining():
+                    self.retry_stats.record_give_up()
+                    raise DeadlineExceeded(f"LLM call failed ({str(e)}) and the retry delay of {wait_time:.1f} "
+                                           f"seconds exceeds the remaining application budget") from e
+                if wait_time is None:
+                    self.retry_stats.record_give_up()
+                    logger.error(f"LLM call failed after {attempt} attempts: {str(e)}, "
+                                 f"retry stats: {self.retry_stats.as_dict()}")
+                    raise
+                self.retry_stats.record_retry(wait_time)
+                logger.warning(f"LLM call failed ({str(e)}), attempt {attempt}/{self.retry_policy.max_attempts}, "
+                               f"waiting {wait_time:.1f} seconds before retrying")
+                time.sleep(wait_time)
+
+    def stream(self, messages) -> Iterator[str]:
+        """
+        Yields the text of the reply as it is generated. A failed stream is retried like
+        _invoke as long as nothing was yielded yet; the full reply is logged and cached
+        once the stream ends.
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(getattr(self.llm, "signature", {"llm": repr(self.llm)}), messages)
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug("Streamed LLM reply served from cache")
+                yield cached.content
+                return
+
+        self.retry_stats.record_call()
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_start = time.monotonic()
+            first_token_seconds = None
+            message = None
+            try:
+                for chunk in self.llm.stream(messages):
+                    message = chunk if message is None else message + chunk
+                    if not chunk.content:
+                        continue
+                    if first_token_seconds is None:
+                        first_token_seconds = time.monotonic() - attempt_start
+                    yield chunk.content
+                break
+            except DeadlineExceeded:
+                self.retry_stats.record_give_up()
+                raise
+            except Exception as e:
+                wait_time = None if first_token_seconds is not None else \
+                    self.retry_policy.next_delay(attempt, time.monotonic() - start, e)
+                deadline = current_deadline()
+                if wait_time is not None and deadline is not None and wait_time >= deadline.remaining():
+                    self.retry_stats.record_give_up()
+                    raise DeadlineExceeded(f"LLM stream failed ({str(e)}) and the retry delay of {wait_time:.1f} "
+                                           f"seconds exceeds the remaining application budget") from e
+                if wait_time is None:
+                    self.retry_stats.record_give_up()
+                    logger.error(f"LLM stream failed after {attempt} attempts: {str(e)}")
+                    raise
+                self.retry_stats.record_retry(wait_time)
+                logger.warning(f"LLM stream failed ({str(e)}), waiting {wait_time:.1f} seconds before retrying")
+                time.sleep(wait_time)
+
+        content = message.content if message is not None else ""
+        usage_metadata = getattr(message, 'usage_metadata', None) or {
+            "input_tokens": estimate_tokens(messages),
+            "output_tokens": estimate_tokens(content),
+            "total_tokens": estimate_tokens(messages) + estimate_tokens(content),
+        }
+        reply = AIMessage(content=content, id=getattr(message, 'id', None),
+                          response_metadata=getattr(message, 'response_metadata', None) or {},
+                          usage_metadata=usage_metadata)
+        self.stream_stats.record(first_token_seconds, time.monotonic() - attempt_start,
+                                 usage_metadata.get("output_tokens", 0))
+        logger.debug(f"LLM stream finished, stream stats: {self.stream_stats.as_dict()}")
+        LLMLogger.log_request(prompts=messages, parsed_reply=self.parse_llmresult(reply))
+        if key is not None:
+            self.cache.put(key, reply)
 
     def parse_llmresult(self, llmresult: AIMessage) -> Dict[str, Dict]:
         logger.debug(f"Parsing LLM result: {llmresult}")
@@ -354,11 +679,111 @@ class LoggerChatModel:
             raise
 
 
+SECTION_TEMPLATES = {
+    "personal_information": "personal_information_template",
+    "self_identification": "self_identification_template",
+    "legal_authorization": "legal_authorization_template",
+    "work_preferences": "work_preferences_template",
+    "education_details": "education_details_template",
+    "experience_details": "experience_details_template",
+    "projects": "projects_template",
+    "availability": "availability_template",
+    "salary_expectations": "salary_expectations_template",
+    "certifications": "certifications_template",
+    "languages": "languages_template",
+    "interests": "interests_template",
+    "cover_letter": "coverletter_template",
+}
+
+CHAIN_TEMPLATES = {
+    **SECTION_TEMPLATES,
+    "section_router": "section_router_template",
+    "summarize": "summarize_prompt_template",
+    "numeric_question": "numeric_question_template",
+    "options": "options_template",
+    "resume_or_cover": "resume_or_cover_template",
+    "batch_questions": "batch_questions_template",
+}
+
+# Call type of every chain, used to pick the model configured in llm_routes.
+CHAIN_CALL_TYPES = {
+    **{name: "text" for name in SECTION_TEMPLATES},
+    "cover_letter": "cover_letter",
+    "section_router": "classification",
+    "resume_or_cover": "classification",
+    "options": "options",
+    "numeric_question": "numeric",
+    "summarize": "summary",
+    "batch_questions": "text",
+}
+
+SECTION_NAME_PATTERN = re.compile(
+    r"(Personal information|Self Identification|Legal Authorization|Work Preferences|Education "
+    r"Details|Experience Details|Projects|Availability|Salary "
+    r"Expectations|Certifications|Languages|Interests|Cover letter)",
+    re.IGNORECASE)
+
+
 class GPTAnswerer:
 
     def __init__(self, config, llm_api_key):
         self.ai_adapter = AIAdapter(config, llm_api_key)
-        self.llm_cheap = LoggerChatModel(self.ai_adapter)
+        self.llm_cache = self._create_cache(config.get('llm_cache', {}))
+        self.retry_policy = RetryPolicy.from_config(config.get('llm_retry'))
+        self.llm_cheap = LoggerChatModel(self.ai_adapter, cache=self.llm_cache, retry_policy=self.retry_policy)
+        self.llm_routes = self._create_routes(config, llm_api_key)
+        self._chains = {}
+        self.section_router = self._create_section_router(config.get('section_router', {}))
+        # Section chosen for each routed question, saved next to its answer in answers.json
+        self.routed_sections: Dict[str, str] = {}
+        self.max_concurrency = max(int(config.get('llm_max_concurrency', 4)), 1)
+        self.batch_questions = bool(config.get('llm_batch_questions', False))
+        # Model requests sent by the last answer_many call: batches plus individual answers
+        self.last_request_count = 0
+        self.streaming = bool(config.get('llm_streaming', True))
+
+    @staticmethod
+    def _create_cache(cache_config) -> Union[LLMResponseCache, None]:
+        if cache_config is False or (isinstance(cache_config, dict) and not cache_config.get('enabled', True)):
+            logger.debug("LLM response cache disabled")
+            return None
+        cache_config = cache_config if isinstance(cache_config, dict) else {}
+        return LLMResponseCache(
+            Path(cache_config.get('path', "data_folder/output/llm_cache.db")),
+            max_entries=cache_config.get('max_entries', 5000),
+            ttl_days=cache_config.get('ttl_days', 30),
+        )
+
+    def _create_routes(self, config: dict, llm_api_key: str) -> Dict[str, LoggerChatModel]:
+        """
+        Builds one model per call type configured in llm_routes. Route settings override
+        the main llm_* settings, and routes with identical settings share one model.
+        """
+        routes = {}
+        models = {json.dumps(self.ai_adapter.signature, sort_keys=True): self.llm_cheap}
+        for call_type, route_config in (config.get('llm_routes') or {}).items():
+            route_config = {**config, **(route_config or {})}
+            signature = json.dumps(AIAdapter._signature(route_config), sort_keys=True)
+            if signature not in models:
+                models[signature] = LoggerChatModel(AIAdapter(route_config, route_config.get('llm_api_key', llm_api_key)),
+                                                    cache=self.llm_cache, retry_policy=self.retry_policy)
+            routes[call_type] = models[signature]
+            logger.debug(f"Routing {call_type} calls to {route_config['llm_model_type']}/{route_config['llm_model']}")
+        return routes
+
+    def _llm_for(self, call_type: str) -> LoggerChatModel:
+        return self.llm_routes.get(call_type, self.llm_cheap)
+
+    @staticmethod
+    def _create_section_router(router_config) -> Union[SectionRouter, None]:
+        if router_config is False or (isinstance(router_config, dict) and not router_config.get('enabled', True)):
+            logger.debug("Local section router disabled")
+            return None
+        router_config = router_config if isinstance(router_config, dict) else {}
+        return SectionRouter(
+            min_score=router_config.get('min_score', 0.15),
+            min_margin=router_config.get('min_margin', 0.1),
+        )
 
     @property
     def job_description(self):
@@ -389,11 +814,14 @@ class GPTAnswerer:
         logger.debug(f"Setting resume: {resume}")
         self.resume = resume
 
-    def set_job(self, job):
+    def set_job(self, job, summary: Optional[str] = None):
+        """
+        :param summary: The description summary when it was already generated, e.g. speculatively.
+        """
         logger.debug(f"Setting job: {job}")
         self.job = job
         self.job.set_summarize_job_description(
-            self.summarize_job_description(self.job.description))
+            summary if summary is not None else self.summarize_job_description(self.job.description))
 
     def set_job_application_profile(self, job_application_profile):
         logger.debug(f"Setting job application profile: {job_application_profile}")
@@ -401,168 +829,97 @@ class GPTAnswerer:
 
     def summarize_job_description(self, text: str) -> str:
         logger.debug(f"Summarizing job description: {text}")
-        strings.summarize_prompt_template = self._preprocess_template_string(
-            strings.summarize_prompt_template
-        )
-        prompt = ChatPromptTemplate.from_template(
-            strings.summarize_prompt_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        output = chain.invoke({"text": text})
+        output = self._get_chain("summarize").invoke({"text": text})
         logger.debug(f"Summary generated: {output}")
         return output
 
-    def _create_chain(self, template: str):
+    def _create_chain(self, template: str, llm: LoggerChatModel = None):
         logger.debug(f"Creating chain with template: {template}")
-        prompt = ChatPromptTemplate.from_template(template)
-        return prompt | self.llm_cheap | StrOutputParser()
+        prompt = ChatPromptTemplate.from_template(self._preprocess_template_string(template))
+        return prompt | (llm or self.llm_cheap) | StrOutputParser()
+
+    def _get_chain(self, name: str):
+        """
+        Returns the chain for a template of CHAIN_TEMPLATES, building it on first use.
+        """
+        chain = self._chains.get(name)
+        if chain is None:
+            chain = self._create_chain(getattr(strings, CHAIN_TEMPLATES[name]), self._llm_for(CHAIN_CALL_TYPES[name]))
+            self._chains[name] = chain
+        return chain
 
     def answer_question_textual_wide_range(self, question: str) -> str:
         logger.debug(f"Answering textual question: {question}")
-        chains = {
-            "personal_information": self._create_chain(strings.personal_information_template),
-            "self_identification": self._create_chain(strings.self_identification_template),
-            "legal_authorization": self._create_chain(strings.legal_authorization_template),
-            "work_preferences": self._create_chain(strings.work_preferences_template),
-            "education_details": self._create_chain(strings.education_details_template),
-            "experience_details": self._create_chain(strings.experience_details_template),
-            "projects": self._create_chain(strings.projects_template),
-            "availability": self._create_chain(strings.availability_template),
-            "salary_expectations": self._create_chain(strings.salary_expectations_template),
-            "certifications": self._create_chain(strings.certifications_template),
-            "languages": self._create_chain(strings.languages_template),
-            "interests": self._create_chain(strings.interests_template),
-            "cover_letter": self._create_chain(strings.coverletter_template),
-        }
-        section_prompt = """You are assisting a bot designed to automatically apply for jobs on AIHawk. The bot receives various questions about job applications and needs to determine the most relevant section of the resume to provide an accurate response.
-
-        For the following question: '{question}', determine which section of the resume is most relevant. 
-        Respond with exactly one of the following options:
-        - Personal information
-        - Self Identification
-        - Legal Authorization
-        - Work Preferences
-        - Education Details
-        - Experience Details
-        - Projects
-        - Availability
-        - Salary Expectations
-        - Certifications
-        - Languages
-        - Interests
-        - Cover letter
-
-        Here are detailed guidelines to help you choose the correct section:
-
-        1. **Personal Information**:
-        - **Purpose**: Contains your basic contact details and online profiles.
-        - **Use When**: The question is about how to contact you or requests links to your professional online presence.
-        - **Examples**: Email address, phone number, AIHawk profile, GitHub repository, personal website.
-
-        2. **Self Identification**:
-        - **Purpose**: Covers personal identifiers and demographic information.
-        - **Use When**: The question pertains to your gender, pronouns, veteran status, disability status, or ethnicity.
-        - **Examples**: Gender, pronouns, veteran status, disability status, ethnicity.
-
-        3. **Legal Authorization**:
-        - **Purpose**: Details your work authorization status and visa requirements.
-        - **Use When**: The question asks about your ability to work in specific countries or if you need sponsorship or visas.
-        - **Examples**: Work authorization in EU and US, visa requirements, legally allowed to work.
-
-        4. **Work Preferences**:
-        - **Purpose**: Specifies your preferences regarding work conditions and job roles.
-        - **Use When**: The question is about your preferences for remote work, in-person work, relocation, and willingness to undergo assessments or background checks.
-        - **Examples**: Remote work, in-person work, open to relocation, willingness to complete assessments.
-
-        5. **Education Details**:
-        - **Purpose**: Contains information about your academic qualifications.
-        - **Use When**: The question concerns your degrees, universities attended, GPA, and relevant coursework.
-        - **Examples**: Degree, university, GPA, field of study, exams.
-
-        6. **Experience Details**:
-        - **Purpose**: Details your professional work history and key responsibilities.
-        - **Use When**: The question pertains to your job roles, responsibilities, and achievements in previous positions.
-        - **Examples**: Job positions, company names, key responsibilities, skills acquired.
-
-        7. **Projects**:
-        - **Purpose**: Highlights specific projects you have worked on.
-        - **Use When**: The question asks about particular projects, their descriptions, or links to project repositories.
-        - **Examples**: Project names, descriptions, links to project repositories.
-
-        8. **Availability**:
-        - **Purpose**: Provides information on your availability for new roles.
-        - **Use When**: The question is about how soon you can start a new job or your notice period.
-        - **Examples**: Notice period, availability to start.
-
-        9. **Salary Expectations**:
-        - **Purpose**: Covers your expected salary range.
-        - **Use When**: The question pertains to your salary expectations or compensation requirements.
-        - **Examples**: Desired salary range.
-
-        10. **Certifications**:
-            - **Purpose**: Lists your professional certifications or licenses.
-            - **Use When**: The question involves your certifications or qualifications from recognized organizations.
-            - **Examples**: Certification names, issuing bodies, dates of validity.
-
-        11. **Languages**:
-            - **Purpose**: Describes the languages you can speak and your proficiency levels.
-            - **Use When**: The question asks about your language skills or proficiency in specific languages.
-            - **Examples**: Languages spoken, proficiency levels.
-
-        12. **Interests**:
-            - **Purpose**: Details your personal or professional interests.
-            - **Use When**: The question is about your hobbies, interests, or activities outside of work.
-            - **Examples**: Personal hobbies, professional interests.
-
-        13. **Cover Letter**:
-            - **Purpose**: Contains your personalized cover letter or statement.
-            - **Use When**: The question involves your cover letter or specific written content intended for the job application.
-            - **Examples**: Cover letter content, personalized statements.
-
-        Provide only the exact name of the section from the list above with no additional text.
-        """
-        prompt = ChatPromptTemplate.from_template(section_prompt)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        output = chain.invoke({"question": question})
-
-        match = re.search(
-            r"(Personal information|Self Identification|Legal Authorization|Work Preferences|Education "
-            r"Details|Experience Details|Projects|Availability|Salary "
-            r"Expectations|Certifications|Languages|Interests|Cover letter)",
-            output, re.IGNORECASE)
-        if not match:
-            raise ValueError(
-                "Could not extract section name from the response.")
+        section_name, inputs = self._textual_wide_range_inputs(question)
+        output = self._get_chain(section_name).invoke(inputs)
+        if section_name == "cover_letter":
+            logger.debug(f"Cover letter generated: {output}")
+        else:
+            logger.debug(f"Question answered: {output}")
+        return output
 
-        section_name = match.group(1).lower().replace(" ", "_")
+    def stream_question_textual_wide_range(self, question: str) -> Iterator[str]:
+        """
+        Same as answer_question_textual_wide_range, but yields the answer text as it is
+        generated.
+        """
+        logger.debug(f"Streaming answer to textual question: {question}")
+        section_name, inputs = self._textual_wide_range_inputs(question)
+        prompt = self._get_chain(section_name).first.invoke(inputs)
+        return self._llm_for(CHAIN_CALL_TYPES[section_name]).stream(prompt)
 
+    def _textual_wide_range_inputs(self, question: str):
+        section_name = self._route_question(question)
         if section_name == "cover_letter":
-            chain = chains.get(section_name)
-            output = chain.invoke(
-                {"resume": self.resume, "job_description": self.job_description})
-            logger.debug(f"Cover letter generated: {output}")
-            return output
+            return section_name, {"resume": self.resume, "job_description": self.job_description}
         resume_section = getattr(self.resume, section_name, None) or getattr(self.job_application_profile, section_name,
                                                                              None)
         if resume_section is None:
             logger.error(
                 f"Section '{section_name}' not found in either resume or job_application_profile.")
             raise ValueError(f"Section '{section_name}' not found in either resume or job_application_profile.")
-        chain = chains.get(section_name)
-        if chain is None:
+        if section_name not in SECTION_TEMPLATES:
             logger.error(f"Chain not defined for section '{section_name}'")
             raise ValueError(f"Chain not defined for section '{section_name}'")
-        output = chain.invoke(
-            {"resume_section": resume_section, "question": question})
-        logger.debug(f"Question answered: {output}")
-        return output
+        return section_name, {"resume_section": resume_section, "question": question}
+
+    def _route_question(self, question: str) -> str:
+        """
+        Picks the resume section for a question, locally when the section router is
+        confident and with the routing prompt otherwise.
+        """
+        start = time.perf_counter()
+        if self.section_router is not None:
+            section_name = self.section_router.route(question)
+            if section_name is not None:
+                self.section_router.record(local=True, seconds=time.perf_counter() - start)
+                logger.debug(f"Section '{section_name}' chosen locally, router stats: {self.section_router.stats()}")
+                self.routed_sections[question] = section_name
+                return section_name
+
+        output = self._get_chain("section_router").invoke({"question": question})
+        match = SECTION_NAME_PATTERN.search(output)
+        if not match:
+            raise ValueError(
+                "Could not extract section name from the response.")
+
+        section_name = match.group(1).lower().replace(" ", "_")
+        if self.section_router is not None:
+            self.section_router.record(local=False, seconds=time.perf_counter() - start)
+            self.section_router.learn(question, section_name)
+            logger.debug(f"Section '{section_name}' chosen by the LLM, router stats: {self.section_router.stats()}")
+        self.routed_sections[question] = section_name
+        return section_name
+
+    def take_routed_section(self, question: str) -> Optional[str]:
+        """
+        :return: The resume section the question was routed to, if it was routed.
+        """
+        return self.routed_sections.pop(question, None)
 
     def answer_question_numeric(self, question: str, default_experience: int = 3) -> int:
         logger.debug(f"Answering numeric question: {question}")
-        func_template = self._preprocess_template_string(
-            strings.numeric_question_template)
-        prompt = ChatPromptTemplate.from_template(func_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        output_str = chain.invoke(
+        output_str = self._get_chain("numeric_question").invoke(
             {"resume_educations": self.resume.education_details, "resume_jobs": self.resume.experience_details,
              "resume_projects": self.resume.projects, "question": question})
         logger.debug(f"Raw output for numeric question: {output_str}")
@@ -587,31 +944,121 @@ class GPTAnswerer:
 
     def answer_question_from_options(self, question: str, options: list[str]) -> str:
         logger.debug(f"Answering question from options: {question}")
-        func_template = self._preprocess_template_string(
-            strings.options_template)
-        prompt = ChatPromptTemplate.from_template(func_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        output_str = chain.invoke(
+        output_str = self._get_chain("options").invoke(
             {"resume": self.resume, "question": question, "options": options})
         logger.debug(f"Raw output for options question: {output_str}")
         best_option = self.find_best_match(output_str, options)
         logger.debug(f"Best option determined: {best_option}")
         return best_option
 
+    def answer_many(self, questions: List[Dict[str, Any]]) -> List[Optional[Any]]:
+        """
+        Answers independent questions concurrently, at most llm_max_concurrency at a time.
+        Each question is a dict with a 'kind' (numeric, options or text), the 'question' and,
+        for options, the 'options'. Answers keep the order of the questions; None marks a
+        question that could not be answered. The number of model requests it took is left in
+        last_request_count.
+        """
+        logger.debug(f"Answering {len(questions)} questions with concurrency {self.max_concurrency}")
+        start = time.perf_counter()
+        answers = [None] * len(questions)
+        self.last_request_count = 0
+        if self.batch_questions:
+            batchable = [i for i, question in enumerate(questions)
+                         if not (question['kind'] == 'text' and 'cover letter' in question['question'].lower())]
+            if len(batchable) > 1:
+                self.last_request_count += 1
+                for i, answer in zip(batchable, self.answer_batch([questions[i] for i in batchable])):
+                    answers[i] = answer
+
+        remaining = [i for i, answer in enumerate(answers) if answer is None]
+        self.last_request_count += len(remaining)
+        if len(remaining) <= 1 or self.max_concurrency == 1:
+            individual_answers = [self._answer_one(questions[i]) for i in remaining]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(remaining)),
+                                    thread_name_prefix="gpt-answerer") as executor:
+                individual_answers = list(executor.map(bind_deadline(self._answer_one), [questions[i] for i in remaining]))
+        for i, answer in zip(remaining, individual_answers):
+            answers[i] = answer
+        logger.debug(f"Answered {len(questions)} questions in {time.perf_counter() - start:.2f} seconds")
+        return answers
+
+    def answer_batch(self, questions: List[Dict[str, Any]]) -> List[Optional[Any]]:
+        """
+        Answers several questions with a single prompt that shares the resume context.
+        Answers that are missing or do not match their question type are returned as None
+        so that the caller can retry them individually.
+        """
+        logger.debug(f"Answering {len(questions)} questions in one batch")
+        payload = []
+        for i, question in enumerate(questions):
+            item = {"id": f"q{i}", "type": question['kind'], "question": question['question']}
+            if question['kind'] == 'options':
+                item["options"] = question['options']
+            payload.append(item)
+        try:
+            output = self._get_chain("batch_questions").invoke({
+                "resume": self.resume,
+                "job_application_profile": getattr(self, 'job_application_profile', None),
+                "questions": json.dumps(payload, ensure_ascii=False, indent=2),
+            })
+            replies = self._parse_json_object(output)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.warning(f"Batch answering failed, questions will be answered individually: {e}")
+            return [None] * len(questions)
+
+        answers = [self._validate_answer(question, replies.get(f"q{i}")) for i, question in enumerate(questions)]
+        logger.debug(f"Batch answered {sum(answer is not None for answer in answers)} of {len(questions)} questions")
+        return answers
+
+    @staticmethod
+    def _parse_json_object(output: str) -> Dict[str, Any]:
+        start, end = output.find("{"), output.rfind("}")
+        if start == -1 or end < start:
+            raise ValueError(f"No JSON object in the batch reply: {output}")
+        replies = json.loads(output[start:end + 1])
+        if not isinstance(replies, dict):
+            raise ValueError(f"Batch reply is not a JSON object: {output}")
+        return replies
+
+    def _validate_answer(self, question: Dict[str, Any], answer: Any) -> Optional[Any]:
+        if answer is None or isinstance(answer, (dict, list)):
+            return None
+        if question['kind'] == 'numeric':
+            if isinstance(answer, bool):
+                return None
+            if isinstance(answer, (int, float)):
+                return int(answer)
+            try:
+                return self.extract_number_from_string(str(answer))
+            except ValueError:
+                return None
+        answer = str(answer).strip()
+        if question['kind'] == 'options':
+            return next((option for option in question['options']
+                         if option.strip().lower() == answer.lower()), None)
+        return answer or None
+
+    def _answer_one(self, question: Dict[str, Any]) -> Optional[Any]:
+        try:
+            if question['kind'] == 'numeric':
+                return self.answer_question_numeric(question['question'])
+            if question['kind'] == 'options':
+                return self.answer_question_from_options(question['question'], question['options'])
+            return self.answer_question_textual_wide_range(question['question'])
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            logger.warning(f"Failed to answer question '{question['question']}': {e}")
+            return None
+
     def resume_or_cover(self, phrase: str) -> str:
         logger.debug(
             f"Determining if phrase refers to resume or cover letter: {phrase}")
-        prompt_template = """
-                Given the following phrase, respond with only 'resume' if the phrase is about a resume, or 'cover' if it's about a cover letter.
-                If the phrase contains only one word 'upload', consider it as 'cover'.
-                If the phrase contains 'upload resume', consider it as 'resume'.
-                Do not provide any additional information or explanations.
-
-                phrase: {phrase}
-                """
-        prompt = ChatPromptTemplate.from_template(prompt_template)
-        chain = prompt | self.llm_cheap | StrOutputParser()
-        response = chain.invoke({"phrase": phrase})
+        response = self._get_chain("resume_or_cover").invoke({"phrase": phrase})
         logger.debug(f"Response for resume_or_cover: {response}")
         if "resume" in response:
             return "resume"
@@ -0,0 +1,160 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at rate_per_minute / 60 per second.
+    Reservations may take the level below zero; the caller then waits until the
+    deficit is refilled, so waiting callers are served in arrival order.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.refill_per_second = rate_per_minute / 60.0
+        self.level = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        :return: Seconds to wait before the reserved amount may be used.
+        """
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return max(-self.level / self.refill_per_second, 0.0)
+
+    def adjust(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+
+class RateLimiter:
+    """
+    Client-side limit on requests and tokens per minute for one provider/model.
+    acquire() blocks only as long as needed for both budgets.
+    """
+
+    def __init__(self, name: str, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.acquired = 0
+        self.delayed = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def limited(self) -> bool:
+        return self.requests is not None or self.tokens is not None
+
+    def acquire(self, estimated_tokens: int = 0) -> float:
+        """
+        Reserves one request and estimated_tokens tokens, sleeping until they are available.
+        :return: The number of seconds waited.
+        """
+        if not self.limited:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            wait = 0.0
+            if self.requests is not None:
+                wait = max(wait, self.requests.reserve(1, now))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.reserve(estimated_tokens, now))
+            self.acquired += 1
+            if wait > 0:
+                self.delayed += 1
+                self.queue_depth += 1
+                self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+                self.wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+                queue_depth = self.queue_depth
+
+        if wait > 0:
+            logger.info(f"Rate limiter {self.name}: waiting {wait:.2f} seconds, queue depth {queue_depth}")
+            time.sleep(wait)
+            with self._lock:
+                self.queue_depth -= 1
+        return wait
+
+    def record_usage(self, actual_tokens: int, estimated_tokens: int) -> None:
+        """
+        Corrects the token budget once the provider reported the real usage.
+        """
+        if self.tokens is None or not actual_tokens:
+            return
+        with self._lock:
+            self.tokens.adjust(actual_tokens - min(estimated_tokens, self.tokens.capacity), time.monotonic())
+
+    def stats(self) -> dict:
+        return {
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
+
+
+_limits: Dict[str, dict] = {}
+_limiters: Dict[Tuple[str, str], RateLimiter] = {}
+_registry_lock = threading.Lock()
+
+
+def configure_rate_limits(limits_config: Optional[dict]) -> None:
+    """
+    Sets the limits from the llm_rate_limits config section. Keys are a provider
+    ("openai") or a provider and model ("openai/gpt-4o-mini"); values take
+    requests_per_minute and tokens_per_minute.
+    """
+    with _registry_lock:
+        _limits.clear()
+        _limits.update({str(key).lower(): value or {} for key, value in (limits_config or {}).items()})
+        _limiters.clear()
+    logger.debug(f"LLM rate limits configured: {_limits}")
+
+
+def get_rate_limiter(provider: str, model: str) -> RateLimiter:
+    """
+    Returns the process-wide limiter shared by every caller of the provider/model.
+    """
+    key = ((provider or "").lower(), (model or "").lower())
+    with _registry_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limits = _limits.get(f"{key[0]}/{key[1]}") or _limits.get(key[0]) or {}
+            limiter = RateLimiter(f"{key[0]}/{key[1]}",
+                                  requests_per_minute=limits.get('requests_per_minute'),
+                                  tokens_per_minute=limits.get('tokens_per_minute'))
+            _limiters[key] = limiter
+        return limiter
+
+
+def rate_limiter_stats() -> Dict[str, dict]:
+    with _registry_lock:
+        return {limiter.name: limiter.stats() for limiter in _limiters.values() if limiter.limited}
+
+
+def estimate_tokens(messages) -> int:
+    """
+    Rough prompt size in tokens (about four characters per token).
+    """
+    if hasattr(messages, "to_string"):
+        text = messages.to_string()
+    elif isinstance(messages, (list, tuple)):
+        text = " ".join(str(getattr(message, "content", message)) for message in messages)
+    else:
+        text = str(messages)
+    return len(text) // 4 + 1
@@ -0,0 +1,188 @@
+import random
+import threading
+import time
+from typing import Optional
+
+from loguru import logger
+
+NON_TRANSIENT_STATUS_CODES = {400, 401, 403, 404, 405, 413, 422}
+
+
+class CircuitOpenError(Exception):
+    """Raised when every configured provider has an open circuit breaker."""
+
+    def __init__(self, message: str, retry_in: float):
+        super().__init__(message)
+        self.retry_in = retry_in
+
+
+def error_status_code(error: BaseException) -> Optional[int]:
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Tells whether an LLM error may succeed when retried. Malformed or unauthorized
+    requests (4xx other than 408, 409 and 429) are never retried.
+    """
+    return error_status_code(error) not in NON_TRANSIENT_STATUS_CODES
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    if isinstance(error, CircuitOpenError):
+        return error.retry_in
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+class RetryStats:
+    def __init__(self):
+        self.calls = 0
+        self.retries = 0
+        self.give_ups = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record_call(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def record_retry(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self.wait_seconds += wait_seconds
+
+    def record_give_up(self) -> None:
+        with self._lock:
+            self.give_ups += 1
+
+    def as_dict(self) -> dict:
+        return {"calls": self.calls, "retries": self.retries, "give_ups": self.give_ups,
+                "wait_seconds": round(self.wait_seconds, 3)}
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with jitter, bounded by a number of attempts and a total
+    elapsed time. Server-provided retry-after/retry-after-ms delays take precedence.
+    """
+
+    def __init__(self, max_attempts: int = 6, max_elapsed_seconds: float = 300.0,
+                 base_delay: float = 2.0, max_delay: float = 60.0, jitter: float = 0.5):
+        self.max_attempts = max_attempts
+        self.max_elapsed_seconds = max_elapsed_seconds
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    @classmethod
+    def from_config(cls, retry_config: Optional[dict]) -> "RetryPolicy":
+        retry_config = retry_config or {}
+        return cls(
+            max_attempts=retry_config.get('max_attempts', 6),
+            max_elapsed_seconds=retry_config.get('max_elapsed_seconds', 300.0),
+            base_delay=retry_config.get('base_delay', 2.0),
+            max_delay=retry_config.get('max_delay', 60.0),
+        )
+
+    def delay(self, attempt: int, error: BaseException) -> float:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return max(retry_after, 0.0)
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return backoff * random.uniform(1 - self.jitter, 1)
+
+    def next_delay(self, attempt: int, elapsed: float, error: BaseException) -> Optional[float]:
+        """
+        :return: How long to wait before the next attempt, or None when the error must be raised.
+        """
+        if not is_transient_error(error) or attempt >= self.max_attempts:
+            return None
+        delay = self.delay(attempt, error)
+        if elapsed + delay > self.max_elapsed_seconds:
+            return None
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures and rejects calls for
+    reset_timeout seconds, then lets a single trial call through (half-open).
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._trial = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def retry_in(self) -> float:
+        if self.opened_at is None:
+            return 0.0
+        return max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0)
+
+    def allow(self) -> object:
+        """
+        :return: False when the call is rejected. The half-open trial call gets a token
+        instead of True, which identifies it to release_trial.
+        """
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                self._trial = object()
+                return self._trial
+            return False
+
+    def release_trial(self, trial: object) -> None:
+        """
+        Ends a call that neither proved nor disproved the provider's health (e.g. a
+        rejected request), so that the next call may be the half-open trial. Only the
+        call holding the trial token returned by allow can release it.
+        """
+        with self._lock:
+            if self._trial_in_flight and trial is self._trial:
+                self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit breaker for {self.name} closed")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._trial_in_flight:
+                    logger.warning(f"Circuit breaker for {self.name} opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
@@ -0,0 +1,173 @@
+import json
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+import src.strings as strings
+
+SECTION_BLOCK_PATTERN = re.compile(r"^\d+\.\s+\*\*(.+?)\*\*:\s*$(.*?)(?=^\d+\.\s+\*\*|^Provide only)",
+                                   re.MULTILINE | re.DOTALL)
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def section_descriptions(template: str = None) -> Dict[str, List[str]]:
+    """
+    Extracts the Purpose/Use When/Examples lines of every section from the routing prompt.
+    """
+    template = template if template is not None else strings.section_router_template
+    descriptions = {}
+    for title, block in SECTION_BLOCK_PATTERN.findall(template):
+        section_name = title.strip().lower().replace(" ", "_")
+        lines = [re.sub(r"^-\s*\*\*[^*]+\*\*:\s*", "", line.strip()) for line in block.strip().splitlines()]
+        descriptions[section_name] = [line for line in lines if line]
+    return descriptions
+
+
+class SectionRouter:
+    """
+    Local classifier picking the resume section for a free-text question.
+    Questions are embedded as TF-IDF weighted hashed word and character
+    n-grams and compared by cosine similarity with the centroid of each
+    section. Seeds come from the section descriptions of the routing prompt
+    and from questions the LLM already routed, which are persisted in
+    labels_path. route() returns None when it is not confident enough, so
+    the caller can fall back to the LLM.
+    """
+
+    def __init__(self, labels_path: Path = Path("data_folder/output/section_labels.jsonl"),
+                 answers_path: Path = Path("answers.json"), min_score: float = 0.15,
+                 min_margin: float = 0.1, dimensions: int = 2 ** 14):
+        self.labels_path = Path(labels_path)
+        self.answers_path = Path(answers_path)
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.dimensions = dimensions
+        self.hits = 0
+        self.fallbacks = 0
+        self.llm_route_seconds = 0.0
+        self.local_route_seconds = 0.0
+        self._examples: List[Tuple[str, str]] = []
+        self._sections: List[str] = []
+        self._idf = None
+        self._centroids = None
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _features(self, text: str) -> np.ndarray:
+        words = TOKEN_PATTERN.findall(text.lower())
+        grams = [f"w:{word}" for word in words]
+        grams += [f"b:{first} {second}" for first, second in zip(words, words[1:])]
+        for word in words:
+            padded = f" {word} "
+            grams += [f"c:{padded[i:i + 4]}" for i in range(max(len(padded) - 3, 1))]
+        if not grams:
+            return np.zeros(self.dimensions)
+        indices = [zlib.crc32(gram.encode("utf-8")) % self.dimensions for gram in grams]
+        counts = np.bincount(indices, minlength=self.dimensions).astype(np.float64)
+        return np.log1p(counts)
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        examples = [(section, line) for section, lines in section_descriptions().items() for line in lines]
+        examples += self._read_labels(self.labels_path, jsonl=True)
+        examples += self._read_labels(self.answers_path, jsonl=False)
+        self._fit(examples)
+
+    @staticmethod
+    def _read_labels(path: Path, jsonl: bool) -> List[Tuple[str, str]]:
+        if not path.is_file():
+            return []
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f if line.strip()] if jsonl else json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read section labels from {path}: {e}")
+            return []
+        if not isinstance(records, list):
+            return []
+        return [(record["section"], record["question"]) for record in records
+                if isinstance(record, dict) and record.get("section") and record.get("question")]
+
+    def _fit(self, examples: Iterable[Tuple[str, str]]) -> None:
+        self._examples = list(examples)
+        if not self._examples:
+            return
+        features = np.vstack([self._features(text) for _, text in self._examples])
+        document_frequency = np.count_nonzero(features, axis=0)
+        self._idf = np.log((1 + len(self._examples)) / (1 + document_frequency)) + 1.0
+        vectors = self._normalize(features * self._idf)
+
+        self._sections = sorted({section for section, _ in self._examples})
+        labels = np.array([self._sections.index(section) for section, _ in self._examples])
+        centroids = np.vstack([vectors[labels == i].mean(axis=0) for i in range(len(self._sections))])
+        self._centroids = self._normalize(centroids)
+        logger.debug(f"Section router fitted on {len(self._examples)} examples")
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def scores(self, question: str) -> Dict[str, float]:
+        with self._lock:
+            self._load()
+            if self._centroids is None:
+                return {}
+            vector = self._normalize(self._features(question) * self._idf)
+            similarities = self._centroids @ vector
+        return dict(zip(self._sections, similarities.tolist()))
+
+    def route(self, question: str) -> Optional[str]:
+        """
+        Returns the section for the question, or None when the best match is not confident.
+        """
+        ranked = sorted(self.scores(question).items(), key=lambda item: item[1], reverse=True)
+        if not ranked:
+            return None
+        best_section, best_score = ranked[0]
+        margin = best_score - (ranked[1][1] if len(ranked) > 1 else 0.0)
+        logger.debug(f"Section router scored '{question}': {best_section} ({best_score:.2f}, margin {margin:.2f})")
+        if best_score < self.min_score or margin < self.min_margin:
+            return None
+        return best_section
+
+    def learn(self, question: str, section: str) -> None:
+        """
+        Persists a question routed by the LLM and refits the router with it.
+        """
+        with self._lock:
+            self._load()
+            try:
+                self.labels_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.labels_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({"section": section, "question": question}, ensure_ascii=False) + "\n")
+            except OSError as e:
+                logger.warning(f"Could not persist section label: {e}")
+            self._fit(self._examples + [(section, question)])
+
+    def record(self, local: bool, seconds: float) -> None:
+        if local:
+            self.hits += 1
+            self.local_route_seconds += seconds
+        else:
+            self.fallbacks += 1
+            self.llm_route_seconds += seconds
+
+    def stats(self) -> dict:
+        routed = self.hits + self.fallbacks
+        average_llm_seconds = self.llm_route_seconds / self.fallbacks if self.fallbacks else 0.0
+        average_local_seconds = self.local_route_seconds / self.hits if self.hits else 0.0
+        return {
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "hit_rate": self.hits / routed if routed else 0.0,
+            "saved_seconds_per_question": max(average_llm_seconds - average_local_seconds, 0.0),
+            "saved_seconds": max(average_llm_seconds - average_local_seconds, 0.0) * self.hits,
+        }
@@ -0,0 +1,57 @@
+import threading
+from typing import List, Optional
+
+
+class StreamStats:
+    """
+    Time to first token and generation speed of streamed LLM replies.
+    """
+
+    def __init__(self):
+        self.streams = 0
+        self.tokens = 0
+        self.first_token_seconds = 0.0
+        self.max_first_token_seconds = 0.0
+        self.generation_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, first_token_seconds: Optional[float], total_seconds: float, tokens: int) -> None:
+        with self._lock:
+            self.streams += 1
+            self.tokens += tokens
+            if first_token_seconds is not None:
+                self.first_token_seconds += first_token_seconds
+                self.max_first_token_seconds = max(self.max_first_token_seconds, first_token_seconds)
+                self.generation_seconds += total_seconds - first_token_seconds
+
+    def as_dict(self) -> dict:
+        return {
+            "streams": self.streams,
+            "avg_first_token_seconds": round(self.first_token_seconds / self.streams, 3) if self.streams else 0.0,
+            "max_first_token_seconds": round(self.max_first_token_seconds, 3),
+            "tokens_per_second": round(self.tokens / self.generation_seconds, 1) if self.generation_seconds else 0.0,
+        }
+
+
+class LineBuffer:
+    """
+    Splits streamed text into complete lines as the chunks arrive.
+    """
+
+    def __init__(self):
+        self._pending = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        :return: The lines completed by this chunk, without their line breaks.
+        """
+        self._pending += chunk
+        *lines, self._pending = self._pending.split("\n")
+        return lines
+
+    def flush(self) -> List[str]:
+        """
+        :return: The last, unterminated line, if any.
+        """
+        pending, self._pending = self._pending, ""
+        return [pending] if pending else []
@@ -0,0 +1,98 @@
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from loguru import logger
+
+LEGACY_RESULT_FILES = ("success", "failed", "skipped", "skipped_due_to_applicants")
+
+
+class ResultLedger:
+    """
+    Append-only JSONL log of job application results.
+    Each line is one record with a 'status' and a 'timestamp' field. Records
+    go through a single buffered handle, so writing costs O(1) no matter how
+    large the history is. The old success.json / failed.json / skipped.json
+    arrays are migrated into the ledger the first time it is opened.
+    """
+
+    def __init__(self, output_directory: Path, file_name: str = "results.jsonl"):
+        self.output_directory = Path(output_directory)
+        self.file_path = self.output_directory / file_name
+        self._handle = None
+        self._migrated = False
+        self._lock = threading.Lock()
+
+    def _ensure_migrated(self) -> None:
+        if self._migrated:
+            return
+        self._migrated = True
+        self.migrate_legacy_files()
+
+    def migrate_legacy_files(self) -> int:
+        migrated = 0
+        for status in LEGACY_RESULT_FILES:
+            legacy_path = self.output_directory / f"{status}.json"
+            if not legacy_path.is_file():
+                continue
+            logger.debug(f"Migrating legacy result file {legacy_path} to {self.file_path}")
+            try:
+                with open(legacy_path, 'r', encoding='utf-8') as f:
+                    records = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.error(f"Could not read legacy result file {legacy_path}: {e}")
+                continue
+            if not isinstance(records, list):
+                logger.error(f"Legacy result file {legacy_path} is not a JSON array, skipping")
+                continue
+
+            timestamp = datetime.fromtimestamp(legacy_path.stat().st_mtime).isoformat(timespec="seconds")
+            with self._lock:
+                handle = self._get_handle()
+                for record in records:
+                    handle.write(json.dumps({"status": status, "timestamp": timestamp, **record},
+                                            ensure_ascii=False) + "\n")
+                handle.flush()
+            legacy_path.rename(legacy_path.with_name(f"{legacy_path.name}.migrated"))
+            migrated += len(records)
+            logger.debug(f"Migrated {len(records)} records from {legacy_path}")
+        return migrated
+
+    def _get_handle(self):
+        if self._handle is None:
+            self.output_directory.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.file_path, 'a', encoding='utf-8')
+        return self._handle
+
+    def append(self, status: str, record: dict) -> None:
+        self._ensure_migrated()
+        entry = {"status": status, "timestamp": datetime.now().isoformat(timespec="seconds"), **record}
+        with self._lock:
+            handle = self._get_handle()
+            handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            handle.flush()
+        logger.debug(f"Job result appended to ledger with status: {status}")
+
+    def iter_records(self, status: Optional[str] = None) -> Iterator[dict]:
+        self._ensure_migrated()
+        if not self.file_path.is_file():
+            return
+        with open(self.file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.error(f"Skipping malformed line in {self.file_path}")
+                    continue
+                if status is None or record.get("status") == status:
+                    yield record
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
@@ -0,0 +1,180 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+WORD_PATTERN = re.compile(r"\w+")
+SIMHASH_BITS = 64
+
+
+def normalize_job_description(text: str) -> str:
+    """
+    Lowercases the description and drops punctuation and whitespace differences, so that
+    reposts that only differ in formatting get the same fingerprint.
+    """
+    return " ".join(WORD_PATTERN.findall((text or "").lower()))
+
+
+def fingerprint(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def simhash(normalized_text: str, shingle_size: int = 3) -> int:
+    """
+    64-bit SimHash over word shingles: near-duplicate texts differ in few bits.
+    """
+    words = normalized_text.split()
+    shingles = [" ".join(words[i:i + shingle_size]) for i in range(max(len(words) - shingle_size + 1, 1))]
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(SIMHASH_BITS) if weights[bit] > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def file_hash(path: Path) -> Optional[str]:
+    path = Path(path)
+    if not path.is_file():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class ResumeArtifactCache:
+    """
+    On-disk cache of tailored resume PDFs for one plain text resume, keyed by the
+    selected style and the fingerprint of the normalized job description. When there
+    is no exact match, a resume tailored for a near duplicate description (SimHash
+    within max_distance bits) is reused. The least recently used PDFs are evicted
+    once the store exceeds max_bytes.
+    """
+
+    def __init__(self, directory: Path, resume_hash: str, max_bytes: int = 200 * 1024 * 1024,
+                 max_distance: int = 3):
+        self.directory = Path(directory)
+        self.resume_hash = resume_hash
+        self.max_bytes = max_bytes
+        self.max_distance = max_distance
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(str(self.directory / "index.db"), check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS resumes ("
+                "key TEXT PRIMARY KEY, resume_hash TEXT NOT NULL, style TEXT NOT NULL, "
+                "fingerprint TEXT NOT NULL, simhash INTEGER NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def _key(self, style: str, job_fingerprint: str) -> str:
+        return fingerprint(f"{self.resume_hash}\0{style}\0{job_fingerprint}")
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.pdf"
+
+    def get(self, style: str, job_description: str) -> Optional[bytes]:
+        """
+        :return: The PDF tailored for this or a near duplicate job description, or None.
+        """
+        normalized = normalize_job_description(job_description)
+        if not normalized:
+            return None
+        key = self._key(style, fingerprint(normalized))
+        with self._lock:
+            connection = self._get_connection()
+            near = False
+            if connection.execute("SELECT 1 FROM resumes WHERE key = ?", (key,)).fetchone() is None:
+                key = self._find_near_duplicate(connection, style, simhash(normalized)) if self.max_distance else None
+                near = key is not None
+            pdf = None
+            if key is not None:
+                try:
+                    pdf = self._path(key).read_bytes()
+                except OSError:
+                    connection.execute("DELETE FROM resumes WHERE key = ?", (key,))
+                else:
+                    connection.execute("UPDATE resumes SET last_used = ? WHERE key = ?", (time.time(), key))
+                connection.commit()
+            if pdf is None:
+                self.misses += 1
+            elif near:
+                self.near_hits += 1
+            else:
+                self.hits += 1
+        logger.debug(f"Resume cache {'miss' if pdf is None else 'near duplicate hit' if near else 'hit'}, "
+                     f"stats: {self.stats()}")
+        return pdf
+
+    def _find_near_duplicate(self, connection: sqlite3.Connection, style: str, job_simhash: int) -> Optional[str]:
+        best, best_distance = None, self.max_distance + 1
+        for key, stored in connection.execute("SELECT key, simhash FROM resumes WHERE resume_hash = ? AND style = ?",
+                                              (self.resume_hash, style)):
+            distance = hamming_distance(job_simhash, stored % (1 << SIMHASH_BITS))
+            if distance < best_distance:
+                best, best_distance = key, distance
+        return best
+
+    def put(self, style: str, job_description: str, pdf: bytes) -> None:
+        normalized = normalize_job_description(job_description)
+        if not normalized:
+            return
+        job_fingerprint = fingerprint(normalized)
+        key = self._key(style, job_fingerprint)
+        # SQLite integers are signed 64-bit
+        job_simhash = simhash(normalized)
+        if job_simhash >= 1 << (SIMHASH_BITS - 1):
+            job_simhash -= 1 << SIMHASH_BITS
+        now = time.time()
+        with self._lock:
+            connection = self._get_connection()
+            self._path(key).write_bytes(pdf)
+            connection.execute(
+                "INSERT OR REPLACE INTO resumes (key, resume_hash, style, fingerprint, simhash, size, created_at, "
+                "last_used) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, self.resume_hash, style, job_fingerprint, job_simhash, len(pdf), now, now),
+            )
+            self._evict(connection)
+            connection.commit()
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM resumes").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in connection.execute("SELECT key, size FROM resumes ORDER BY last_used").fetchall():
+            if total <= self.max_bytes:
+                break
+            self._path(key).unlink(missing_ok=True)
+            connection.execute("DELETE FROM resumes WHERE key = ?", (key,))
+            total -= size
+            logger.debug(f"Evicted cached resume {key[:12]} ({size} bytes)")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.near_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
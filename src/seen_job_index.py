@@ -0,0 +1,70 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from loguru import logger
+
+
+class SeenJobIndex:
+    """
+    Persistent set of LinkedIn job ids that were already handled.
+    Ids are kept in memory for O(1) membership checks and mirrored in a
+    SQLite table so they survive restarts. Entries older than ttl_days are
+    dropped when the index is loaded.
+    """
+
+    def __init__(self, db_path: Path, ttl_days: float = 30):
+        self.db_path = Path(db_path)
+        self.ttl_days = ttl_days
+        self._job_ids = set()
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        logger.debug(f"Loading seen job index from {self.db_path}")
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS seen_jobs ("
+            "job_id TEXT PRIMARY KEY, status TEXT NOT NULL, seen_at REAL NOT NULL)"
+        )
+        self.compact()
+        self._job_ids = {row[0] for row in self._connection.execute("SELECT job_id FROM seen_jobs")}
+        logger.debug(f"Seen job index loaded with {len(self._job_ids)} jobs")
+
+    def compact(self) -> int:
+        if self._connection is None or not self.ttl_days:
+            return 0
+        cutoff = time.time() - self.ttl_days * 86400
+        with self._lock:
+            removed = self._connection.execute("DELETE FROM seen_jobs WHERE seen_at < ?", (cutoff,)).rowcount
+            self._connection.commit()
+            if removed:
+                self._connection.execute("VACUUM")
+        logger.debug(f"Removed {removed} expired jobs from the seen job index")
+        return removed
+
+    def add(self, job_id: str, status: str) -> None:
+        if not job_id:
+            return
+        self._job_ids.add(job_id)
+        if self._connection is None:
+            return
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO seen_jobs (job_id, status, seen_at) VALUES (?, ?, ?)",
+                (job_id, status, time.time()),
+            )
+            self._connection.commit()
+
+    def __contains__(self, job_id: str) -> bool:
+        return bool(job_id) and job_id in self._job_ids
+
+    def __len__(self) -> int:
+        return len(self._job_ids)
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,116 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+from src.deadline import DeadlineExceeded, bind_deadline, call_timeout
+
+
+class SpeculativePipeline:
+    """
+    Starts the description summary and the tailored resume of a job on background workers
+    as soon as its description is known, so that they are generated while the Easy Apply
+    form is being filled. The work runs under the deadline of the application that submitted
+    it; work for a job that is cancelled before it started is dropped, work already running
+    is discarded.
+    """
+
+    def __init__(self, summarize: Callable[[str], str], generate_resume: Optional[Callable[[Any], bytes]] = None,
+                 max_workers: int = 2):
+        self.summarize = summarize
+        self.generate_resume = generate_resume
+        self.submitted = 0
+        self.used = 0
+        self.cancelled = 0
+        self.wait_seconds = 0.0
+        self._jobs: Dict[str, Dict[str, Future]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative")
+
+    @staticmethod
+    def _key(job: Any) -> str:
+        return job.job_id or job.link
+
+    def submit(self, job: Any) -> bool:
+        """
+        :return: Whether work was started for the job; False when it has no description yet.
+        """
+        if not job.description:
+            return False
+        key = self._key(job)
+        with self._lock:
+            if key in self._jobs:
+                return True
+            futures = {"summary": self._executor.submit(bind_deadline(self.summarize), job.description)}
+            if self.generate_resume is not None:
+                futures["resume"] = self._executor.submit(bind_deadline(self.generate_resume), job)
+            self._jobs[key] = futures
+            self.submitted += 1
+        logger.debug(f"Speculating {', '.join(futures)} for {job.title} at {job.company}")
+        return True
+
+    def summary(self, job: Any) -> Optional[str]:
+        """
+        :return: The speculated summary, or None when none was started for the job.
+        """
+        return self._wait(job, "summary")
+
+    def resume_pdf(self, job: Any) -> Optional[bytes]:
+        """
+        :return: The speculated resume, or None when none was started for the job. A failed
+        generation is raised once; calling again returns None so the caller generates inline.
+        """
+        return self._wait(job, "resume")
+
+    def _wait(self, job: Any, kind: str) -> Any:
+        with self._lock:
+            future = self._jobs.get(self._key(job), {}).pop(kind, None)
+        if future is None:
+            return None
+        start = time.monotonic()
+        try:
+            # Waits no longer than what is left of the application budget
+            result = future.result(timeout=call_timeout(None))
+        except FutureTimeoutError:
+            future.cancel()
+            raise DeadlineExceeded(f"Application budget exceeded waiting for the {kind} of {job.title}")
+        finally:
+            with self._lock:
+                self.wait_seconds += time.monotonic() - start
+        with self._lock:
+            self.used += 1
+        logger.debug(f"Speculated {kind} for {job.title} ready after waiting {time.monotonic() - start:.2f}s")
+        return result
+
+    def cancel(self, job: Any) -> None:
+        """
+        Drops the work left for a job that was applied to, skipped or failed.
+        """
+        with self._lock:
+            futures = self._jobs.pop(self._key(job), {})
+        self._cancel(futures)
+
+    def _cancel(self, futures: Dict[str, Future]) -> None:
+        for future in futures.values():
+            future.cancel()
+        with self._lock:
+            self.cancelled += len(futures)
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "used": self.used,
+            "cancelled": self.cancelled,
+            "avg_wait_seconds": round(self.wait_seconds / self.used, 3) if self.used else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            jobs, self._jobs = self._jobs, {}
+        for futures in jobs.values():
+            self._cancel(futures)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.debug(f"Speculative pipeline closed, stats: {self.stats()}")
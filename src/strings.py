@@ -392,6 +392,131 @@ The objective is to fix the text of a form input on a web page.
 ## Fixed Input
 """
 
+batch_questions_template = """
+The following is a resume, the candidate's application preferences and a list of questions from one job application form. Answer every question on behalf of the candidate.
+
+## Rules
+- Each question has an id, a type and the question text.
+- For "numeric" questions answer with a single whole number, e.g. the number of years of experience. Infer related experience from similar technologies, projects and studies instead of answering 0.
+- For "options" questions answer with exactly one of the given options, copied verbatim. Never choose a default/placeholder option such as 'Select an option'.
+- For "text" questions answer in first person with a short, direct sentence unless more detail is explicitly requested.
+- Respond with a single JSON object mapping every question id to its answer and nothing else, e.g. {{"q0": 5, "q1": "Yes", "q2": "I can start in two weeks."}}
+
+## My resume:
+```
+{resume}
+```
+
+## My application preferences:
+```
+{job_application_profile}
+```
+
+## Questions:
+```json
+{questions}
+```
+
+## Answers (JSON):
+"""
+
+section_router_template = """You are assisting a bot designed to automatically apply for jobs on AIHawk. The bot receives various questions about job applications and needs to determine the most relevant section of the resume to provide an accurate response.
+
+For the following question: '{question}', determine which section of the resume is most relevant. 
+Respond with exactly one of the following options:
+- Personal information
+- Self Identification
+- Legal Authorization
+- Work Preferences
+- Education Details
+- Experience Details
+- Projects
+- Availability
+- Salary Expectations
+- Certifications
+- Languages
+- Interests
+- Cover letter
+
+Here are detailed guidelines to help you choose the correct section:
+
+1. **Personal Information**:
+- **Purpose**: Contains your basic contact details and online profiles.
+- **Use When**: The question is about how to contact you or requests links to your professional online presence.
+- **Examples**: Email address, phone number, AIHawk profile, GitHub repository, personal website.
+
+2. **Self Identification**:
+- **Purpose**: Covers personal identifiers and demographic information.
+- **Use When**: The question pertains to your gender, pronouns, veteran status, disability status, or ethnicity.
+- **Examples**: Gender, pronouns, veteran status, disability status, ethnicity.
+
+3. **Legal Authorization**:
+- **Purpose**: Details your work authorization status and visa requirements.
+- **Use When**: The question asks about your ability to work in specific countries or if you need sponsorship or visas.
+- **Examples**: Work authorization in EU and US, visa requirements, legally allowed to work.
+
+4. **Work Preferences**:
+- **Purpose**: Specifies your preferences regarding work conditions and job roles.
+- **Use When**: The question is about your preferences for remote work, in-person work, relocation, and willingness to undergo assessments or background checks.
+- **Examples**: Remote work, in-person work, open to relocation, willingness to complete assessments.
+
+5. **Education Details**:
+- **Purpose**: Contains information about your academic qualifications.
+- **Use When**: The question concerns your degrees, universities attended, GPA, and relevant coursework.
+- **Examples**: Degree, university, GPA, field of study, exams.
+
+6. **Experience Details**:
+- **Purpose**: Details your professional work history and key responsibilities.
+- **Use When**: The question pertains to your job roles, responsibilities, and achievements in previous positions.
+- **Examples**: Job positions, company names, key responsibilities, skills acquired.
+
+7. **Projects**:
+- **Purpose**: Highlights specific projects you have worked on.
+- **Use When**: The question asks about particular projects, their descriptions, or links to project repositories.
+- **Examples**: Project names, descriptions, links to project repositories.
+
+8. **Availability**:
+- **Purpose**: Provides information on your availability for new roles.
+- **Use When**: The question is about how soon you can start a new job or your notice period.
+- **Examples**: Notice period, availability to start.
+
+9. **Salary Expectations**:
+- **Purpose**: Covers your expected salary range.
+- **Use When**: The question pertains to your salary expectations or compensation requirements.
+- **Examples**: Desired salary range.
+
+10. **Certifications**:
+    - **Purpose**: Lists your professional certifications or licenses.
+    - **Use When**: The question involves your certifications or qualifications from recognized organizations.
+    - **Examples**: Certification names, issuing bodies, dates of validity.
+
+11. **Languages**:
+    - **Purpose**: Describes the languages you can speak and your proficiency levels.
+    - **Use When**: The question asks about your language skills or proficiency in specific languages.
+    - **Examples**: Languages spoken, proficiency levels.
+
+12. **Interests**:
+    - **Purpose**: Details your personal or professional interests.
+    - **Use When**: The question is about your hobbies, interests, or activities outside of work.
+    - **Examples**: Personal hobbies, professional interests.
+
+13. **Cover Letter**:
+    - **Purpose**: Contains your personalized cover letter or statement.
+    - **Use When**: The question involves your cover letter or specific written content intended for the job application.
+    - **Examples**: Cover letter content, personalized statements.
+
+Provide only the exact name of the section from the list above with no additional text.
+"""
+
+resume_or_cover_template = """
+Given the following phrase, respond with only 'resume' if the phrase is about a resume, or 'cover' if it's about a cover letter.
+If the phrase contains only one word 'upload', consider it as 'cover'.
+If the phrase contains 'upload resume', consider it as 'resume'.
+Do not provide any additional information or explanations.
+
+phrase: {phrase}
+"""
+
 func_summarize_prompt_template = """
         Following are two texts, one with placeholders and one without, the second text uses information from the first text to fill the placeholders.
         
@@ -34,6 +34,34 @@ def ensure_chrome_profile():
     return chromeProfilePath
 
 
+class WebDriverCallCounter:
+    """
+    Counts the WebDriver commands sent while the context is active.
+    Every driver and element call ends up in driver.execute, so wrapping it
+    gives the number of round trips made to chromedriver.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.count = 0
+        self._original_execute = None
+
+    def __enter__(self):
+        self.count = 0
+        self._original_execute = self.driver.execute
+
+        def counting_execute(*args, **kwargs):
+            self.count += 1
+            return self._original_execute(*args, **kwargs)
+
+        self.driver.execute = counting_execute
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.driver.execute = self._original_execute
+        return False
+
+
 def is_scrollable(element):
     scroll_height = element.get_attribute("scrollHeight")
     client_height = element.get_attribute("clientHeight")
@@ -111,6 +139,61 @@ def scroll_slow(driver, scrollable_element, start=0, end=3600, step=300, reverse
         logger.error(f"Exception occurred during scrolling: {e}")
 
 
+# Scrolls the last rendered item into view, then resolves as soon as more items
+# are rendered or the timeout expires, returning the rendered item count.
+LAZY_SCROLL_SCRIPT = """
+const container = arguments[0];
+const itemSelector = arguments[1];
+const timeoutMs = arguments[2];
+const done = arguments[arguments.length - 1];
+const count = () => container.querySelectorAll(itemSelector).length;
+const before = count();
+const items = container.querySelectorAll(itemSelector);
+if (items.length) {
+    items[items.length - 1].scrollIntoView({block: 'end'});
+} else {
+    container.scrollTop = container.scrollHeight;
+}
+let finished = false;
+let timer = null;
+const observer = new MutationObserver(() => {
+    if (count() > before) finish();
+});
+const finish = () => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(count());
+};
+observer.observe(container, {childList: true, subtree: true});
+timer = setTimeout(finish, timeoutMs);
+"""
+
+
+def scroll_until_loaded(driver, scrollable_element, item_selector, timeout=1.5, max_rounds=30):
+    logger.debug(f"Starting lazy-load scroll: item_selector={item_selector}, timeout={timeout}, max_rounds={max_rounds}")
+    item_count = -1
+    for scroll_round in range(max_rounds):
+        try:
+            new_count = int(driver.execute_async_script(
+                LAZY_SCROLL_SCRIPT, scrollable_element, item_selector, int(timeout * 1000)))
+        except Exception as e:
+            logger.error(f"Error during lazy-load scrolling: {e}")
+            break
+        logger.debug(f"Scroll round {scroll_round + 1}: {new_count} items rendered")
+        if new_count <= item_count:
+            break
+        item_count = new_count
+
+    try:
+        driver.execute_script("arguments[0].scrollTop = 0;", scrollable_element)
+    except Exception as e:
+        logger.error(f"Error resetting scroll position: {e}")
+    logger.debug(f"Lazy-load scroll finished with {item_count} items rendered")
+    return item_count
+
+
 def chrome_browser_options():
     logger.debug("Setting Chrome browser options")
     ensure_chrome_profile()
@@ -1,6 +1,8 @@
 import pytest
+from datetime import datetime
 from unittest import mock
 from src.aihawk_easy_applier import AIHawkEasyApplier
+from src.deadline import DeadlineExceeded
 
 
 @pytest.fixture
@@ -95,3 +97,213 @@ def test_check_for_premium_redirect_with_redirect(mocker, easy_applier):
 
     # Verify that it attempted to return to the job page 3 times
     assert easy_applier.driver.get.call_count == 3
+
+
+def test_fill_up_processes_each_section_once(mocker, easy_applier):
+    """Test that every form section of a step is classified and filled exactly once."""
+    easy_apply_content = mock.Mock()
+    easy_apply_content.find_elements.return_value = []
+    mocker.patch('src.aihawk_easy_applier.WebDriverWait').return_value.until.return_value = easy_apply_content
+    sections = [mock.Mock(), mock.Mock(), mock.Mock()]
+    easy_applier.driver.find_elements.return_value = sections
+    easy_applier.driver.execute_script.return_value = ['radio', 'textbox', 'radio']
+    radio_handler = mocker.patch.object(easy_applier, '_find_and_handle_radio_question', return_value=True)
+    textbox_handler = mocker.patch.object(easy_applier, '_find_and_handle_textbox_question', return_value=True)
+
+    easy_applier.fill_up(mock.Mock())
+
+    assert radio_handler.call_count == 2
+    textbox_handler.assert_called_once_with(sections[1])
+    assert easy_applier.step_stats.sections == 3
+    assert easy_applier.step_stats.kinds == {'radio': 2, 'textbox': 1}
+
+
+def test_fill_up_answers_from_form_snapshot(mocker, easy_applier):
+    """Test that a form snapshot is answered without reading the page and only written back."""
+    easy_apply_content = mock.Mock()
+    mocker.patch('src.aihawk_easy_applier.WebDriverWait').return_value.until.return_value = easy_apply_content
+    easy_applier.driver.execute_script.return_value = {
+        'has_upload': False,
+        'fields': [
+            {'index': 0, 'kind': 'radio', 'label': '', 'section_text': 'Do you have a visa?',
+             'options': ['Yes', 'No'], 'value': '', 'control_type': 'radio', 'control_id': '',
+             'selector': '[data-aihawk-field="0"]'},
+            {'index': 1, 'kind': 'textbox', 'label': 'Years of Python', 'section_text': 'Years of Python',
+             'options': [], 'value': '', 'control_type': 'text', 'control_id': 'numeric-input',
+             'selector': '[data-aihawk-field="1"]'},
+        ],
+    }
+    easy_applier.answer_store = mocker.Mock()
+    easy_applier.answer_store.find_containing.return_value = 'no'
+    easy_applier.answer_store.find_exact.return_value = None
+    easy_applier.gpt_answerer.answer_question_numeric.return_value = 5
+    mocker.patch('src.aihawk_easy_applier.time.sleep')
+
+    easy_applier.fill_up(mock.Mock())
+
+    easy_applier.driver.execute_script.assert_called_once()
+    easy_applier.driver.find_element.assert_any_call('css selector', '[data-aihawk-option="0-1"]')
+    easy_applier.driver.find_element.assert_any_call('css selector', '[data-aihawk-field="1"]')
+    easy_applier.gpt_answerer.answer_question_numeric.assert_called_once_with('years of python')
+    easy_applier.answer_store.add.assert_called_once_with('numeric', 'years of python', 5, section=None)
+    assert easy_applier.step_stats.kinds == {'radio': 1, 'textbox': 1}
+    assert easy_applier.step_stats.llm_calls == 1
+
+
+def test_fill_up_prefetches_unanswered_questions(mocker, easy_applier):
+    """Test that all unanswered questions of a step are sent to the model in one batch."""
+    mocker.patch('src.aihawk_easy_applier.WebDriverWait').return_value.until.return_value = mock.Mock()
+    easy_applier.driver.execute_script.return_value = {
+        'has_upload': False,
+        'fields': [
+            {'index': 0, 'kind': 'dropdown', 'label': 'English level', 'section_text': 'English level',
+             'options': ['Native', 'Fluent'], 'value': '', 'control_type': 'select', 'control_id': '',
+             'selector': '[data-aihawk-field="0"]'},
+            {'index': 1, 'kind': 'textbox', 'label': 'Years of Python', 'section_text': 'Years of Python',
+             'options': [], 'value': '', 'control_type': 'number', 'control_id': '',
+             'selector': '[data-aihawk-field="1"]'},
+        ],
+    }
+    easy_applier.answer_store = mocker.Mock()
+    easy_applier.answer_store.find_containing.return_value = None
+    easy_applier.answer_store.find_exact.return_value = None
+    easy_applier.gpt_answerer.answer_many.return_value = ['Fluent', 5]
+    easy_applier.gpt_answerer.last_request_count = 1
+    select_option = mocker.patch.object(easy_applier, '_select_dropdown_option')
+    enter_text = mocker.patch.object(easy_applier, '_enter_text')
+    mocker.patch('src.aihawk_easy_applier.time.sleep')
+
+    easy_applier.fill_up(mock.Mock())
+
+    easy_applier.gpt_answerer.answer_many.assert_called_once_with([
+        {'kind': 'options', 'question': 'english level', 'options': ['Native', 'Fluent']},
+        {'kind': 'numeric', 'question': 'years of python'},
+    ])
+    easy_applier.gpt_answerer.answer_question_from_options.assert_not_called()
+    easy_applier.gpt_answerer.answer_question_numeric.assert_not_called()
+    select_option.assert_called_once_with(mock.ANY, 'Fluent')
+    enter_text.assert_called_once_with(mock.ANY, 5)
+    assert easy_applier.step_stats.llm_calls == 1
+
+
+def test_job_apply_discards_application_when_budget_runs_out(mocker, easy_applier):
+    """Test that running out of the application budget discards the application and raises DeadlineExceeded."""
+    mocker.patch("src.aihawk_easy_applier.time.sleep")
+    mocker.patch.object(easy_applier, "check_for_premium_redirect")
+    mocker.patch.object(easy_applier, "_find_easy_apply_button")
+    mocker.patch.object(easy_applier, "_get_job_description", return_value="Job description")
+    mocker.patch.object(easy_applier, "_get_job_recruiter", return_value="")
+    mocker.patch("src.aihawk_easy_applier.ActionChains")
+    fill_up = mocker.patch.object(easy_applier, "fill_up")
+    discard = mocker.patch.object(easy_applier, "_discard_application")
+    easy_applier.application_timeout = 0
+
+    with pytest.raises(DeadlineExceeded):
+        easy_applier.job_apply(mock.Mock())
+
+    fill_up.assert_not_called()
+    discard.assert_called_once()
+
+
+def test_streamed_answer_is_typed_in_batches(mocker, easy_applier):
+    """Test that a streamed answer is typed while it arrives, in batches instead of one call per token."""
+    text_field = mocker.Mock()
+    chunks = ["I have", " worked", " with Python", " for five years", " in backend", " teams."]
+
+    typed = easy_applier._type_streamed_text(text_field, iter(chunks))
+
+    assert typed == "".join(chunks)
+    text_field.clear.assert_called_once()
+    sent = [call.args[0] for call in text_field.send_keys.call_args_list]
+    assert "".join(sent) == typed
+    assert 1 < len(sent) < len(chunks)
+
+
+def test_cached_resume_skips_generation(mocker, monkeypatch, tmp_path, easy_applier):
+    """Test that a resume cache hit is uploaded without calling the resume generator."""
+    mocker.patch("src.aihawk_easy_applier.time.sleep")
+    monkeypatch.chdir(tmp_path)
+    easy_applier.resume_cache = mocker.Mock()
+    easy_applier.resume_cache.get.return_value = b"%PDF-1.4 cached"
+    element, job = mocker.Mock(), mocker.Mock(description="Python developer")
+
+    easy_applier._create_and_upload_resume(element, job)
+
+    easy_applier.resume_generator_manager.pdf_bytes.assert_not_called()
+    easy_applier.resume_generator_manager.pdf_base64.assert_not_called()
+    easy_applier.resume_cache.put.assert_not_called()
+    assert (tmp_path / "generated_cv").joinpath(job.pdf_path).read_bytes() == b"%PDF-1.4 cached"
+    element.send_keys.assert_called_once_with(job.pdf_path)
+
+
+def test_only_complete_resumes_are_cached_per_style_and_backend(mocker, easy_applier):
+    """Test that a resume missing sections is not cached and that the cache key includes the PDF backend."""
+    manager = easy_applier.resume_generator_manager
+    manager.selected_style = "Modern"
+    manager.pdf_backend = "reportlab"
+    manager.pdf_bytes.return_value = b"%PDF-1.4 generated"
+    easy_applier.resume_cache = mocker.Mock()
+    easy_applier.resume_cache.get.return_value = None
+    job = mocker.Mock(description="Python developer")
+
+    manager.last_resume_complete.return_value = False
+    assert easy_applier._generate_resume_pdf(job) == b"%PDF-1.4 generated"
+    easy_applier.resume_cache.put.assert_not_called()
+
+    manager.last_resume_complete.return_value = True
+    easy_applier._generate_resume_pdf(job)
+    easy_applier.resume_cache.get.assert_called_with("Modern/reportlab", "Python developer")
+    easy_applier.resume_cache.put.assert_called_once_with("Modern/reportlab", "Python developer", b"%PDF-1.4 generated")
+
+
+def test_upload_waits_on_speculated_resume(mocker, monkeypatch, tmp_path, mock_driver, mock_gpt_answerer,
+                                           mock_resume_generator_manager):
+    """Test that the resume started when the description was scraped is uploaded instead of generating inline."""
+    mocker.patch("src.aihawk_easy_applier.time.sleep")
+    monkeypatch.chdir(tmp_path)
+    mock_resume_generator_manager.pdf_bytes.return_value = b"%PDF-1.4 speculated"
+    easy_applier = AIHawkEasyApplier(mock_driver, None, [], mock_gpt_answerer, mock_resume_generator_manager,
+                                     speculation_workers=2)
+    element, job = mocker.Mock(), mocker.Mock(description="Python developer", job_id="1")
+
+    assert easy_applier.speculative_pipeline.submit(job)
+    easy_applier._create_and_upload_resume(element, job)
+    easy_applier.close()
+
+    mock_resume_generator_manager.pdf_bytes.assert_called_once_with(job_description_text="Python developer")
+    assert easy_applier.speculative_pipeline.stats()["used"] == 1
+    assert (tmp_path / "generated_cv").joinpath(job.pdf_path).read_bytes() == b"%PDF-1.4 speculated"
+
+
+def test_dropdown_question_aborts_at_application_deadline(mocker, easy_applier):
+    """Test that a dropdown answered past the application budget aborts instead of being skipped."""
+    section = mocker.Mock()
+    question = section.find_element.return_value
+    question.find_elements.return_value = [mocker.Mock()]
+    question.find_element.return_value.text = "Do you need a visa?"
+    mocker.patch("src.aihawk_easy_applier.Select").return_value.options = [mocker.Mock(text="Yes")]
+    mocker.patch.object(easy_applier, "_answer_options_question", side_effect=DeadlineExceeded("budget spent"))
+
+    with pytest.raises(DeadlineExceeded):
+        easy_applier._find_and_handle_dropdown_question(section)
+
+
+def test_datepicker_section_is_handled_as_date(mocker, easy_applier):
+    """Test that a datepicker input is answered as a date, not typed into as a textbox."""
+    section = mocker.Mock()
+    section.text = "Earliest start date"
+    date_field = mocker.Mock()
+    section.find_elements.side_effect = lambda by, value: [date_field] if value.startswith('artdeco-datepicker') else []
+    mocker.patch.object(easy_applier, '_handle_terms_of_service', return_value=False)
+    mocker.patch.object(easy_applier, '_find_and_handle_radio_question', return_value=False)
+    textbox_handler = mocker.patch.object(easy_applier, '_find_and_handle_textbox_question', return_value=True)
+    easy_applier.answer_store = mocker.Mock()
+    easy_applier.answer_store.find_containing.return_value = None
+    easy_applier.gpt_answerer.answer_question_date.return_value = datetime(2026, 11, 2)
+    mocker.patch.object(easy_applier, '_save_questions_to_json')
+    enter_text = mocker.patch.object(easy_applier, '_enter_text')
+
+    assert easy_applier._process_form_section(section) == 'date'
+
+    textbox_handler.assert_not_called()
+    enter_text.assert_called_once_with(date_field, '2026-11-02')
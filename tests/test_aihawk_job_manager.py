@@ -4,6 +4,7 @@ from pathlib import Path
 import os
 import pytest
 from src.aihawk_job_manager import AIHawkJobManager
+from src.seen_job_index import SeenJobIndex
 from selenium.common.exceptions import NoSuchElementException
 from loguru import logger
 
@@ -50,6 +51,28 @@ def test_set_parameters(mocker, job_manager):
     assert str(job_manager.resume_path) == os.path.normpath('/path/to/resume')
     assert str(job_manager.output_file_directory) == os.path.normpath(
         '/path/to/output')
+    assert job_manager.speculation_workers == 0
+
+
+def test_set_parameters_opens_stores_in_output_directory(mocker, job_manager, tmp_path):
+    """Test that the seen job index and result ledger live in outputFileDirectory and are reopened on change."""
+    assert job_manager.seen_jobs is None and job_manager.result_ledger is None
+
+    params = {'remote': True, 'distance': 0, 'date': {'all time': True}}
+
+    job_manager.set_parameters({**params, 'outputFileDirectory': str(tmp_path / 'first')})
+    first_index, first_ledger = job_manager.seen_jobs, job_manager.result_ledger
+    first_index.load()
+    first_ledger.append("success", {"company": "ACME"})
+    job_manager.set_parameters({**params, 'outputFileDirectory': str(tmp_path / 'second')})
+
+    assert first_index._connection is None and first_ledger._handle is None
+    assert job_manager.seen_jobs.db_path == tmp_path / 'second' / 'seen_jobs.db'
+    assert job_manager.result_ledger.file_path == tmp_path / 'second' / 'results.jsonl'
+
+    resume_cache = job_manager.resume_cache = mocker.Mock()
+    job_manager.close_stores()
+    resume_cache.close.assert_called_once()
 
 
 def next_job_page(self, position, location, job_page):
@@ -146,15 +169,9 @@ def test_apply_jobs_with_jobs(mocker, job_manager):
     # Mock the AIHawkEasyApplier component
     job_manager.easy_applier_component = mocker.Mock()
 
-    # Mock the output_file_directory as a valid Path object
-    job_manager.output_file_directory = Path("/mocked/path/to/output")
-
-    # Mock Path.exists() to always return True (so no actual file system interaction is needed)
-    mocker.patch.object(Path, 'exists', return_value=True)
-
-    # Mock the open function to prevent actual file writing
-    mock_open = mocker.mock_open()
-    mocker.patch('builtins.open', mock_open)
+    # Mock the result ledger and seen job index to prevent actual file writing
+    job_manager.result_ledger = mocker.Mock()
+    job_manager.seen_jobs = mocker.Mock()
 
     # Run the apply_jobs method
     job_manager.apply_jobs()
@@ -165,4 +182,99 @@ def test_apply_jobs_with_jobs(mocker, job_manager):
     assert job_manager.extract_job_information_from_tile.call_count == 2
     # Called for each job element
     assert job_manager.easy_applier_component.job_apply.call_count == 2
-    mock_open.assert_called()  # Ensure that the open function was called
+    # Ensure that both results were appended to the ledger
+    job_manager.result_ledger.append.assert_called_with("success", mocker.ANY)
+    assert job_manager.result_ledger.append.call_count == 2
+    assert job_manager.pages_read == 1
+
+
+def test_extract_jobs_information_from_page(mocker, job_manager):
+    """Test that one script call builds Job objects for every tile."""
+    container = mocker.Mock()
+    mocker.patch.object(job_manager.driver, 'execute_script', return_value=[
+        {'title': 'Engineer', 'company': 'Company', 'location': 'Berlin',
+         'link': 'https://www.linkedin.com/jobs/view/123/', 'job_id': '123',
+         'apply_method': 'Easy Apply', 'insight': '10 applicants'},
+        {'title': 'Developer', 'company': 'Other', 'location': 'Rome',
+         'link': 'https://www.linkedin.com/jobs/view/456/', 'job_id': '',
+         'apply_method': None, 'insight': ''},
+    ])
+
+    jobs = job_manager.extract_jobs_information_from_page(container)
+
+    assert job_manager.driver.execute_script.call_count == 1
+    assert [job.title for job in jobs] == ['Engineer', 'Developer']
+    assert jobs[0].insight == '10 applicants'
+    assert jobs[1].job_id == '456'
+    assert jobs[1].apply_method == 'Applied'
+
+
+def test_extract_jobs_information_from_page_falls_back(mocker, job_manager):
+    """Test that an empty script result signals the per-tile fallback."""
+    mocker.patch.object(job_manager.driver, 'execute_script', return_value=None)
+
+    assert job_manager.extract_jobs_information_from_page(mocker.Mock()) == []
+
+
+def test_is_already_applied_to_job_uses_job_id(job_manager, tmp_path):
+    """Test that handled jobs are recognised by their LinkedIn job id."""
+    job = Job("Engineer", "Company", "Berlin", "https://www.linkedin.com/jobs/view/123/", "Easy Apply")
+    job_manager.seen_jobs = SeenJobIndex(tmp_path / "seen_jobs.db")
+    job_manager.seen_jobs.add(job.job_id, "success")
+
+    assert job_manager.is_already_applied_to_job(job.title, job.company, "https://www.linkedin.com/jobs/view/123/?ref=x")
+    assert not job_manager.is_already_applied_to_job(job.title, job.company, "https://www.linkedin.com/jobs/view/456/")
+
+
+def test_is_already_applied_to_company_uses_index(mocker, job_manager):
+    """Test the once-per-company check against the normalized company index."""
+    job_manager.apply_once_at_company = True
+    job_manager.result_ledger = mocker.Mock()
+    job_manager.seen_jobs = mocker.Mock()
+
+    assert not job_manager.is_already_applied_to_company("Acme  Corp")
+
+    job_manager.write_to_file(Job("Engineer", "ACME Corp ", "Berlin", "", "Easy Apply"), "success")
+
+    assert job_manager.is_already_applied_to_company("acme   corp")
+    assert not job_manager.is_already_applied_to_company("Other Corp")
+
+
+def test_timed_out_job_is_recorded_but_not_marked_seen(mocker, job_manager):
+    """Test that a timed out application gets its own ledger status and can be retried later."""
+    job = Job("Engineer", "Company", "Berlin", "https://www.linkedin.com/jobs/view/789/", "Easy Apply")
+    job_manager.result_ledger = mocker.Mock()
+    job_manager.seen_jobs = mocker.Mock()
+
+    job_manager.write_to_file(job, "timeout")
+
+    job_manager.result_ledger.append.assert_called_once_with("timeout", mocker.ANY)
+    job_manager.seen_jobs.add.assert_not_called()
+
+
+def test_skipped_job_is_not_marked_seen(mocker, job_manager):
+    """Test that blacklisted jobs are checked again in later runs instead of being hidden by the seen index."""
+    job = Job("Intern", "Company", "Berlin", "https://www.linkedin.com/jobs/view/790/", "Easy Apply")
+    job_manager.result_ledger = mocker.Mock()
+    job_manager.seen_jobs = mocker.Mock()
+
+    job_manager.write_to_file(job, "skipped")
+    job_manager.write_to_file(job, "failed")
+
+    job_manager.seen_jobs.add.assert_called_once_with("790", "failed")
+
+
+def test_start_applying_closes_applier_when_the_run_fails(mocker, job_manager):
+    """Test that the speculative workers and the stores are released even when the apply loop raises."""
+    applier = mocker.patch('src.aihawk_job_manager.AIHawkEasyApplier').return_value
+    mocker.patch.object(job_manager, '_apply_to_searches', side_effect=RuntimeError("browser closed"))
+    close_stores = mocker.patch.object(job_manager, 'close_stores')
+    job_manager.resume_path = job_manager.gpt_answerer = job_manager.resume_generator_manager = None
+    job_manager.application_timeout, job_manager.resume_cache, job_manager.speculation_workers = 600, None, 2
+    job_manager.seen_jobs = mocker.Mock()
+
+    with pytest.raises(RuntimeError):
+        job_manager.start_applying()
+
+    applier.close.assert_called_once()
+    close_stores.assert_called_once()
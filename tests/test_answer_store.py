@@ -0,0 +1,105 @@
+import json
+import os
+import threading
+
+import pytest
+from src.answer_store import AnswerStore, sanitize_text
+
+
+@pytest.fixture
+def answers_file(tmp_path):
+    """Fixture to create an answers.json file with a few saved answers."""
+    file_path = tmp_path / "answers.json"
+    file_path.write_text(json.dumps([
+        {"type": "radio", "question": "are you authorized to work in the eu? yes no", "answer": "yes"},
+        {"type": "numeric", "question": "years of experience with python", "answer": "5"},
+    ]), encoding="utf-8")
+    return file_path
+
+
+def test_sanitize_text():
+    """Test that question text is normalized the same way it is stored."""
+    assert sanitize_text('  "Your Name?",\n') == 'your name?'
+
+
+def test_find_exact(answers_file):
+    """Test O(1) exact lookup by type and normalized question."""
+    store = AnswerStore(answers_file)
+
+    assert store.find_exact("numeric", "Years of experience with Python ") == "5"
+    assert store.find_exact("textbox", "years of experience with python") is None
+
+
+def test_find_containing_matches_prefix_and_substring(answers_file):
+    """Test lookups for questions contained in a saved question."""
+    store = AnswerStore(answers_file)
+
+    assert store.find_containing("radio", "Are you authorized to work in the EU?") == "yes"
+    assert store.find_containing("radio", "work in the eu") == "yes"
+    assert store.find_containing("radio", "visa sponsorship") is None
+
+
+
+def test_find_containing_returns_first_saved_match(tmp_path):
+    """Test that the first matching question in file order wins, as with a scan of answers.json."""
+    file_path = tmp_path / "answers.json"
+    file_path.write_text(json.dumps([
+        {"type": "textbox", "question": "what is your notice period in weeks", "answer": "4"},
+        {"type": "textbox", "question": "current salary", "answer": "50000"},
+        {"type": "textbox", "question": "what is your notice period", "answer": "one month"},
+        {"type": "textbox", "question": "expected salary", "answer": "60000"},
+    ]), encoding="utf-8")
+    store = AnswerStore(file_path)
+
+    assert store.find_containing("textbox", "What is your notice period") == "4"
+    assert store.find_containing("textbox", "salary") == "50000"
+    assert store.find_containing("textbox", "expected") == "60000"
+
+def test_added_answers_are_visible_and_written_behind(answers_file):
+    """Test that new answers are visible at once and persisted on flush."""
+    store = AnswerStore(answers_file, flush_delay=60)
+    assert store.find_containing("dropdown", "Preferred pronouns") is None
+
+    store.add("dropdown", "Preferred pronouns", "They/Them")
+
+    assert store.find_containing("dropdown", "preferred pronouns") == "They/Them"
+    assert len(json.loads(answers_file.read_text(encoding="utf-8"))) == 2
+
+    store.flush()
+
+    saved = json.loads(answers_file.read_text(encoding="utf-8"))
+    assert saved[-1] == {"type": "dropdown", "question": "preferred pronouns", "answer": "They/Them"}
+    assert len(AnswerStore(answers_file)) == 3
+
+
+def test_overlapping_flushes_keep_newest_answers(mocker, answers_file):
+    """Test that a flush started during another one cannot be overwritten by the older snapshot."""
+    store = AnswerStore(answers_file, flush_delay=60)
+    store.add("textbox", "notice period", "Two weeks")
+    replace = os.replace
+    second_flush = []
+
+    def slow_replace(source, target):
+        if not second_flush:
+            store.add("textbox", "expected salary", "60000")
+            second_flush.append(threading.Thread(target=store.flush))
+            second_flush[0].start()
+            second_flush[0].join(0.2)
+        replace(source, target)
+
+    mocker.patch("src.answer_store.os.replace", side_effect=slow_replace)
+    store.flush()
+    second_flush[0].join()
+
+    saved = json.loads(answers_file.read_text(encoding="utf-8"))
+    assert [item["question"] for item in saved[-2:]] == ["notice period", "expected salary"]
+
+
+def test_stores_share_one_exit_hook(mocker, answers_file):
+    """Test that creating stores registers no exit hook of its own."""
+    register = mocker.patch("src.answer_store.atexit.register")
+
+    AnswerStore(answers_file)
+    AnswerStore(answers_file)
+
+    register.assert_not_called()
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.deadline import Deadline, DeadlineExceeded, activate, bind_deadline, call_timeout, current_deadline
+from src.llm.llm_manager import AIAdapter, LoggerChatModel
+from src.llm.retry import RetryPolicy
+
+
+class SlowModel:
+    def __init__(self, delay):
+        self.delay = delay
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(self.delay)
+        return AIMessage(content="late")
+
+
+def make_adapter(mocker, model, request_timeout):
+    mocker.patch.object(AIAdapter, "_create_model", return_value=model)
+    return AIAdapter({"llm_model_type": "openai", "llm_model": "gpt-4o-mini",
+                      "llm_request_timeout": request_timeout}, "sk-test")
+
+
+def test_call_timeout_is_min_of_per_call_timeout_and_remaining_budget():
+    """Test that a call gets min(per-call timeout, remaining budget) and fails once the budget is spent."""
+    assert call_timeout(30) == 30
+
+    with activate(Deadline(10)):
+        assert 9 < call_timeout(30) <= 10
+        assert call_timeout(2) == 2
+    assert current_deadline() is None
+
+    with activate(Deadline(0)):
+        with pytest.raises(DeadlineExceeded):
+            call_timeout(30)
+
+    assert call_timeout(None) is None
+    with activate(Deadline(None)):
+        assert call_timeout(None) is None
+        assert call_timeout(5) == 5
+
+
+
+def test_deadline_is_local_to_its_thread_unless_bound():
+    """Test that an application deadline is not seen by other threads unless their work is bound to it."""
+    seen = {}
+
+    def record(name):
+        seen[name] = current_deadline()
+
+    with activate(Deadline(60)) as deadline:
+        unbound = threading.Thread(target=record, args=("unbound",))
+        bound = threading.Thread(target=bind_deadline(record), args=("bound",))
+        unbound.start()
+        bound.start()
+        unbound.join()
+        bound.join()
+
+    assert seen == {"unbound": None, "bound": deadline}
+
+def test_slow_call_is_cut_off_by_remaining_budget(mocker):
+    """Test that a running application budget bounds a call below the per-call timeout."""
+    adapter = make_adapter(mocker, SlowModel(5), request_timeout=60)
+
+    with activate(Deadline(0.1)):
+        with pytest.raises(DeadlineExceeded):
+            adapter.invoke("prompt")
+    assert adapter.breaker.failures == 1
+
+
+def test_slow_call_is_cut_off_by_request_timeout(mocker):
+    """Test that a call exceeding llm_request_timeout raises a retryable TimeoutError."""
+    adapter = make_adapter(mocker, SlowModel(5), request_timeout=0.1)
+
+    with activate(Deadline(60)):
+        with pytest.raises(TimeoutError):
+            adapter.invoke("prompt")
+
+
+def test_retry_is_skipped_when_budget_is_too_short(mocker):
+    """Test that LoggerChatModel does not wait for a retry that would outlive the application budget."""
+    llm = mocker.Mock()
+    llm.invoke.side_effect = ConnectionError("connection reset")
+    sleep = mocker.patch("src.llm.llm_manager.time.sleep")
+    chat_model = LoggerChatModel(llm, retry_policy=RetryPolicy(base_delay=30.0, jitter=0.0))
+
+    with activate(Deadline(5)):
+        with pytest.raises(DeadlineExceeded):
+            chat_model._invoke("prompt")
+
+    assert llm.invoke.call_count == 1
+    sleep.assert_not_called()
+    assert chat_model.retry_stats.give_ups == 1
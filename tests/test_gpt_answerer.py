@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.deadline import DeadlineExceeded
+from src.llm.llm_manager import GPTAnswerer
+
+
+@pytest.fixture
+def answerer(mocker):
+    """Fixture to create a GPTAnswerer with a scripted model and no response cache."""
+    mocker.patch('src.llm.llm_manager.LLMLogger.log_request')
+    gpt_answerer = GPTAnswerer({'llm_model_type': 'openai', 'llm_model': 'gpt-4o-mini', 'llm_cache': False,
+                                'section_router': False},
+                               'sk-test')
+    gpt_answerer.ai_adapter.model = mocker.Mock()
+    gpt_answerer.set_resume(mocker.Mock(experience_details='Python developer'))
+    return gpt_answerer
+
+
+def reply(content):
+    return AIMessage(content=content, usage_metadata={'input_tokens': 1, 'output_tokens': 1, 'total_tokens': 2})
+
+
+def test_chains_are_built_once(mocker, answerer):
+    """Test that repeated questions reuse the chains built for the first one."""
+    answerer.ai_adapter.model.invoke.side_effect = lambda prompt: reply(
+        'Experience Details' if 'most relevant' in prompt.to_string() else '5 years')
+    create_chain = mocker.spy(answerer, '_create_chain')
+
+    assert answerer.answer_question_textual_wide_range('Years of Python?') == '5 years'
+    assert answerer.answer_question_textual_wide_range('Years of Java?') == '5 years'
+
+    assert create_chain.call_count == 2
+    assert set(answerer._chains) == {'section_router', 'experience_details'}
+
+
+def test_confident_router_skips_routing_prompt(mocker, answerer):
+    """Test that a locally routed question only costs the answering LLM call."""
+    answerer.section_router = mocker.Mock()
+    answerer.section_router.route.return_value = 'experience_details'
+    answerer.ai_adapter.model.invoke.return_value = reply('5 years')
+
+    assert answerer.answer_question_textual_wide_range('Years of Python?') == '5 years'
+
+    answerer.ai_adapter.model.invoke.assert_called_once()
+    answerer.section_router.record.assert_called_once_with(local=True, seconds=mocker.ANY)
+    answerer.section_router.learn.assert_not_called()
+
+
+def test_unsure_router_falls_back_and_learns(mocker, answerer):
+    """Test that the routing prompt is used when the router is unsure and its answer is learned."""
+    answerer.section_router = mocker.Mock()
+    answerer.section_router.route.return_value = None
+    answerer.ai_adapter.model.invoke.side_effect = [reply('Experience Details'), reply('5 years')]
+
+    assert answerer.answer_question_textual_wide_range('Years of Python?') == '5 years'
+
+    assert answerer.ai_adapter.model.invoke.call_count == 2
+    answerer.section_router.learn.assert_called_once_with('Years of Python?', 'experience_details')
+
+
+def test_answer_many_runs_questions_concurrently(mocker, answerer):
+    """Test that independent questions overlap and keep their order."""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def answer_numeric(question):
+        barrier.wait()
+        return len(question)
+
+    mocker.patch.object(answerer, 'answer_question_numeric', side_effect=answer_numeric)
+    mocker.patch.object(answerer, 'answer_question_from_options', side_effect=RuntimeError('model down'))
+    questions = [{'kind': 'numeric', 'question': 'a'}, {'kind': 'numeric', 'question': 'bb'},
+                 {'kind': 'numeric', 'question': 'ccc'}, {'kind': 'options', 'question': 'd', 'options': ['x']}]
+
+    assert answerer.answer_many(questions) == [1, 2, 3, None]
+
+
+def test_answer_many_batches_and_retries_invalid_answers(mocker, answerer):
+    """Test that batch mode sends one prompt and retries only the answers that fail validation."""
+    answerer.batch_questions = True
+    answerer.ai_adapter.model.invoke.return_value = reply(
+        '```json\n{"q0": "7 years", "q1": "Maybe", "q2": "Two weeks"}\n```')
+    retry = mocker.patch.object(answerer, 'answer_question_from_options', return_value='No')
+    questions = [{'kind': 'numeric', 'question': 'years of python'},
+                 {'kind': 'options', 'question': 'need a visa?', 'options': ['Yes', 'No']},
+                 {'kind': 'text', 'question': 'notice period'}]
+
+    assert answerer.answer_many(questions) == [7, 'No', 'Two weeks']
+
+    answerer.ai_adapter.model.invoke.assert_called_once()
+    retry.assert_called_once_with('need a visa?', ['Yes', 'No'])
+    assert answerer.last_request_count == 2
+
+
+def test_answer_many_stops_at_application_deadline(mocker, answerer):
+    """Test that a question cut off by the application budget aborts the step instead of being skipped."""
+    mocker.patch.object(answerer, 'answer_question_numeric', side_effect=DeadlineExceeded('budget spent'))
+    questions = [{'kind': 'numeric', 'question': 'a'}, {'kind': 'numeric', 'question': 'bb'}]
+
+    with pytest.raises(DeadlineExceeded):
+        answerer.answer_many(questions)
+
+
+def test_routes_send_call_types_to_their_models(mocker):
+    """Test that llm_routes picks a model per call type and shares models with identical settings."""
+    mocker.patch('src.llm.llm_manager.LLMLogger.log_request')
+    create_model = mocker.patch('src.llm.llm_manager.AIAdapter._create_model',
+                                side_effect=lambda config, api_key: mocker.Mock(name=config['llm_model']))
+    gpt_answerer = GPTAnswerer({
+        'llm_model_type': 'openai', 'llm_model': 'gpt-4o-mini', 'llm_cache': False, 'section_router': False,
+        'llm_routes': {
+            'classification': {'temperature': 0, 'max_tokens': 20},
+            'options': {'temperature': 0, 'max_tokens': 20},
+            'cover_letter': {'llm_model': 'gpt-4o', 'max_tokens': 800},
+        },
+    }, 'sk-test')
+
+    assert create_model.call_count == 3
+    assert gpt_answerer.llm_routes['classification'] is gpt_answerer.llm_routes['options']
+    assert gpt_answerer.llm_routes['cover_letter'].llm.signature['llm_model'] == 'gpt-4o'
+    assert gpt_answerer._llm_for('numeric') is gpt_answerer.llm_cheap
+    assert gpt_answerer._llm_for('cover_letter').llm.signature['max_tokens'] == 800
@@ -0,0 +1,79 @@
+import asyncio
+import importlib.util
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.llm.http_pool import configure_http_pool, get_pooled_clients, http_pool_stats
+from src.llm.llm_manager import ClaudeModel, OpenAIModel
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    """Fixture to run a local keep-alive HTTP server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    """Fixture to start every test with empty pools."""
+    configure_http_pool(None)
+    yield
+    configure_http_pool(None)
+
+
+def test_connections_are_reused_and_counted(server_url):
+    """Test that sequential requests through a pool reuse one kept-alive connection per client."""
+    pool = get_pooled_clients(server_url)
+    for _ in range(3):
+        pool.client.get(f"{server_url}/sync")
+
+    async def fetch():
+        for _ in range(2):
+            await pool.async_client.get(f"{server_url}/async")
+
+    asyncio.run(fetch())
+
+    stats = http_pool_stats()[server_url]
+    assert stats["requests"] == 5
+    assert stats["connections"] == 2
+    assert stats["reused"] == 3
+
+
+def test_provider_objects_share_one_pool():
+    """Test that every OpenAI model gets the same pooled clients and HTTP/2 is only used when available."""
+    configure_http_pool({"max_connections": 5, "http2": True})
+    first = OpenAIModel("sk-test", "gpt-4o-mini")
+    second = OpenAIModel("sk-test", "gpt-4o")
+
+    assert first.model.http_client is second.model.http_client
+    assert first.model.http_async_client is second.model.http_async_client
+    pool = get_pooled_clients("https://api.openai.com/v1/")
+    assert pool.client is first.model.http_client
+    assert pool.http2 == (importlib.util.find_spec("h2") is not None)
+
+
+def test_claude_clients_are_rebuilt_on_the_pool():
+    """Test that ChatAnthropic's SDK clients use the shared pool although it has no http_client option."""
+    model = ClaudeModel("sk-test", "claude-3-haiku-20240307")
+    pool = get_pooled_clients("https://api.anthropic.com")
+
+    assert model.model._client._client is pool.client
+    assert model.model._async_client._client is pool.async_client
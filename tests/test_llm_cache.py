@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.llm.llm_cache import LLMResponseCache
+from src.llm.llm_manager import LoggerChatModel
+
+SIGNATURE = {"llm_model_type": "openai", "llm_model": "gpt-4o-mini", "llm_api_url": "", "temperature": 0.4}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture to create an LLMResponseCache in a temporary folder."""
+    llm_cache = LLMResponseCache(tmp_path / "llm_cache.db", max_entries=2, ttl_days=30)
+    yield llm_cache
+    llm_cache.close()
+
+
+def make_prompt(question):
+    return ChatPromptTemplate.from_template("Answer: {question}").invoke({"question": question})
+
+
+def test_key_depends_on_model_and_messages():
+    """Test that the cache key changes with the model signature and the prompt."""
+    key = LLMResponseCache.make_key(SIGNATURE, make_prompt("a"))
+
+    assert key == LLMResponseCache.make_key(dict(SIGNATURE), make_prompt("a"))
+    assert key != LLMResponseCache.make_key(SIGNATURE, make_prompt("b"))
+    assert key != LLMResponseCache.make_key({**SIGNATURE, "llm_model": "gpt-4o"}, make_prompt("a"))
+
+
+def test_get_or_compute_persists_replies(tmp_path, cache):
+    """Test that a computed reply is stored and served from disk by a new instance."""
+    reply, cached = cache.get_or_compute("key", lambda: AIMessage(content="yes"))
+    assert (reply.content, cached) == ("yes", False)
+    cache.close()
+
+    reopened = LLMResponseCache(tmp_path / "llm_cache.db")
+    reply, cached = reopened.get_or_compute("key", lambda: pytest.fail("should not be computed"))
+    assert (reply.content, cached) == ("yes", True)
+    assert reopened.stats()["hits"] == 1
+    reopened.close()
+
+
+def test_lru_and_ttl_eviction(cache):
+    """Test that the least recently used entry is evicted and expired entries are ignored."""
+    cache.put("a", AIMessage(content="a"))
+    cache.put("b", AIMessage(content="b"))
+    time.sleep(0.01)
+    cache.get("a")
+    cache.put("c", AIMessage(content="c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").content == "a"
+
+    cache.ttl_days = 1e-9
+    assert cache.get("c") is None
+
+
+def test_in_flight_requests_are_coalesced(cache):
+    """Test that concurrent identical requests share a single provider call."""
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return AIMessage(content="shared")
+
+    results = []
+    owner = threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute)))
+    owner.start()
+    started.wait(5)
+    waiter = threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute)))
+    waiter.start()
+    time.sleep(0.05)
+    release.set()
+    owner.join()
+    waiter.join()
+
+    assert len(calls) == 1
+    assert sorted(cached for _, cached in results) == [False, True]
+    assert cache.coalesced == 1
+
+
+def test_logger_chat_model_skips_logging_on_hit(mocker, cache):
+    """Test that cached replies are not sent to the provider or logged again."""
+    llm = mocker.Mock(signature=SIGNATURE)
+    llm.invoke.return_value = AIMessage(content="answer", usage_metadata={
+        "input_tokens": 1, "output_tokens": 1, "total_tokens": 2})
+    log_request = mocker.patch("src.llm.llm_manager.LLMLogger.log_request")
+    chat_model = LoggerChatModel(llm, cache=cache)
+
+    first = chat_model(make_prompt("a"))
+    second = chat_model(make_prompt("a"))
+
+    assert first.content == second.content == "answer"
+    llm.invoke.assert_called_once()
+    log_request.assert_called_once()
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.deadline import Deadline, activate
+from src.llm.hedging import HedgePolicy
+from src.llm.llm_manager import AIAdapter
+
+
+class FakeModel:
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+        self.cancelled = False
+
+    async def ainvoke(self, prompt):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return AIMessage(content=self.name)
+
+
+def make_adapter(mocker, primary, backup, **config):
+    mocker.patch.object(AIAdapter, "_create_model", side_effect=[primary, backup])
+    return AIAdapter({"llm_model_type": "openai", "llm_model": "gpt-4o-mini",
+                      "llm_failover": [{"llm_model_type": "openai", "llm_model": "gpt-4o"}],
+                      "llm_hedging": {"enabled": True, "min_delay": 0.05, "max_delay": 0.05}, **config}, "sk-test")
+
+
+def test_hedge_delay_follows_latency_percentile():
+    """Test that the hedge delay is the configured percentile of observed latencies, clamped."""
+    policy = HedgePolicy(enabled=True, percentile=90, min_delay=0.5, max_delay=10.0, min_samples=10)
+    assert policy.delay() == 10.0
+
+    for latency in range(1, 11):
+        policy.record_latency(float(latency))
+    assert policy.delay() == 9.0
+
+    policy.record_latency(0.1)
+    policy.percentile = 1
+    assert policy.delay() == 0.5
+
+
+def test_slow_primary_is_hedged_and_cancelled(mocker):
+    """Test that a slow primary request is duplicated, the hedge wins and the primary is cancelled."""
+    primary, backup = FakeModel("primary", delay=5.0), FakeModel("backup", delay=0.01)
+    adapter = make_adapter(mocker, primary, backup)
+
+    assert adapter.invoke("prompt").content == "backup"
+
+    assert primary.cancelled
+    assert adapter.hedging.stats()["hedged"] == 1
+    assert adapter.hedging.stats()["hedge_wins"] == 1
+
+
+def test_fast_primary_is_not_hedged(mocker):
+    """Test that replies within the hedge delay do not send a duplicate request."""
+    primary, backup = FakeModel("primary", delay=0.0), FakeModel("backup", delay=0.0)
+    backup_call = mocker.spy(backup, "ainvoke")
+    adapter = make_adapter(mocker, primary, backup)
+
+    assert adapter.invoke("prompt").content == "primary"
+
+    backup_call.assert_not_called()
+    assert adapter.hedging.stats()["hedge_rate"] == 0.0
+
+
+def test_cancelled_hedge_releases_half_open_trial(mocker):
+    """Test that a half-open primary losing to its hedge can be tried again afterwards."""
+    primary, backup = FakeModel("primary", delay=5.0), FakeModel("backup", delay=0.01)
+    adapter = make_adapter(mocker, primary, backup)
+    adapter.breaker.opened_at = time.monotonic() - adapter.breaker.reset_timeout - 1
+    assert adapter.breaker.state == "half_open"
+
+    assert adapter.invoke("prompt").content == "backup"
+
+    assert primary.cancelled
+    assert adapter.breaker.allow()
+
+
+def test_timed_out_hedged_call_cancels_both_requests(mocker):
+    """Test that a hedged call cut off by its request timeout cancels the primary and the hedge."""
+    primary, backup = FakeModel("primary", delay=5.0), FakeModel("backup", delay=5.0)
+    adapter = make_adapter(mocker, primary, backup, llm_request_timeout=0.2)
+
+    with activate(Deadline(60)):
+        with pytest.raises(TimeoutError):
+            adapter.invoke("prompt")
+
+    wait_until = time.monotonic() + 2
+    while not (primary.cancelled and backup.cancelled) and time.monotonic() < wait_until:
+        time.sleep(0.01)
+    assert primary.cancelled and backup.cancelled
@@ -0,0 +1,136 @@
+import httpx
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from src.deadline import Deadline, DeadlineExceeded, activate
+
+from src.llm.llm_manager import AIAdapter, LoggerChatModel
+from src.llm.retry import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def http_error(status_code, headers=None):
+    request = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError(f"status {status_code}", request=request, response=response)
+
+
+def reply(content="ok"):
+    return AIMessage(content=content, usage_metadata={"input_tokens": 1, "output_tokens": 1, "total_tokens": 2})
+
+
+def test_backoff_grows_and_honors_retry_after():
+    """Test that delays grow exponentially and server retry hints take precedence."""
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0, jitter=0.0)
+
+    assert [policy.delay(attempt, RuntimeError()) for attempt in (1, 2, 3, 6)] == [1.0, 2.0, 4.0, 10.0]
+    assert policy.delay(1, http_error(429, {"retry-after": "7"})) == 7.0
+    assert policy.delay(1, http_error(429, {"retry-after-ms": "250"})) == 0.25
+
+
+def test_next_delay_respects_budget_and_error_kind():
+    """Test that retries stop on client errors, after max attempts and past the elapsed budget."""
+    policy = RetryPolicy(max_attempts=3, max_elapsed_seconds=10.0, base_delay=1.0, jitter=0.0)
+
+    assert policy.next_delay(1, 0.0, http_error(500)) == 1.0
+    assert policy.next_delay(1, 0.0, http_error(400)) is None
+    assert policy.next_delay(3, 0.0, http_error(500)) is None
+    assert policy.next_delay(1, 9.5, http_error(500)) is None
+
+
+def test_circuit_breaker_opens_and_half_opens(mocker):
+    """Test that the breaker opens after repeated failures and allows one trial after the timeout."""
+    clock = mocker.patch("src.llm.retry.time.monotonic", return_value=100.0)
+    breaker = CircuitBreaker("openai/gpt-4o-mini", failure_threshold=2, reset_timeout=30.0)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.return_value = 131.0
+    trial = breaker.allow()
+    assert trial
+    assert not breaker.allow()
+    breaker.release_trial(True)
+    assert not breaker.allow()
+    breaker.release_trial(trial)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_logger_chat_model_gives_up_after_max_attempts(mocker):
+    """Test that a failing provider is retried a bounded number of times with recorded waits."""
+    sleep = mocker.patch("src.llm.llm_manager.time.sleep")
+    llm = mocker.Mock()
+    llm.invoke.side_effect = http_error(503)
+    chat_model = LoggerChatModel(llm, retry_policy=RetryPolicy(max_attempts=3, base_delay=1.0, jitter=0.0))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        chat_model("prompt")
+
+    assert llm.invoke.call_count == 3
+    assert [call.args[0] for call in sleep.call_args_list] == [1.0, 2.0]
+    assert chat_model.retry_stats.as_dict() == {"calls": 1, "retries": 2, "give_ups": 1, "wait_seconds": 3.0}
+
+
+def test_adapter_fails_over_while_primary_is_open(mocker):
+    """Test that AIAdapter switches to the failover model while the primary breaker is open."""
+    primary, failover = mocker.Mock(), mocker.Mock()
+    mocker.patch.object(AIAdapter, "_create_model", side_effect=[primary, failover])
+    adapter = AIAdapter({"llm_model_type": "openai", "llm_model": "gpt-4o-mini",
+                         "llm_circuit_breaker": {"failure_threshold": 1, "reset_timeout": 60},
+                         "llm_failover": [{"llm_model_type": "ollama", "llm_model": "llama3"}]}, "sk-test")
+    primary.invoke.side_effect = http_error(503)
+    failover.invoke.return_value = reply("from failover")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        adapter.invoke("prompt")
+    assert adapter.invoke("prompt").content == "from failover"
+    assert adapter.failover_calls == 1
+
+    failover.invoke.side_effect = http_error(503)
+    with pytest.raises(httpx.HTTPStatusError):
+        adapter.invoke("prompt")
+    with pytest.raises(CircuitOpenError):
+        adapter.invoke("prompt")
+
+
+def test_half_open_trial_rejected_with_client_error_releases_breaker(mocker):
+    """Test that a half-open trial failing with a 4xx does not keep the provider locked out."""
+    primary = mocker.Mock()
+    mocker.patch.object(AIAdapter, "_create_model", return_value=primary)
+    adapter = AIAdapter({"llm_model_type": "openai", "llm_model": "gpt-4o-mini",
+                         "llm_circuit_breaker": {"failure_threshold": 1, "reset_timeout": 60}}, "sk-test")
+    primary.invoke.side_effect = http_error(503)
+    with pytest.raises(httpx.HTTPStatusError):
+        adapter.invoke("prompt")
+    adapter.breaker.opened_at -= 61
+    assert adapter.breaker.state == "half_open"
+
+    primary.invoke.side_effect = http_error(400)
+    with pytest.raises(httpx.HTTPStatusError):
+        adapter.invoke("prompt")
+
+    primary.invoke.side_effect = None
+    primary.invoke.return_value = reply("recovered")
+    assert adapter.invoke("prompt").content == "recovered"
+    assert adapter.breaker.state == "closed"
+
+
+def test_half_open_trial_stream_cut_off_by_deadline_releases_breaker(mocker):
+    """Test that a half-open trial stream stopped by the application deadline lets a later call take the trial."""
+    primary = mocker.Mock()
+    mocker.patch.object(AIAdapter, "_create_model", return_value=primary)
+    adapter = AIAdapter({"llm_model_type": "openai", "llm_model": "gpt-4o-mini",
+                         "llm_circuit_breaker": {"failure_threshold": 1, "reset_timeout": 60}}, "sk-test")
+    adapter.breaker.record_failure()
+    adapter.breaker.opened_at -= 61
+    primary.stream.return_value = iter([AIMessageChunk(content="Dear"), AIMessageChunk(content=" hiring")])
+
+    with activate(Deadline(0)):
+        with pytest.raises(DeadlineExceeded):
+            list(adapter.stream("prompt"))
+
+    assert adapter.breaker.state == "half_open"
+    assert adapter.breaker.allow()
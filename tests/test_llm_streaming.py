@@ -0,0 +1,56 @@
+from langchain_core.language_models.fake_chat_models import FakeListChatModel, FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+
+from src.llm.llm_cache import LLMResponseCache
+from src.llm.llm_manager import AIAdapter, AIModel, LoggerChatModel
+from src.llm.streaming import LineBuffer
+
+
+class ScriptedModel(AIModel):
+    def __init__(self, model):
+        self.model = model
+
+    def invoke(self, prompt):
+        return self.model.invoke(prompt)
+
+
+def make_chat_model(mocker, model, cache=None):
+    mocker.patch('src.llm.llm_manager.LLMLogger.log_request')
+    mocker.patch.object(AIAdapter, "_create_model", return_value=ScriptedModel(model))
+    adapter = AIAdapter({"llm_model_type": "openai", "llm_model": "gpt-4o-mini"}, "sk-test")
+    return LoggerChatModel(adapter, cache=cache)
+
+
+def test_line_buffer_returns_completed_lines():
+    """Test that streamed chunks are split into lines as soon as a line is complete."""
+    buffer = LineBuffer()
+
+    assert buffer.feed("Dear hiring") == []
+    assert buffer.feed(" manager,\n\nI am") == ["Dear hiring manager,", ""]
+    assert buffer.feed(" applying") == []
+    assert buffer.flush() == ["I am applying"]
+    assert buffer.flush() == []
+
+
+def test_stream_yields_chunks_and_records_stats(mocker):
+    """Test that a streaming provider yields the reply incrementally and records time to first token."""
+    chat_model = make_chat_model(mocker, FakeListChatModel(responses=["Five years"]))
+
+    chunks = list(chat_model.stream("How many years of Python?"))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == "Five years"
+    stats = chat_model.stream_stats.as_dict()
+    assert stats["streams"] == 1
+    assert chat_model.llm.breaker.failures == 0
+
+
+def test_non_streaming_provider_falls_back_to_single_chunk(mocker, tmp_path):
+    """Test that a provider without streaming yields the whole reply once and the reply is cached."""
+    model = FakeMessagesListChatModel(responses=[AIMessage(content="Whole reply")])
+    cache = LLMResponseCache(tmp_path / "cache.db")
+    chat_model = make_chat_model(mocker, model, cache=cache)
+
+    assert list(chat_model.stream("Write a cover letter")) == ["Whole reply"]
+    assert list(chat_model.stream("Write a cover letter")) == ["Whole reply"]
+    assert chat_model.stream_stats.streams == 1
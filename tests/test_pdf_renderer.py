@@ -0,0 +1,74 @@
+import base64
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from patches.pdf_renderer import ChromeRendererPool
+
+
+def make_driver(mocker, fail_renders=0):
+    driver = mocker.Mock()
+    failures = iter([WebDriverException("chrome not reachable")] * fail_renders)
+
+    def execute_cdp_cmd(command, params):
+        if command == "Page.getFrameTree":
+            return {"frameTree": {"frame": {"id": "main"}}}
+        if command == "Page.printToPDF":
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            return {"data": base64.b64encode(b"%PDF-1.4 " + driver.html.encode()).decode()}
+        if command == "Page.setDocumentContent":
+            driver.html = params["html"]
+        return {}
+
+    driver.execute_cdp_cmd.side_effect = execute_cdp_cmd
+    return driver
+
+
+def test_renders_html_string_on_a_warm_browser(mocker):
+    """Test that consecutive renders reuse one browser and return raw PDF bytes."""
+    drivers = []
+    pool = ChromeRendererPool(base_url="file:///styles/",
+                              driver_factory=lambda: drivers.append(make_driver(mocker)) or drivers[-1])
+
+    assert pool.render("<p>first</p>") == b"%PDF-1.4 <p>first</p>"
+    assert pool.render("<p>second</p>") == b"%PDF-1.4 <p>second</p>"
+
+    assert len(drivers) == 1
+    drivers[0].get.assert_called_once_with("file:///styles/")
+    assert pool.stats()["renders"] == 2
+    assert pool.stats()["browsers_started"] == 1
+
+
+def test_browser_is_recycled_after_max_renders(mocker):
+    """Test that a browser is closed after max_renders conversions and the next render starts a new one."""
+    drivers = []
+    pool = ChromeRendererPool(max_renders=2,
+                              driver_factory=lambda: drivers.append(make_driver(mocker)) or drivers[-1])
+
+    for i in range(5):
+        pool.render(f"<p>{i}</p>")
+
+    assert len(drivers) == 3
+    drivers[0].quit.assert_called_once()
+    drivers[1].quit.assert_called_once()
+    drivers[2].quit.assert_not_called()
+    assert pool.stats()["recycles"] == 2
+
+    pool.close()
+    drivers[2].quit.assert_called_once()
+    with pytest.raises(RuntimeError):
+        pool.render("<p>closed</p>")
+
+
+def test_failed_browser_is_replaced_and_render_retried(mocker):
+    """Test that a browser failing during a render is discarded and the render retried on a new one."""
+    drivers = [make_driver(mocker, fail_renders=1), make_driver(mocker)]
+    pool = ChromeRendererPool(driver_factory=iter(drivers).__next__)
+
+    assert pool.render("<p>resume</p>") == b"%PDF-1.4 <p>resume</p>"
+
+    drivers[0].quit.assert_called_once()
+    assert pool.stats()["failures"] == 1
+    assert pool.stats()["browsers_started"] == 2
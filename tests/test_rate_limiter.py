@@ -0,0 +1,48 @@
+import pytest
+
+from src.llm import rate_limiter
+from src.llm.rate_limiter import RateLimiter, configure_rate_limits, get_rate_limiter, rate_limiter_stats
+
+
+@pytest.fixture
+def clock(mocker):
+    """Fixture to drive the limiter with a fake monotonic clock and a sleep that advances it."""
+    now = {"value": 1000.0}
+    mocker.patch.object(rate_limiter.time, "monotonic", side_effect=lambda: now["value"])
+    sleep = mocker.patch.object(rate_limiter.time, "sleep",
+                                side_effect=lambda seconds: now.update(value=now["value"] + seconds))
+    yield sleep
+    configure_rate_limits(None)
+
+
+def test_requests_per_minute_spaces_out_bursts(clock):
+    """Test that requests beyond the burst wait for the bucket to refill."""
+    limiter = RateLimiter("openai/gpt-4o-mini", requests_per_minute=60)
+
+    waits = [limiter.acquire() for _ in range(62)]
+
+    assert waits[:60] == [0.0] * 60
+    assert waits[60:] == [pytest.approx(1.0), pytest.approx(1.0)]
+    assert limiter.stats()["delayed"] == 2
+
+
+def test_tokens_per_minute_uses_reported_usage(clock):
+    """Test that the token budget is corrected with the real usage of a call."""
+    limiter = RateLimiter("openai/gpt-4o-mini", tokens_per_minute=600)
+
+    assert limiter.acquire(estimated_tokens=100) == 0.0
+    limiter.record_usage(actual_tokens=600, estimated_tokens=100)
+
+    assert limiter.acquire(estimated_tokens=60) == pytest.approx(6.0)
+
+
+def test_limiters_are_shared_and_configured_per_model(clock):
+    """Test that callers of the same provider/model share one limiter using the most specific limits."""
+    configure_rate_limits({"openai": {"requests_per_minute": 100},
+                           "openai/gpt-4o": {"requests_per_minute": 10, "tokens_per_minute": 1000}})
+
+    assert get_rate_limiter("openai", "gpt-4o") is get_rate_limiter("OpenAI", "gpt-4o")
+    assert get_rate_limiter("openai", "gpt-4o").tokens.capacity == 1000
+    assert get_rate_limiter("openai", "gpt-4o-mini").requests.capacity == 100
+    assert not get_rate_limiter("ollama", "llama3").limited
+    assert set(rate_limiter_stats()) == {"openai/gpt-4o", "openai/gpt-4o-mini"}
@@ -0,0 +1,51 @@
+import pytest
+
+from patches.reportlab_renderer import MAX_PDF_BYTES, ReportLabRenderer, html_to_flowables
+
+RESUME_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head><title>Resume</title><style>h1 { color: red; }</style><link rel="stylesheet" href="style.css"></head>
+<body>
+  <header><h1>Jane Doe</h1><p><i class="fas fa-envelope"></i> <a href="mailto:jane@example.com">jane@example.com</a></p></header>
+  <main>
+    <section id="work-experience">
+      <h2>Work Experience</h2>
+      <div class="entry-header"><span class="entry-name">ACME &amp; Co</span><span class="entry-location">Berlin</span></div>
+      <ul><li>Built <b>payment services</b> with <i>Python <b>and</i> Go</li><li>Led a team of four</li></ul>
+    </section>
+  </main>
+</body>
+</html>"""
+
+
+def paragraph_texts(flowables):
+    return [(flowable.style.name, flowable.getPlainText()) for flowable in flowables if hasattr(flowable, "style")]
+
+
+def test_section_markup_is_laid_out_as_paragraphs():
+    """Test that headings, entries and list items become styled paragraphs and the head is skipped."""
+    assert paragraph_texts(html_to_flowables(RESUME_HTML)) == [
+        ("ResumeName", "Jane Doe"),
+        ("ResumeBody", "jane@example.com"),
+        ("ResumeSection", "Work Experience"),
+        ("ResumeBody", "ACME & Co Berlin"),
+        ("ResumeBullet", "Built payment services with Python and Go"),
+        ("ResumeBullet", "Led a team of four"),
+    ]
+
+
+def test_renders_small_pdf_without_a_browser():
+    """Test that the resume is rendered in process and stays far below the upload limit."""
+    renderer = ReportLabRenderer()
+
+    pdf = renderer.render(RESUME_HTML)
+
+    assert pdf.startswith(b"%PDF")
+    assert len(pdf) < MAX_PDF_BYTES / 100
+    assert renderer.stats()["renders"] == 1
+
+
+def test_output_above_limit_is_rejected():
+    """Test that a rendered resume above max_bytes raises instead of being uploaded."""
+    with pytest.raises(ValueError):
+        ReportLabRenderer(max_bytes=100).render(RESUME_HTML)
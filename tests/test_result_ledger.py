@@ -0,0 +1,50 @@
+import json
+
+import pytest
+from src.result_ledger import ResultLedger
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    """Fixture to create a ResultLedger in a temporary folder."""
+    result_ledger = ResultLedger(tmp_path)
+    yield result_ledger
+    result_ledger.close()
+
+
+def test_append_writes_one_line_per_record(tmp_path, ledger):
+    """Test that each result is appended as a single JSON line."""
+    ledger.append("success", {"company": "Company A"})
+    ledger.append("skipped", {"company": "Company B"})
+
+    lines = (tmp_path / "results.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2
+    first = json.loads(lines[0])
+    assert first["status"] == "success"
+    assert first["company"] == "Company A"
+    assert "timestamp" in first
+
+
+def test_iter_records_filters_by_status(ledger):
+    """Test that records can be iterated lazily by status."""
+    ledger.append("success", {"company": "Company A"})
+    ledger.append("failed", {"company": "Company B"})
+
+    assert [r["company"] for r in ledger.iter_records("success")] == ["Company A"]
+    assert len(list(ledger.iter_records())) == 2
+
+
+def test_legacy_json_arrays_are_migrated_once(tmp_path):
+    """Test that the old JSON array files are migrated into the ledger."""
+    (tmp_path / "success.json").write_text(json.dumps([{"company": "Company A"}]), encoding="utf-8")
+    (tmp_path / "skipped.json").write_text(json.dumps([{"company": "Company B"}, {"company": "Company C"}]),
+                                           encoding="utf-8")
+
+    ledger = ResultLedger(tmp_path)
+    records = list(ledger.iter_records())
+    ledger.close()
+
+    assert [r["status"] for r in records].count("skipped") == 2
+    assert not (tmp_path / "success.json").exists()
+    assert (tmp_path / "success.json.migrated").exists()
+    assert len(list(ResultLedger(tmp_path).iter_records())) == 3
@@ -0,0 +1,66 @@
+import pytest
+
+from src.resume_cache import ResumeArtifactCache, hamming_distance, normalize_job_description, simhash
+
+JOB_DESCRIPTION = (
+    "We are looking for a Senior Python Engineer to join our data platform team. You will design and build "
+    "scalable ETL pipelines, maintain our Airflow deployment, work with PostgreSQL and Kafka, and mentor junior "
+    "engineers. Requirements: 5+ years of Python, experience with cloud infrastructure on AWS, strong SQL skills, "
+    "and a collaborative mindset. We offer remote work, a learning budget and stock options. "
+    "Your day to day: you will own the ingestion services that move billions of events from our product into the "
+    "warehouse, improve data quality checks, and partner with analysts and machine learning engineers to ship "
+    "reliable datasets. You will review code, write design documents, and take part in a light on-call rotation. "
+    "Nice to have: experience with dbt, Spark or Flink, Terraform, Kubernetes, and observability tooling such as "
+    "Prometheus and Grafana. About us: we are a profitable, fast growing company of 300 people building software "
+    "for logistics providers across Europe. Our engineering culture values ownership, written communication, "
+    "pragmatic testing and continuous delivery. Hiring process: a short call with a recruiter, a take-home "
+    "exercise that takes about three hours, a technical interview with two engineers, and a final conversation "
+    "with the head of data. We are committed to building a diverse team and encourage applications from people "
+    "of all backgrounds, even if you do not meet every single requirement listed above."
+)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Fixture to create a resume cache in a temporary directory."""
+    resume_cache = ResumeArtifactCache(tmp_path / "resume_cache", "resume-hash")
+    yield resume_cache
+    resume_cache.close()
+
+
+def test_exact_repost_is_served_from_cache(cache):
+    """Test that a description differing only in formatting hits the stored PDF."""
+    cache.put("Modern Blue", JOB_DESCRIPTION, b"%PDF-1.4 tailored")
+
+    repost = "\n\n" + JOB_DESCRIPTION.upper().replace(". ", ".\n")
+    assert normalize_job_description(repost) == normalize_job_description(JOB_DESCRIPTION)
+    assert cache.get("Modern Blue", repost) == b"%PDF-1.4 tailored"
+    assert cache.get("Classic", JOB_DESCRIPTION) is None
+    assert cache.stats() == {"hits": 1, "near_hits": 0, "misses": 1, "hit_rate": 0.5}
+
+
+def test_near_duplicate_is_found_by_simhash(cache):
+    """Test that a lightly edited repost is matched and an unrelated posting is not."""
+    cache.put("Modern Blue", JOB_DESCRIPTION, b"%PDF-1.4 tailored")
+    edited = JOB_DESCRIPTION.replace("a learning budget", "a generous learning budget")
+    unrelated = "Registered nurse wanted for night shifts in our cardiology ward, BLS certification required."
+
+    assert hamming_distance(simhash(normalize_job_description(edited)),
+                            simhash(normalize_job_description(JOB_DESCRIPTION))) <= 3
+    assert cache.get("Modern Blue", edited) == b"%PDF-1.4 tailored"
+    assert cache.get("Modern Blue", unrelated) is None
+    assert cache.near_hits == 1
+
+
+def test_least_recently_used_pdfs_are_evicted(tmp_path):
+    """Test that the store stays under its size limit by dropping the least recently used PDFs."""
+    cache = ResumeArtifactCache(tmp_path / "resume_cache", "resume-hash", max_bytes=250, max_distance=0)
+    cache.put("style", "first job description", b"1" * 100)
+    cache.put("style", "second job description", b"2" * 100)
+    cache.get("style", "first job description")
+    cache.put("style", "third job description", b"3" * 100)
+
+    assert cache.get("style", "first job description") == b"1" * 100
+    assert cache.get("style", "second job description") is None
+    assert len(list((tmp_path / "resume_cache").glob("*.pdf"))) == 2
+    cache.close()
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from src.llm.section_router import SectionRouter, section_descriptions
+
+
+@pytest.fixture
+def router(tmp_path):
+    """Fixture to create a SectionRouter with its label files in a temporary folder."""
+    return SectionRouter(labels_path=tmp_path / "section_labels.jsonl", answers_path=tmp_path / "answers.json")
+
+
+def test_section_descriptions_cover_every_section():
+    """Test that the seeds are extracted for all 13 sections of the routing prompt."""
+    descriptions = section_descriptions()
+
+    assert len(descriptions) == 13
+    assert "cover_letter" in descriptions
+    assert all(len(lines) == 3 for lines in descriptions.values())
+
+
+@pytest.mark.parametrize("question, section", [
+    ("What is your expected salary?", "salary_expectations"),
+    ("What is your notice period?", "availability"),
+    ("Will you require visa sponsorship?", "legal_authorization"),
+    ("Which university did you attend?", "education_details"),
+])
+def test_route_confident_questions(router, question, section):
+    """Test that clear questions are routed locally to the right section."""
+    assert router.route(question) == section
+
+
+def test_route_returns_none_when_unsure(router):
+    """Test that an ambiguous question is left to the LLM."""
+    assert router.route("How many years of experience do you have with Python?") is None
+
+
+def test_learned_labels_are_persisted(tmp_path, router):
+    """Test that questions routed by the LLM are saved and used after a restart."""
+    question = "How many years of experience do you have with Python?"
+    router.learn(question, "experience_details")
+
+    assert json.loads((tmp_path / "section_labels.jsonl").read_text()) == {
+        "section": "experience_details", "question": question}
+    restarted = SectionRouter(labels_path=tmp_path / "section_labels.jsonl", answers_path=tmp_path / "answers.json")
+    assert restarted.route("How many years of experience do you have with Java?") == "experience_details"
+
+
+def test_stats_report_saved_latency(router):
+    """Test that hit rate and saved latency are derived from recorded routes."""
+    router.record(local=False, seconds=1.0)
+    router.record(local=True, seconds=0.001)
+    router.record(local=True, seconds=0.001)
+
+    stats = router.stats()
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+    assert stats["saved_seconds"] == pytest.approx(2 * 0.999)
+
+
+def test_router_learns_from_answers_saved_by_applier(mocker, monkeypatch, tmp_path):
+    """Test that textbox answers saved by the applier carry their section and train a new router."""
+    from src.aihawk_easy_applier import AIHawkEasyApplier
+
+    monkeypatch.chdir(tmp_path)
+    question = "How many years of experience do you have with Python?"
+    gpt_answerer = mocker.Mock()
+    gpt_answerer.answer_question_textual_wide_range.return_value = "Five years"
+    gpt_answerer.take_routed_section.return_value = "experience_details"
+    easy_applier = AIHawkEasyApplier(mocker.Mock(), None, [], gpt_answerer, mocker.Mock())
+
+    assert easy_applier._answer_text_question(question, is_numeric=False) == "Five years"
+    easy_applier.answer_store.flush()
+
+    saved = json.loads((tmp_path / "answers.json").read_text())
+    assert saved == [{"type": "textbox", "question": question.lower(), "answer": "Five years",
+                      "section": "experience_details"}]
+    gpt_answerer.take_routed_section.assert_called_once_with(question)
+    router = SectionRouter(labels_path=tmp_path / "section_labels.jsonl", answers_path=tmp_path / "answers.json")
+    assert router.route("How many years of experience do you have with Java?") == "experience_details"
@@ -0,0 +1,50 @@
+import sqlite3
+import time
+
+import pytest
+from src.seen_job_index import SeenJobIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Fixture to create a loaded SeenJobIndex in a temporary folder."""
+    seen_jobs = SeenJobIndex(tmp_path / "seen_jobs.db", ttl_days=30)
+    seen_jobs.load()
+    yield seen_jobs
+    seen_jobs.close()
+
+
+def test_add_and_contains(index):
+    """Test that added job ids are found and unknown ones are not."""
+    index.add("123", "success")
+
+    assert "123" in index
+    assert "456" not in index
+    assert "" not in index
+
+
+def test_index_survives_restart(tmp_path, index):
+    """Test that job ids are persisted across instances."""
+    index.add("123", "skipped")
+    index.close()
+
+    reloaded = SeenJobIndex(tmp_path / "seen_jobs.db")
+    reloaded.load()
+
+    assert "123" in reloaded
+    assert len(reloaded) == 1
+    reloaded.close()
+
+
+def test_expired_jobs_are_compacted(tmp_path, index):
+    """Test that jobs older than the TTL are dropped on load."""
+    index.add("123", "success")
+    index.close()
+    with sqlite3.connect(str(tmp_path / "seen_jobs.db")) as connection:
+        connection.execute("UPDATE seen_jobs SET seen_at = ?", (time.time() - 31 * 86400,))
+
+    reloaded = SeenJobIndex(tmp_path / "seen_jobs.db", ttl_days=30)
+    reloaded.load()
+
+    assert "123" not in reloaded
+    reloaded.close()
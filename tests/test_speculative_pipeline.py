@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from src.deadline import Deadline, DeadlineExceeded, activate, current_deadline
+from src.job import Job
+from src.speculative_pipeline import SpeculativePipeline
+
+
+def make_job(job_id, description="Python developer"):
+    return Job(title=f"Engineer {job_id}", company="ACME", location="Berlin",
+               link=f"https://www.linkedin.com/jobs/view/{job_id}/", apply_method="Easy Apply",
+               description=description, job_id=str(job_id))
+
+
+def test_summary_and_resume_are_generated_in_background():
+    """Test that a submitted job gets its summary and resume from the workers, each used once."""
+    resume_threads = []
+
+    def generate_resume(job):
+        resume_threads.append(threading.current_thread().name)
+        return b"%PDF " + job.job_id.encode()
+
+    pipeline = SpeculativePipeline(lambda text: f"summary of {text}", generate_resume)
+    job = make_job(1)
+
+    assert pipeline.submit(job)
+    assert pipeline.summary(job) == "summary of Python developer"
+    assert pipeline.resume_pdf(job) == b"%PDF 1"
+    assert pipeline.resume_pdf(job) is None
+    assert resume_threads[0].startswith("speculative")
+    assert pipeline.stats()["used"] == 2
+    pipeline.close()
+
+
+def test_background_work_runs_under_deadline_of_submitting_application():
+    """Test that speculated work sees the deadline of the application that submitted it."""
+    pipeline = SpeculativePipeline(lambda text: current_deadline())
+    deadline = Deadline(60, label="Engineer 1 at ACME")
+
+    with activate(deadline):
+        assert pipeline.submit(make_job(1))
+        assert not pipeline.submit(make_job(2, description=""))
+    assert pipeline.summary(make_job(1)) is deadline
+    pipeline.close()
+
+
+def test_work_of_cancelled_job_is_not_started():
+    """Test that queued work of a skipped job is cancelled before a worker picks it up."""
+    release = threading.Event()
+    summarized = []
+
+    def summarize(text):
+        release.wait(5)
+        summarized.append(text)
+        return text
+
+    pipeline = SpeculativePipeline(summarize, max_workers=1)
+    current, skipped = make_job(1, "current"), make_job(2, "skipped")
+    pipeline.submit(current)
+    pipeline.submit(skipped)
+
+    pipeline.cancel(skipped)
+    release.set()
+
+    assert pipeline.summary(current) == "current"
+    assert pipeline.summary(skipped) is None
+    pipeline.close()
+    assert summarized == ["current"]
+
+
+def test_failed_resume_is_raised_once_then_generated_inline():
+    """Test that a failed speculative resume is raised to the caller, whose retry then generates inline."""
+    def generate_resume(job):
+        raise ConnectionError("connection reset")
+
+    pipeline = SpeculativePipeline(lambda text: "summary", generate_resume)
+    job = make_job(1)
+    pipeline.submit(job)
+
+    with pytest.raises(ConnectionError):
+        pipeline.resume_pdf(job)
+    assert pipeline.resume_pdf(job) is None
+    pipeline.close()
+
+
+def test_wait_is_bounded_by_application_budget():
+    """Test that waiting on speculated work never outlives the application budget."""
+    release = threading.Event()
+    pipeline = SpeculativePipeline(lambda text: release.wait(5))
+    job = make_job(1)
+    pipeline.submit(job)
+
+    with activate(Deadline(0.1)):
+        with pytest.raises(DeadlineExceeded):
+            pipeline.summary(job)
+    release.set()
+    pipeline.close()
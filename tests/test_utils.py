@@ -4,7 +4,7 @@ import os
 import time
 from unittest import mock
 from selenium.webdriver.remote.webelement import WebElement
-from src.utils import ensure_chrome_profile, is_scrollable, scroll_slow, chrome_browser_options, printred, printyellow
+from src.utils import ensure_chrome_profile, is_scrollable, scroll_slow, scroll_until_loaded, chrome_browser_options, printred, printyellow
 
 # Mocking logging to avoid actual file writing
 @pytest.fixture(autouse=True)
@@ -67,6 +67,28 @@ def test_scroll_slow_element_not_scrollable(mocker):
     # Ensure it detected non-scrollable element
     mock_driver.execute_script.assert_not_called()
 
+# Test scroll_until_loaded function
+def test_scroll_until_loaded_stops_when_count_stops_growing(mocker):
+    mock_driver = mocker.Mock()
+    mock_element = mocker.Mock(spec=WebElement)
+    mock_driver.execute_async_script.side_effect = [7, 14, 25, 25]
+
+    item_count = scroll_until_loaded(mock_driver, mock_element, '.job-card-container', timeout=0.1)
+
+    assert item_count == 25
+    assert mock_driver.execute_async_script.call_count == 4
+    mock_driver.execute_script.assert_called_once_with("arguments[0].scrollTop = 0;", mock_element)
+
+def test_scroll_until_loaded_respects_max_rounds(mocker):
+    mock_driver = mocker.Mock()
+    mock_element = mocker.Mock(spec=WebElement)
+    mock_driver.execute_async_script.side_effect = range(1, 100)
+
+    item_count = scroll_until_loaded(mock_driver, mock_element, '.job-card-container', max_rounds=3)
+
+    assert item_count == 3
+    assert mock_driver.execute_async_script.call_count == 3
+
 # Test chrome_browser_options function
 def test_chrome_browser_options(mocker):
     mocker.patch("src.utils.ensure_chrome_profile")